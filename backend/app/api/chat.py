@@ -3,10 +3,21 @@ Chat endpoint for conversational interface
 """
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
-from app.graph.graph import fitness_graph
-from app.dependencies import get_db_client, get_llm_client
+from typing import Dict, List, Optional
+import asyncio
+import json
+import logging
+import time
+from app.config import settings
+from app.graph.graph import get_fitness_graph
+from app.dependencies import get_db_client, get_llm_client, get_llm_recorder
+from app.tools.llm import stream_tokens_to
+from app.utils.tracing import REQUEST_SECONDS, span
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,6 +25,7 @@ router = APIRouter()
 class ChatRequest(BaseModel):
     user_id: str
     message: str
+    timestamp: Optional[datetime] = None  # When the message happened (defaults to now)
 
 
 class ChatResponse(BaseModel):
@@ -22,6 +34,54 @@ class ChatResponse(BaseModel):
     metadata: dict = None
 
 
+class ChatBatchRequest(BaseModel):
+    items: List[ChatRequest]
+
+
+class ChatBatchItemResult(BaseModel):
+    index: int
+    user_id: str
+    response: Optional[ChatResponse] = None
+    error: Optional[str] = None
+
+
+class ChatBatchResponse(BaseModel):
+    results: List[ChatBatchItemResult]
+
+
+def _initial_state(request: ChatRequest) -> dict:
+    """Build the graph input for a chat request"""
+    return {
+        "user_id": request.user_id,
+        "message": request.message,
+        "timestamp": request.timestamp or datetime.now(),
+        "needs_clarification": False,
+    }
+
+
+def _record_chat(state: dict, response: ChatResponse, started: float) -> None:
+    """Log the exchange as replayable traffic when LLM recording is enabled"""
+    recorder = get_llm_recorder()
+    if recorder is not None:
+        recorder.record_chat(
+            state["user_id"],
+            state["message"],
+            state["timestamp"],
+            response.response,
+            response.intent,
+            time.monotonic() - started,
+        )
+
+
+def _chat_response(result: dict) -> ChatResponse:
+    """Build the API response from the final graph state"""
+    return ChatResponse(
+        response=result.get("response") or "I'm not sure how to help with that.",
+        intent=result.get("intent"),
+        metadata=result.get("metadata") or {},
+    )
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -30,34 +90,153 @@ async def chat(request: ChatRequest):
 
     try:
         # Create initial state
-        initial_state = {
-            "user_id": request.user_id,
-            "message": request.message,
-            "timestamp": datetime.now(),
-            "needs_clarification": False,
-        }
+        initial_state = _initial_state(request)
 
-        print(f"\n[CHAT] New Request from {request.user_id}: {request.message}")
-        print(f"[CHAT] Initial state: {initial_state}")
+        logger.debug("Chat request", extra={"user_id": request.user_id})
 
         # Run through graph
-        result = await fitness_graph.ainvoke(initial_state)
+        started = time.monotonic()
+        with span(REQUEST_SECONDS, "chat request", endpoint="chat") as attributes:
+            result = await get_fitness_graph().ainvoke(initial_state)
+            attributes["intent"] = result.get("intent")
 
-        print(f"[CHAT] Graph execution completed")
-        print(f"[CHAT] Final Intent: {result.get('intent')}")
-        print(
-            f"[CHAT] Final Response: {result.get('response')[:100] if result.get('response') else 'None'}..."
-        )
+        response = _chat_response(result)
+        _record_chat(initial_state, response, started)
+        return response
 
-        return ChatResponse(
-            response=result.get("response", "I'm not sure how to help with that."),
-            intent=result.get("intent"),
-            metadata=result.get("metadata", {}),
-        )
+    except Exception as e:
+        logger.exception("Chat request failed", extra={"user_id": request.user_id})
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Seconds without an event after which a keep-alive comment is sent, so
+# clients can use an idle read timeout while a slow node is running
+SSE_KEEPALIVE_SECONDS = 15.0
 
+
+def _sse(event: str, data: dict) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _chat_events(request: ChatRequest):
+    """
+    Run the graph and yield SSE events as work progresses
+
+    Events:
+        node: {"node": name} after each graph node completes
+        token: {"text": chunk} for user-facing LLM text as it is generated
+        done: the final ChatResponse
+        error: {"detail": message}
+
+    A ``: keep-alive`` comment is sent after SSE_KEEPALIVE_SECONDS without
+    an event.
+    """
+
+    # Loaded with the compiled graph; not worth importing LangGraph up front for
+    from langgraph.graph import END
+
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_graph():
+        try:
+            state = _initial_state(request)
+            started = time.monotonic()
+            with stream_tokens_to(
+                lambda text: queue.put_nowait(("token", {"text": text}))
+            ), span(REQUEST_SECONDS, "chat stream request", endpoint="chat_stream"):
+                result = {}
+                async for step in get_fitness_graph().astream(state):
+                    for node, node_state in step.items():
+                        if node == END:
+                            result = node_state
+                        else:
+                            queue.put_nowait(("node", {"node": node}))
+
+            response = _chat_response(result)
+            _record_chat(state, response, started)
+            queue.put_nowait(("done", response.dict()))
+        except Exception as e:
+            logger.exception("Chat stream failed", extra={"user_id": request.user_id})
+            queue.put_nowait(("error", {"detail": str(e)}))
+
+    logger.debug("Chat stream request", extra={"user_id": request.user_id})
+    task = asyncio.create_task(run_graph())
+
+    try:
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event, data)
+            if event in ("done", "error"):
+                break
+    finally:
+        # Client disconnected early: stop working on its behalf
+        if not task.done():
+            task.cancel()
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming chat endpoint - emits graph progress and LLM tokens as Server-Sent Events
+    """
+
+    return StreamingResponse(
+        _chat_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _run_batch_item(index: int, request: ChatRequest) -> ChatBatchItemResult:
+    """Run one batch item through the graph, capturing its error instead of raising"""
+    try:
+        state = _initial_state(request)
+        started = time.monotonic()
+        with span(REQUEST_SECONDS, "chat batch item", endpoint="chat_batch"):
+            result = await get_fitness_graph().ainvoke(state)
+        response = _chat_response(result)
+        _record_chat(state, response, started)
+        return ChatBatchItemResult(index=index, user_id=request.user_id, response=response)
     except Exception as e:
-        import traceback
+        logger.warning("Batch item failed", extra={"index": index, "error": str(e)})
+        return ChatBatchItemResult(index=index, user_id=request.user_id, error=str(e))
 
-        print(f"Error in chat endpoint: {str(e)}")
-        print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/batch", response_model=ChatBatchResponse)
+async def chat_batch(batch: ChatBatchRequest):
+    """
+    Batch chat endpoint - processes many messages concurrently
+
+    Messages for different users run in parallel (at most
+    CHAT_BATCH_CONCURRENCY at a time); messages for the same user run one
+    after another in submission order. Results are returned in request
+    order, with per-item errors.
+    """
+
+    if len(batch.items) > settings.CHAT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {settings.CHAT_BATCH_MAX_ITEMS} items",
+        )
+
+    semaphore = asyncio.Semaphore(settings.CHAT_BATCH_CONCURRENCY)
+    results: List[Optional[ChatBatchItemResult]] = [None] * len(batch.items)
+
+    # Group by user so each user's messages keep their order
+    indices_by_user: Dict[str, List[int]] = {}
+    for index, item in enumerate(batch.items):
+        indices_by_user.setdefault(item.user_id, []).append(index)
+
+    async def run_user(indices: List[int]):
+        for index in indices:
+            async with semaphore:
+                results[index] = await _run_batch_item(index, batch.items[index])
+
+    await asyncio.gather(*(run_user(indices) for indices in indices_by_user.values()))
+
+    return ChatBatchResponse(results=results)
@@ -3,17 +3,17 @@ Goals endpoint for managing fitness goals
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
-from app.dependencies import get_db_client
-from app.tools.db import SupabaseClient
+from app.dependencies import get_goal_engine
+from app.services.goal_engine import GoalEngine
 
 router = APIRouter()
 
 
 class Goal(BaseModel):
-    goal_type: str  # "weight_loss", "muscle_gain", "maintenance"
+    goal_type: str = Field(..., pattern="^(weight_loss|muscle_gain|maintenance)$")
     target_calories: Optional[int] = None
     target_weight: Optional[float] = None
     target_date: Optional[str] = None
@@ -30,13 +30,12 @@ class GoalResponse(BaseModel):
 
 @router.post("/goals/{user_id}", response_model=GoalResponse)
 async def set_goal(
-    user_id: str, goal: Goal, db_client: SupabaseClient = Depends(get_db_client)
+    user_id: str, goal: Goal, goal_engine: GoalEngine = Depends(get_goal_engine)
 ):
     """Set or update user fitness goal"""
 
     try:
         goal_data = {
-            "user_id": user_id,
             "goal_type": goal.goal_type,
             "target_calories": goal.target_calories,
             "target_weight": goal.target_weight,
@@ -44,13 +43,7 @@ async def set_goal(
             "created_at": datetime.now().isoformat(),
         }
 
-        # Check if goal exists
-        existing = await db_client.query("goals", filters={"user_id": user_id})
-
-        if existing:
-            result = await db_client.update("goals", goal_data, {"user_id": user_id})
-        else:
-            result = await db_client.insert("goals", goal_data)
+        result = await goal_engine.save_goal(user_id, goal_data)
 
         return GoalResponse(**result)
 
@@ -59,16 +52,16 @@ async def set_goal(
 
 
 @router.get("/goals/{user_id}", response_model=GoalResponse)
-async def get_goal(user_id: str, db_client: SupabaseClient = Depends(get_db_client)):
+async def get_goal(user_id: str, goal_engine: GoalEngine = Depends(get_goal_engine)):
     """Get user's current goal"""
 
     try:
-        goals = await db_client.query("goals", filters={"user_id": user_id})
+        goal = await goal_engine.get_goal(user_id)
 
-        if not goals:
+        if not goal:
             raise HTTPException(status_code=404, detail="No goal found for user")
 
-        return GoalResponse(**goals[0])
+        return GoalResponse(**goal)
 
     except HTTPException:
         raise
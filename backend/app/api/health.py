@@ -2,8 +2,10 @@
 Health check endpoint
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
+from typing import Any, Dict, List
+from app.dependencies import get_llm_client
 
 router = APIRouter()
 
@@ -11,9 +13,33 @@ router = APIRouter()
 class HealthResponse(BaseModel):
     status: str
     version: str
+    llm_providers: List[Dict[str, Any]] = []
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Health check endpoint"""
-    return HealthResponse(status="healthy", version="1.0.0")
+async def health_check(response: Response):
+    """
+    Health check endpoint
+
+    Reports each LLM provider's circuit breaker. Status is "degraded" while
+    some breakers are open and "unavailable" (HTTP 503, so load balancers
+    drain the instance) when no provider can currently be called.
+    """
+
+    llm_client = get_llm_client()
+    breakers = [
+        {"provider": client.provider, "model": client.model, **client.breaker.snapshot()}
+        for client in [llm_client, *llm_client.fallbacks]
+        if client.breaker is not None
+    ]
+
+    open_count = sum(1 for breaker in breakers if breaker["state"] == "open")
+    if breakers and open_count == len(breakers):
+        status = "unavailable"
+        response.status_code = 503
+    elif open_count:
+        status = "degraded"
+    else:
+        status = "healthy"
+
+    return HealthResponse(status=status, version="1.0.0", llm_providers=breakers)
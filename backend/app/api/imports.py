@@ -0,0 +1,103 @@
+"""
+Import endpoints for bulk food-history uploads
+"""
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from typing import BinaryIO, Optional, Tuple
+import hashlib
+import os
+import tempfile
+from app.config import settings
+from app.dependencies import (
+    get_db_client,
+    get_llm_client,
+    get_estimate_cache,
+    get_import_jobs,
+    get_summary_cache,
+)
+from app.services.calorie_engine import CalorieEngine
+from app.services.import_jobs import ImportJob
+from app.services.import_pipeline import FoodHistoryImporter, detect_format, iter_records
+from app.tools.db import SupabaseClient
+
+router = APIRouter()
+
+
+def _spool_upload(upload: BinaryIO, directory: str) -> Tuple[str, str]:
+    """Copy an upload to a spool file; returns (path, SHA-256 of the content)"""
+    digest = hashlib.sha256()
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".upload")
+    with os.fdopen(fd, "wb") as spool:
+        for block in iter(lambda: upload.read(1 << 20), b""):
+            digest.update(block)
+            spool.write(block)
+    return path, digest.hexdigest()
+
+
+@router.post("/import/{user_id}", status_code=202)
+async def import_food_history(
+    user_id: str,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    resume: bool = Query(True),
+    db_client: SupabaseClient = Depends(get_db_client),
+):
+    """
+    Start importing a CSV or JSONL food-history export
+
+    The upload is spooled to disk and imported by a background job that
+    writes it in bulk chunks; poll ``GET /import/{user_id}/jobs/{job_id}``
+    for progress. If a previous upload of the same file content for this
+    user was interrupted, the import resumes after the last committed
+    chunk (unless resume=false).
+    """
+
+    fmt = format or detect_format(file.filename or "")
+
+    # Spooling and hashing read the whole upload, so they run in the threadpool
+    os.makedirs(settings.IMPORT_CHECKPOINT_DIR, exist_ok=True)
+    spool_path, fingerprint = await run_in_threadpool(
+        _spool_upload, file.file, settings.IMPORT_CHECKPOINT_DIR
+    )
+
+    # Key the checkpoint on the content, so a different file with the same
+    # name never resumes from another file's position
+    source_id = hashlib.sha256(f"{user_id}:{fingerprint}".encode()).hexdigest()[:16]
+    checkpoint_path = os.path.join(settings.IMPORT_CHECKPOINT_DIR, f"{source_id}.json")
+
+    jobs = get_import_jobs()
+    if jobs.running(source_id):
+        os.remove(spool_path)
+        raise HTTPException(status_code=409, detail="This file is already being imported")
+    if not resume and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    async def run(job: ImportJob):
+        importer = FoodHistoryImporter(
+            db_client,
+            CalorieEngine(get_llm_client(), estimate_cache=get_estimate_cache()),
+            chunk_size=settings.IMPORT_CHUNK_SIZE,
+            estimate_batch_size=settings.IMPORT_ESTIMATE_BATCH_SIZE,
+            checkpoint_path=checkpoint_path,
+            progress=job.update,
+            summary_cache=get_summary_cache(),
+        )
+        try:
+            with open(spool_path, encoding="utf-8", newline="") as lines:
+                return await importer.run(user_id, iter_records(lines, fmt))
+        finally:
+            os.remove(spool_path)
+
+    return jobs.start(user_id, source_id, run).to_dict()
+
+
+@router.get("/import/{user_id}/jobs/{job_id}")
+async def get_import_job(user_id: str, job_id: str):
+    """Status and running stats of an import job"""
+
+    job = get_import_jobs().get(job_id)
+    if job is None or job.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Import job not found")
+
+    return job.to_dict()
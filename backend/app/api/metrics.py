@@ -0,0 +1,18 @@
+"""
+Prometheus metrics endpoint
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse, Response
+from app.utils.metrics import REGISTRY
+
+# Importing the span histograms registers them even before their first use
+import app.utils.tracing  # noqa: F401
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Latency histograms and token counters in Prometheus text format"""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4")
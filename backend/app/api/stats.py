@@ -0,0 +1,41 @@
+"""
+Stats endpoint for runtime performance counters
+"""
+
+from fastapi import APIRouter
+from app.dependencies import (
+    get_intent_classifier,
+    get_estimate_cache,
+    get_llm_client,
+    get_goal_cache,
+    get_summary_cache,
+    get_user_locks,
+)
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats():
+    """Hit-rate statistics for the agent's fast paths"""
+
+    classifier = get_intent_classifier()
+    estimate_cache = get_estimate_cache()
+    llm_client = get_llm_client()
+    goal_cache = get_goal_cache()
+    summary_cache = get_summary_cache()
+
+    return {
+        "intent_classifier": classifier.stats() if classifier else None,
+        "estimate_cache": estimate_cache.stats() if estimate_cache else None,
+        "llm_cache": llm_client.cache.stats() if llm_client.cache else None,
+        "llm_coalescing": (
+            llm_client.singleflight.stats() if llm_client.singleflight else None
+        ),
+        "structured_output": llm_client.structured_output_stats(),
+        "llm_early_stop": llm_client.early_stop.stats() if llm_client.early_stop else None,
+        "llm_providers": llm_client.chain.stats() if llm_client.chain else None,
+        "goal_cache": goal_cache.stats() if goal_cache else None,
+        "summary_cache": summary_cache.stats() if summary_cache else None,
+        "user_locks": get_user_locks().stats(),
+    }
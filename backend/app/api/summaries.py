@@ -5,9 +5,9 @@ Summaries endpoint for fitness summaries
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime, timedelta
-from app.dependencies import get_db_client
+from app.dependencies import get_db_client, get_goal_engine, get_summary_cache
 from app.tools.db import SupabaseClient
+from app.services.goal_engine import GoalEngine
 from app.services.summary_engine import SummaryEngine
 
 router = APIRouter()
@@ -27,6 +27,7 @@ async def get_summary(
     user_id: str,
     period: str = Query("weekly", pattern="^(daily|weekly|monthly)$"),
     db_client: SupabaseClient = Depends(get_db_client),
+    goal_engine: GoalEngine = Depends(get_goal_engine),
 ):
     """
     Get fitness summary for a user
@@ -37,20 +38,9 @@ async def get_summary(
     """
 
     try:
-        # Calculate date range
-        end_date = datetime.now()
-        if period == "daily":
-            start_date = end_date - timedelta(days=1)
-        elif period == "weekly":
-            start_date = end_date - timedelta(days=7)
-        else:  # monthly
-            start_date = end_date - timedelta(days=30)
-
-        # Generate summary
-        summary_engine = SummaryEngine(db_client)
-        summary_data = await summary_engine.generate_summary(
-            user_id=user_id, start_date=start_date, end_date=end_date
-        )
+        # Generate summary (cached per user, period and day)
+        summary_engine = SummaryEngine(db_client, goal_engine, get_summary_cache())
+        summary_data = await summary_engine.get_period_summary(user_id, period)
 
         return SummaryResponse(**summary_data)
 
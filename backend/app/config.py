@@ -11,24 +11,127 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Fitness AI Agent"
 
+    # Logging: level and "text" (key=value) or "json" lines
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:8501"
 
     # Database
     SUPABASE_URL: str
     SUPABASE_KEY: str
+    SUPABASE_POOL_SIZE: int = 20  # Max concurrent PostgREST connections
+    SUPABASE_KEEPALIVE: int = 10  # Max idle keep-alive connections
+    SUPABASE_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept
+    SUPABASE_TIMEOUT: float = 10.0  # Default per-call timeout in seconds
+    SUPABASE_BATCH_SIZE: int = 500  # Rows per request for bulk inserts/upserts
+    # "supabase", or "memory" for an in-process stand-in (load tests, benchmarks)
+    DATABASE_BACKEND: str = "supabase"
+    MEMORY_DB_LATENCY: str = "fixed:0"  # Simulated latency per request (see below)
 
     # LLM - Supports: gemini, openai, groq, ollama
     GEMINI_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
     GROQ_API_KEY: str = ""
-    LLM_PROVIDER: str = "gemini"  # Options: "gemini", "openai", "groq", "ollama"
+    LLM_PROVIDER: str = "gemini"  # Options: "gemini", "openai", "groq", "ollama", "mock", "replay"
     LLM_MODEL: str = "gemini-pro"  # Model name for the selected provider
 
+    # Use each provider's native JSON mode for structured output (smaller prompts)
+    LLM_NATIVE_JSON: bool = True
+
+    # Stream JSON calls and cancel them once a complete JSON value has arrived
+    # (streamed calls are not hedged). A sample of calls runs to completion to
+    # estimate the tokens and time saved.
+    LLM_EARLY_STOP_JSON: bool = True
+    LLM_EARLY_STOP_SAMPLE_RATE: float = 0.05
+
+    # Provider chain: providers tried in order after LLM_PROVIDER fails or is slow,
+    # e.g. "openai,ollama" or "openai:gpt-4o-mini,ollama:llama3.2"
+    LLM_FALLBACK_PROVIDERS: str = ""
+    LLM_HEDGE_ENABLED: bool = True  # Also start the next provider when one is slow
+    LLM_HEDGE_PERCENTILE: float = 0.95  # Hedge after this latency percentile
+    LLM_HEDGE_MIN_DELAY: float = 0.05  # Seconds
+    LLM_HEDGE_DEFAULT_DELAY: float = 2.0  # Seconds, until enough latency samples exist
+
+    # Per-provider circuit breakers and adaptive timeouts
+    LLM_BREAKER_ENABLED: bool = True
+    LLM_BREAKER_WINDOW: int = 50  # Recent calls the error rate is computed over
+    LLM_BREAKER_ERROR_RATE: float = 0.5  # Error rate that opens the breaker
+    LLM_BREAKER_MIN_CALLS: int = 10  # Calls needed before the breaker can open
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0  # Fast-fail period before a probe call
+    LLM_TIMEOUT_PERCENTILE: float = 0.99  # Adaptive timeout = percentile x multiplier
+    LLM_TIMEOUT_MULTIPLIER: float = 2.0
+    LLM_TIMEOUT_MIN: float = 2.0  # Seconds
+    LLM_TIMEOUT_DEFAULT: float = 60.0  # Seconds, until enough latency samples exist
+    LLM_TIMEOUT_MAX: float = 120.0  # Hard per-request limit in seconds
+
     # Ollama Settings (for local LLM)
     OLLAMA_BASE_URL: str = "http://localhost:11434"  # Ollama server URL
     OLLAMA_MODEL: str = "llama3.2"  # Default Ollama model
 
+    # Mock LLM provider (offline load tests). Latencies are distributions in ms:
+    # "fixed:MS", "uniform:MIN,MAX", "normal:MEAN,SD", "lognormal:MEDIAN,SIGMA",
+    # "exponential:MEAN"
+    MOCK_LLM_LATENCY: str = "lognormal:300,0.4"
+    MOCK_LLM_ERROR_RATE: float = 0.0
+    MOCK_LLM_RESPONSES: str = ""  # JSON file of {"match", "response"} canned responses
+
+    # LLM traffic record/replay (see tools/llm_replay.py). A record path logs
+    # every provider call and chat exchange (gzip if it ends in .gz);
+    # LLM_PROVIDER=replay answers from LLM_REPLAY_PATH instead of a provider.
+    LLM_RECORD_PATH: str = ""
+    LLM_REPLAY_PATH: str = ""
+    LLM_REPLAY_TIMING: bool = False  # Sleep for the recorded latencies
+
+    # Batch chat endpoint
+    CHAT_BATCH_CONCURRENCY: int = 8  # Max messages processed at once per batch
+    CHAT_BATCH_MAX_ITEMS: int = 500
+
+    # Bulk food-history import
+    IMPORT_CHUNK_SIZE: int = 500  # Rows written per bulk insert
+    IMPORT_ESTIMATE_BATCH_SIZE: int = 25  # Items per LLM estimation prompt
+    IMPORT_CHECKPOINT_DIR: str = "import_checkpoints"
+
+    # Fast-path intent classifier (answers obvious intents without the LLM)
+    FAST_INTENT_ENABLED: bool = True
+    FAST_INTENT_THRESHOLD: float = 0.85  # Min model probability to skip the LLM
+    INTENT_MODEL_PATH: str = ""  # Trained .npz model (scripts/train_intent_classifier.py)
+    INTENT_DECISION_LOG: str = ""  # JSONL file collecting LLM routing decisions
+
+    # Stream the food parse and estimate each item as soon as it is generated
+    PARSE_FOOD_PIPELINE: bool = True
+
+    # Fused mode: one LLM call returns intent, food items and calorie estimates
+    FUSED_INTENT_MODE: bool = False
+    FUSED_INTENT_CALORIES: bool = True  # Also ask for calories in the fused call
+
+    # Per-food calorie estimate cache
+    ESTIMATE_CACHE_ENABLED: bool = True
+    ESTIMATE_CACHE_MAX_ENTRIES: int = 5000
+    ESTIMATE_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    ESTIMATE_CACHE_PATH: str = ""  # Persist the cache to this JSON file
+    ESTIMATE_CACHE_SEED_PATH: str = ""  # Warm the cache from this JSON file at startup
+
+    # LLM response cache: "none", "memory" (in-process LRU) or "sqlite" (on disk)
+    LLM_CACHE_BACKEND: str = "none"
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    LLM_CACHE_TTL_SECONDS: float = 24 * 3600
+    LLM_CACHE_PATH: str = "llm_cache.sqlite3"  # SQLite file for the "sqlite" backend
+
+    # Share one provider call between concurrent identical LLM requests
+    LLM_COALESCE_REQUESTS: bool = True
+
+    # Goal cache (write-through from goal updates)
+    GOAL_CACHE_ENABLED: bool = True
+    GOAL_CACHE_MAX_ENTRIES: int = 10000
+    GOAL_CACHE_TTL_SECONDS: float = 600.0
+
+    # Summary result cache (invalidated by new food logs and goal changes)
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_MAX_ENTRIES: int = 5000
+    SUMMARY_CACHE_TTL_SECONDS: float = 3600.0
+
     # Google APIs
     GOOGLE_CALENDAR_CREDENTIALS: str = ""
     GOOGLE_FIT_CREDENTIALS: str = ""
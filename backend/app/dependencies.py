@@ -3,22 +3,46 @@ Dependency injection for database, LLM, and authentication
 """
 
 from functools import lru_cache
+from typing import Optional
 from app.config import settings
 from app.tools.db import SupabaseClient
 from app.tools.llm import LLMClient
+from app.tools.llm_cache import create_response_cache
+from app.tools.circuit_breaker import CircuitBreaker
+from app.tools.early_stop import EarlyStopMonitor
+from app.tools.llm_replay import LLMRecorder, ReplayLLMBackend
+from app.tools.memory_db import InMemorySupabaseClient
+from app.tools.mock_llm import MockLLMBackend
+from app.tools.keyed_lock import KeyedLock
+from app.services.intent_classifier import FastIntentClassifier, IntentModel
+from app.services.estimate_cache import FoodEstimateCache
+from app.services.goal_cache import GoalCache
+from app.services.goal_engine import GoalEngine
+from app.services.import_jobs import ImportJobRegistry
+from app.services.summary_cache import SummaryCache
 
 
 @lru_cache()
 def get_db_client() -> SupabaseClient:
-    """Get Supabase database client"""
-    return SupabaseClient(url=settings.SUPABASE_URL, key=settings.SUPABASE_KEY)
+    """Get Supabase database client (or its in-memory stand-in)"""
+    pool_options = dict(
+        pool_size=settings.SUPABASE_POOL_SIZE,
+        keepalive=settings.SUPABASE_KEEPALIVE,
+        keepalive_expiry=settings.SUPABASE_KEEPALIVE_EXPIRY,
+        timeout=settings.SUPABASE_TIMEOUT,
+        batch_size=settings.SUPABASE_BATCH_SIZE,
+    )
 
+    if settings.DATABASE_BACKEND.lower() == "memory":
+        return InMemorySupabaseClient(latency=settings.MEMORY_DB_LATENCY, **pool_options)
 
-@lru_cache()
-def get_llm_client() -> LLMClient:
-    """Get LLM client (Gemini, OpenAI, Groq, or Ollama)"""
+    return SupabaseClient(url=settings.SUPABASE_URL, key=settings.SUPABASE_KEY, **pool_options)
 
-    provider = settings.LLM_PROVIDER.lower()
+
+def _create_provider_client(provider: str, model: Optional[str] = None, **kwargs) -> LLMClient:
+    """Create a client for a single provider from settings"""
+
+    provider = provider.strip().lower()
 
     # Select appropriate API key based on provider
     api_key_map = {
@@ -26,19 +50,192 @@ def get_llm_client() -> LLMClient:
         "openai": settings.OPENAI_API_KEY,
         "groq": settings.GROQ_API_KEY,
         "ollama": None,  # Ollama doesn't need API key
+        "mock": None,
+        "replay": None,
     }
 
     api_key = api_key_map.get(provider)
 
-    # Get model name (use Ollama model if provider is Ollama)
-    model = settings.OLLAMA_MODEL if provider == "ollama" else settings.LLM_MODEL
+    # Use the Ollama model unless the chain entry names one
+    if not model and provider == "ollama":
+        model = settings.OLLAMA_MODEL
 
     # Get base URL for Ollama
     base_url = settings.OLLAMA_BASE_URL if provider == "ollama" else None
 
+    breaker = None
+    if settings.LLM_BREAKER_ENABLED:
+        breaker = CircuitBreaker(
+            provider,
+            window_size=settings.LLM_BREAKER_WINDOW,
+            error_threshold=settings.LLM_BREAKER_ERROR_RATE,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+            timeout_percentile=settings.LLM_TIMEOUT_PERCENTILE,
+            timeout_multiplier=settings.LLM_TIMEOUT_MULTIPLIER,
+            min_timeout=settings.LLM_TIMEOUT_MIN,
+            max_timeout=settings.LLM_TIMEOUT_MAX,
+            default_timeout=settings.LLM_TIMEOUT_DEFAULT,
+        )
+
+    if provider == "mock":
+        kwargs.setdefault(
+            "mock_backend",
+            MockLLMBackend(
+                latency=settings.MOCK_LLM_LATENCY,
+                responses_path=settings.MOCK_LLM_RESPONSES or None,
+                error_rate=settings.MOCK_LLM_ERROR_RATE,
+            ),
+        )
+
+    if provider == "replay":
+        kwargs.setdefault("replay_backend", get_replay_backend())
+
     return LLMClient(
         provider=provider,
         api_key=api_key,
         model=model,
         base_url=base_url,
+        breaker=breaker,
+        timeout=settings.LLM_TIMEOUT_MAX,
+        native_json=settings.LLM_NATIVE_JSON,
+        recorder=get_llm_recorder(),
+        **kwargs,
+    )
+
+
+@lru_cache()
+def get_llm_recorder() -> Optional[LLMRecorder]:
+    """Get the LLM traffic recorder (None unless LLM_RECORD_PATH is set)"""
+
+    if not settings.LLM_RECORD_PATH:
+        return None
+
+    return LLMRecorder(settings.LLM_RECORD_PATH)
+
+
+@lru_cache()
+def get_replay_backend() -> ReplayLLMBackend:
+    """Get the recorded responses served by the "replay" provider"""
+
+    if not settings.LLM_REPLAY_PATH:
+        raise ValueError("LLM_REPLAY_PATH is required for the replay provider")
+
+    return ReplayLLMBackend(settings.LLM_REPLAY_PATH, timing=settings.LLM_REPLAY_TIMING)
+
+
+@lru_cache()
+def get_llm_client() -> LLMClient:
+    """Get LLM client (Gemini, OpenAI, Groq, or Ollama, plus any fallback providers)"""
+
+    # Fallbacks are plain single-provider clients; caching, coalescing and
+    # hedging happen once, in the primary client
+    fallbacks = []
+    for spec in filter(None, settings.LLM_FALLBACK_PROVIDERS.split(",")):
+        provider, _, model = spec.partition(":")
+        fallbacks.append(
+            _create_provider_client(provider, model.strip() or None, coalesce=False)
+        )
+
+    provider = settings.LLM_PROVIDER.lower()
+    # LLM_MODEL names the hosted provider's model; Ollama and the offline providers have their own
+    offline_models = {"ollama": settings.OLLAMA_MODEL, "mock": None, "replay": None}
+    model = offline_models.get(provider, settings.LLM_MODEL)
+
+    return _create_provider_client(
+        provider,
+        model,
+        cache=create_response_cache(
+            settings.LLM_CACHE_BACKEND,
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            path=settings.LLM_CACHE_PATH,
+        ),
+        coalesce=settings.LLM_COALESCE_REQUESTS,
+        fallbacks=fallbacks,
+        hedge=settings.LLM_HEDGE_ENABLED,
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY,
+        hedge_default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+        early_stop=(
+            EarlyStopMonitor(sample_rate=settings.LLM_EARLY_STOP_SAMPLE_RATE)
+            if settings.LLM_EARLY_STOP_JSON
+            else None
+        ),
+    )
+
+
+@lru_cache()
+def get_intent_classifier() -> Optional[FastIntentClassifier]:
+    """Get the fast-path intent classifier (None when disabled)"""
+
+    if not settings.FAST_INTENT_ENABLED:
+        return None
+
+    model = IntentModel.load(settings.INTENT_MODEL_PATH) if settings.INTENT_MODEL_PATH else None
+
+    return FastIntentClassifier(
+        model=model,
+        threshold=settings.FAST_INTENT_THRESHOLD,
+        decision_log_path=settings.INTENT_DECISION_LOG or None,
+    )
+
+
+@lru_cache()
+def get_estimate_cache() -> Optional[FoodEstimateCache]:
+    """Get the per-food calorie estimate cache (None when disabled)"""
+
+    if not settings.ESTIMATE_CACHE_ENABLED:
+        return None
+
+    return FoodEstimateCache(
+        max_entries=settings.ESTIMATE_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.ESTIMATE_CACHE_TTL_SECONDS,
+        persist_path=settings.ESTIMATE_CACHE_PATH or None,
+    )
+
+
+@lru_cache()
+def get_import_jobs() -> ImportJobRegistry:
+    """Get the registry of background import jobs"""
+    return ImportJobRegistry()
+
+
+@lru_cache()
+def get_user_locks() -> KeyedLock:
+    """Get the per-user write lock registry"""
+    return KeyedLock()
+
+
+@lru_cache()
+def get_goal_cache() -> Optional[GoalCache]:
+    """Get the per-user goal cache (None when disabled)"""
+
+    if not settings.GOAL_CACHE_ENABLED:
+        return None
+
+    return GoalCache(
+        max_entries=settings.GOAL_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.GOAL_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache()
+def get_goal_engine() -> GoalEngine:
+    """Get the goal engine (shared locks and cache)"""
+    return GoalEngine(
+        get_db_client(), get_user_locks(), get_goal_cache(), get_summary_cache()
+    )
+
+
+@lru_cache()
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Get the summary result cache (None when disabled)"""
+
+    if not settings.SUMMARY_CACHE_ENABLED:
+        return None
+
+    return SummaryCache(
+        max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
     )
@@ -1,8 +1,12 @@
 """
 LangGraph definition for the fitness agent
+
+The graph is compiled by ``get_fitness_graph()`` on first use (FastAPI
+startup), not at import, so importing the API does not build clients or
+load LangGraph.
 """
 
-from langgraph.graph import StateGraph, END
+from functools import lru_cache
 from app.graph.state import AgentState
 from app.graph.router import route_intent, route_to_node
 from app.nodes.parse_food import parse_food_node
@@ -10,7 +14,15 @@ from app.nodes.estimate_calories import estimate_calories_node
 from app.nodes.goal_manager import goal_manager_node
 from app.nodes.summary_weekly import summary_weekly_node
 from app.nodes.clarification import clarification_node
-from app.dependencies import get_llm_client, get_db_client
+from app.config import settings
+from app.dependencies import (
+    get_llm_client,
+    get_db_client,
+    get_intent_classifier,
+    get_estimate_cache,
+    get_goal_engine,
+    get_summary_cache,
+)
 
 
 def create_fitness_graph():
@@ -18,27 +30,70 @@ def create_fitness_graph():
     Create the LangGraph workflow for the fitness agent
     """
 
+    from langgraph.graph import StateGraph, END
+    from app.graph.traced_node import TracedNode
+
     # Initialize graph
     workflow = StateGraph(AgentState)
 
     # Get dependencies
     llm_client = get_llm_client()
     db_client = get_db_client()
+    intent_classifier = get_intent_classifier()
+    estimate_cache = get_estimate_cache()
+    summary_cache = get_summary_cache()
 
     # Add nodes
     # Add nodes - LangGraph handles async functions natively
     # We need to use functools.partial to bind the dependencies
     from functools import partial
 
-    workflow.add_node("route_intent", partial(route_intent, llm_client=llm_client))
-    workflow.add_node("parse_food", partial(parse_food_node, llm_client=llm_client))
-    workflow.add_node(
+    def add_node(name: str, node) -> None:
+        workflow.add_node(name, TracedNode(name, node))
+
+    add_node(
+        "route_intent",
+        partial(
+            route_intent,
+            llm_client=llm_client,
+            classifier=intent_classifier,
+            fused=settings.FUSED_INTENT_MODE,
+            fused_calories=settings.FUSED_INTENT_CALORIES,
+        ),
+    )
+    add_node(
+        "parse_food",
+        partial(
+            parse_food_node,
+            llm_client=llm_client,
+            estimate_cache=estimate_cache,
+            pipeline=settings.PARSE_FOOD_PIPELINE,
+        ),
+    )
+    add_node(
         "estimate_calories",
-        partial(estimate_calories_node, llm_client=llm_client, db_client=db_client),
+        partial(
+            estimate_calories_node,
+            llm_client=llm_client,
+            db_client=db_client,
+            estimate_cache=estimate_cache,
+            summary_cache=summary_cache,
+        ),
+    )
+    add_node(
+        "goal_manager",
+        partial(goal_manager_node, db_client=db_client, goal_engine=get_goal_engine()),
     )
-    workflow.add_node("goal_manager", partial(goal_manager_node, db_client=db_client))
-    workflow.add_node("summary_weekly", partial(summary_weekly_node, db_client=db_client))
-    workflow.add_node("clarification", partial(clarification_node, llm_client=llm_client))
+    add_node(
+        "summary_weekly",
+        partial(
+            summary_weekly_node,
+            db_client=db_client,
+            goal_engine=get_goal_engine(),
+            summary_cache=summary_cache,
+        ),
+    )
+    add_node("clarification", partial(clarification_node, llm_client=llm_client))
 
     # Set entry point
     workflow.set_entry_point("route_intent")
@@ -49,6 +104,7 @@ def create_fitness_graph():
         route_to_node,
         {
             "parse_food": "parse_food",
+            "estimate_calories": "estimate_calories",
             "goal_manager": "goal_manager",
             "summary_weekly": "summary_weekly",
             "clarification": "clarification",
@@ -84,5 +140,7 @@ def create_fitness_graph():
     return workflow.compile()
 
 
-# Create the graph instance
-fitness_graph = create_fitness_graph()
+@lru_cache()
+def get_fitness_graph():
+    """Get the compiled fitness graph (built and compiled on the first call)"""
+    return create_fitness_graph()
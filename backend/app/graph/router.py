@@ -2,16 +2,32 @@
 Intent routing logic for the fitness agent
 """
 
+from typing import Optional
+import logging
 from app.graph.state import AgentState
 from app.tools.llm import LLMClient
-from app.utils.prompts import get_intent_classification_prompt
-from app.utils.output_parsers import intent_parser
+from app.services.intent_classifier import FastIntentClassifier
+from app.utils.prompts import get_intent_classification_prompt, get_fused_intent_prompt
+from app.utils.output_parsers import IntentClassification, FusedIntentExtraction
+from app.utils.constants import INTENT_LOG_FOOD
 
+logger = logging.getLogger(__name__)
 
-async def route_intent(state: AgentState, llm_client: LLMClient) -> AgentState:
+
+async def route_intent(
+    state: AgentState,
+    llm_client: LLMClient,
+    classifier: Optional[FastIntentClassifier] = None,
+    fused: bool = False,
+    fused_calories: bool = True,
+) -> AgentState:
     """
     Classify user intent from the message
 
+    In fused mode a single LLM call also extracts food items (and optionally
+    suggested calorie estimates) so the graph can skip parse_food and, when
+    the suggestions match the items, the estimation call.
+
     Possible intents:
     - log_food: User wants to log food/meal
     - set_goal: User wants to set or update fitness goals
@@ -22,34 +38,99 @@ async def route_intent(state: AgentState, llm_client: LLMClient) -> AgentState:
 
     message = state["message"]
 
-    print(f"\n[ROUTER] Classifying intent for message: {message}")
+    logger.debug("Classifying intent", extra={"user_message": message})
+
+    # Answer obvious messages locally without an LLM round-trip
+    if classifier is not None:
+        fast_result = classifier.classify(message)
+        # Food logs still need extraction, which the fused call does for free
+        if fast_result and not (fused and fast_result["intent"] == INTENT_LOG_FOOD):
+            state["intent"] = fast_result["intent"]
+            state["confidence"] = fast_result["confidence"]
+            logger.info(
+                "Fast-path intent",
+                extra={
+                    "source": fast_result["source"],
+                    "intent": fast_result["intent"],
+                    "confidence": fast_result["confidence"],
+                },
+            )
+            return state
+
+    if fused:
+        return await _route_intent_fused(state, llm_client, classifier, fused_calories)
 
     # Use LLM to classify intent with structured output
     prompt = get_intent_classification_prompt(message)
-    response = await llm_client.generate(prompt, temperature=0.3)
-
-    print(f"[ROUTER] Raw LLM response: {response[:200]}...")
 
     try:
-        # Clean response (remove <think> tags, markdown, etc.)
-        from app.utils.output_parsers import clean_llm_response
+        # Native JSON mode, validated into IntentClassification
+        result = await llm_client.generate_structured(prompt, IntentClassification)
+        state["intent"] = result.intent
+        state["confidence"] = result.confidence
+
+        logger.info(
+            "Classified intent",
+            extra={"intent": result.intent, "confidence": result.confidence},
+        )
+    except Exception as e:
+        logger.warning("Intent parsing failed", extra={"error": str(e)})
+        state["intent"] = "clarify"
+        state["confidence"] = 0.0
+        state["needs_clarification"] = True
+        return state
+
+    if classifier is not None:
+        await classifier.record_fallback(message, result.intent, result.confidence)
+    return state
 
-        cleaned_response = clean_llm_response(response)
-        print(f"[ROUTER] Cleaned LLM response: {cleaned_response}")
 
-        # Use LangChain parser to extract structured data
-        result = intent_parser.parse(cleaned_response)
+async def _route_intent_fused(
+    state: AgentState,
+    llm_client: LLMClient,
+    classifier: Optional[FastIntentClassifier],
+    include_calories: bool,
+) -> AgentState:
+    """Classify intent and extract food items (and calories) in one LLM call"""
+
+    message = state["message"]
+
+    prompt = get_fused_intent_prompt(message, include_calories=include_calories)
+
+    try:
+        result = await llm_client.generate_structured(prompt, FusedIntentExtraction)
         state["intent"] = result.intent
         state["confidence"] = result.confidence
 
-        print(f"[ROUTER] Classified as: {result.intent} ({result.confidence})")
+        if result.intent == INTENT_LOG_FOOD and result.items:
+            state["food_items"] = [item.dict() for item in result.items]
+            state["needs_clarification"] = False
+
+            # Checked by the calorie engine like any other LLM estimate
+            if include_calories and result.estimates:
+                state["suggested_estimates"] = [
+                    {**estimate.dict(), "calories": round(estimate.calories)}
+                    for estimate in result.estimates
+                ]
+
+        logger.info(
+            "Fused intent",
+            extra={
+                "intent": result.intent,
+                "confidence": result.confidence,
+                "items": len(result.items),
+                "estimates": bool(state.get("suggested_estimates")),
+            },
+        )
     except Exception as e:
-        print(f"[DEBUG] Intent parsing error: {e}")
-        print(f"[DEBUG] Raw response: {response}")
+        logger.warning("Fused parsing failed", extra={"error": str(e)})
         state["intent"] = "clarify"
         state["confidence"] = 0.0
         state["needs_clarification"] = True
+        return state
 
+    if classifier is not None:
+        await classifier.record_fallback(message, result.intent, result.confidence)
     return state
 
 
@@ -64,6 +145,10 @@ def route_to_node(state: AgentState) -> str:
     if confidence < 0.6:
         return "clarification"
 
+    # Fused mode already extracted the food items: skip parse_food
+    if intent == "log_food" and state.get("food_items"):
+        return "estimate_calories"
+
     # Route based on intent
     intent_map = {
         "log_food": "parse_food",
@@ -21,6 +21,7 @@ class AgentState(TypedDict):
     # Food logging
     food_items: Optional[List[Dict[str, Any]]]  # [{name, quantity, unit}]
     estimated_calories: Optional[Dict[str, Any]]  # {total, breakdown}
+    suggested_estimates: Optional[List[Dict[str, Any]]]  # Fused-routing breakdown to validate
 
     # Goal management
     goal_type: Optional[str]  # "weight_loss", "muscle_gain", "maintenance"
@@ -0,0 +1,36 @@
+"""
+Graph node runnable
+
+LangGraph wraps a plain function node in a ``RunnableLambda``. Every call of
+one then configures a callback manager and serializes the runnable for it,
+and ``RunnableLambda``'s repr re-reads and parses the function's source with
+``inspect.getsource`` each time, which made that bookkeeping most of a chat's
+CPU time. The agent attaches no LangChain callbacks and times nodes with its
+own spans, so nodes are this minimal runnable instead: it awaits the node
+directly, and serializes as its name.
+"""
+
+from typing import Any, Awaitable, Callable, Optional
+from langchain_core.runnables import Runnable, RunnableConfig
+from app.graph.state import AgentState
+from app.utils.tracing import NODE_SECONDS, span
+
+
+class TracedNode(Runnable[AgentState, AgentState]):
+    """An async graph node, recorded as a timing span on each run"""
+
+    def __init__(self, name: str, node: Callable[[AgentState], Awaitable[AgentState]]):
+        self.name = name
+        self.node = node
+
+    def __repr__(self) -> str:
+        return f"TracedNode({self.name})"
+
+    def invoke(self, input: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+        raise NotImplementedError("Graph nodes are async; use ainvoke or astream")
+
+    async def ainvoke(
+        self, input: AgentState, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AgentState:
+        with span(NODE_SECONDS, "graph node", node=self.name):
+            return await self.node(input)
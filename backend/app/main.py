@@ -4,8 +4,18 @@ FastAPI entry point for Fitness AI Agent
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import chat, goals, summaries, health
+from app.api import chat, goals, summaries, health, stats, imports, metrics
 from app.config import settings
+from app.dependencies import (
+    get_db_client,
+    get_estimate_cache,
+    get_import_jobs,
+    get_llm_recorder,
+)
+from app.graph.graph import get_fitness_graph
+from app.utils.log import configure_logging
+
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
 
 app = FastAPI(
     title="Fitness AI Agent API",
@@ -31,6 +41,36 @@ app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(chat.router, prefix="/api", tags=["chat"])
 app.include_router(goals.router, prefix="/api", tags=["goals"])
 app.include_router(summaries.router, prefix="/api", tags=["summaries"])
+app.include_router(stats.router, prefix="/api", tags=["stats"])
+app.include_router(imports.router, prefix="/api", tags=["import"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
+
+
+@app.on_event("startup")
+async def startup():
+    """Compile the agent graph and warm the calorie estimate cache"""
+    # Compile before serving so the first chat request does not pay for it
+    get_fitness_graph()
+
+    estimate_cache = get_estimate_cache()
+    if estimate_cache is not None:
+        estimate_cache.load()
+        if settings.ESTIMATE_CACHE_SEED_PATH:
+            estimate_cache.warm(settings.ESTIMATE_CACHE_SEED_PATH)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop imports, persist caches and traffic recordings, release database connections"""
+    # Interrupted imports resume from their checkpoints on the next upload
+    await get_import_jobs().cancel_all()
+    estimate_cache = get_estimate_cache()
+    if estimate_cache is not None:
+        estimate_cache.save()
+    recorder = get_llm_recorder()
+    if recorder is not None:
+        recorder.close()
+    await get_db_client().close()
 
 
 @app.get("/")
@@ -2,10 +2,13 @@
 Clarification node - asks user for more information when intent is unclear
 """
 
+import logging
 from app.graph.state import AgentState
 from app.tools.llm import LLMClient
 from app.utils.prompts import CLARIFICATION_PROMPT
 
+logger = logging.getLogger(__name__)
+
 
 async def clarification_node(state: AgentState, llm_client: LLMClient) -> AgentState:
     """
@@ -13,7 +16,7 @@ async def clarification_node(state: AgentState, llm_client: LLMClient) -> AgentS
     """
 
     message = state["message"]
-    print(f"\n[CLARIFICATION] Generating question for: {message}")
+    logger.debug("Generating clarification question", extra={"user_message": message})
 
     # If there's already a clarification question, use it
     if state.get("clarification_question"):
@@ -22,7 +25,7 @@ async def clarification_node(state: AgentState, llm_client: LLMClient) -> AgentS
 
     # Otherwise, generate one using LLM
     prompt = CLARIFICATION_PROMPT.format(message=message)
-    clarification = await llm_client.generate(prompt)
+    clarification = await llm_client.generate(prompt, stream_tokens=True)
 
     state["response"] = clarification
     state["needs_clarification"] = True
@@ -6,11 +6,22 @@ from app.graph.state import AgentState
 from app.tools.llm import LLMClient
 from app.tools.db import SupabaseClient
 from app.services.calorie_engine import CalorieEngine
+from app.services.estimate_cache import FoodEstimateCache
+from app.services.rollup_engine import RollupEngine
+from app.services.summary_cache import SummaryCache
 from datetime import datetime
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 async def estimate_calories_node(
-    state: AgentState, llm_client: LLMClient, db_client: SupabaseClient
+    state: AgentState,
+    llm_client: LLMClient,
+    db_client: SupabaseClient,
+    estimate_cache: Optional[FoodEstimateCache] = None,
+    summary_cache: Optional[SummaryCache] = None,
 ) -> AgentState:
     """
     Estimate calories for food items and save to database
@@ -19,17 +30,22 @@ async def estimate_calories_node(
     food_items = state.get("food_items", [])
     user_id = state["user_id"]
 
-    print(f"\n[ESTIMATE] Estimating calories for: {food_items}")
+    logger.debug("Estimating calories", extra={"food_items": food_items})
 
     if not food_items:
-        print(f"[ESTIMATE] No food items to process")
+        logger.info("No food items to process")
         state["response"] = "No food items found to log."
         return state
 
-    # Use calorie engine to estimate
-    calorie_engine = CalorieEngine(llm_client)
-    estimated_calories = await calorie_engine.estimate_calories(food_items)
-    print(f"[ESTIMATE] Total estimated: {estimated_calories.get('total')} kcal")
+    # Reuse the engine's estimates from pipelined parsing; otherwise estimate
+    # now, trying fused-routing suggestions for items the local lookup misses
+    estimated_calories = state.get("estimated_calories")
+    if not estimated_calories:
+        calorie_engine = CalorieEngine(llm_client, estimate_cache=estimate_cache)
+        estimated_calories = await calorie_engine.estimate_calories(
+            food_items, suggested=state.get("suggested_estimates")
+        )
+    logger.info("Estimated calories", extra={"total_kcal": estimated_calories.get("total")})
 
     state["estimated_calories"] = estimated_calories
 
@@ -42,7 +58,11 @@ async def estimate_calories_node(
         "breakdown": estimated_calories["breakdown"],
     }
 
-    await db_client.insert("food_logs", log_entry)
+    # The log and its daily rollup are written in one database call
+    rollup_engine = RollupEngine(db_client)
+    await rollup_engine.log_meals(user_id, [log_entry])
+    if summary_cache:
+        summary_cache.invalidate_user(user_id)
 
     # Generate response
     total = estimated_calories["total"]
@@ -2,13 +2,23 @@
 Goal management node - handles setting and updating fitness goals
 """
 
+from typing import Optional
+from pydantic import ValidationError
 from app.graph.state import AgentState
+from app.models.schemas import UserGoal
+from app.services.goal_engine import GoalEngine
 from app.tools.db import SupabaseClient
+from app.utils.constants import GOAL_MAINTENANCE
 from app.utils.prompts import GOAL_EXTRACTION_PROMPT
 import json
+import logging
 
+logger = logging.getLogger(__name__)
 
-async def goal_manager_node(state: AgentState, db_client: SupabaseClient) -> AgentState:
+
+async def goal_manager_node(
+    state: AgentState, db_client: SupabaseClient, goal_engine: Optional[GoalEngine] = None
+) -> AgentState:
     """
     Set or update user fitness goals
 
@@ -22,32 +32,45 @@ async def goal_manager_node(state: AgentState, db_client: SupabaseClient) -> Age
     user_id = state["user_id"]
     message = state["message"]
 
-    print(f"\n[GOAL_MANAGER] Managing goals for user {user_id}: {message}")
+    logger.debug("Managing goals", extra={"user_id": user_id, "user_message": message})
 
     # Extract goal information from message
     # This could use LLM or simple parsing
     # For now, we'll use a simple approach
 
-    goal_data = state.get("goal_data", {})
+    goal_data = state.get("goal_data") or {}
+
+    # goal_type may be missing or None; default it, then validate before saving
+    try:
+        goal = UserGoal(
+            user_id=user_id,
+            goal_type=state.get("goal_type") or GOAL_MAINTENANCE,
+            target_calories=goal_data.get("target_calories"),
+            target_weight=goal_data.get("target_weight"),
+            target_date=goal_data.get("target_date"),
+            created_at=state["timestamp"],
+        )
+    except ValidationError as e:
+        logger.info("Invalid goal", extra={"user_id": user_id, "error": str(e)})
+        state["needs_clarification"] = True
+        state["response"] = (
+            "I couldn't save that goal. Please choose weight loss, muscle gain or "
+            "maintenance, optionally with a daily calorie target."
+        )
+        return state
 
     # Save goal to database
     goal_entry = {
-        "user_id": user_id,
-        "goal_type": state.get("goal_type", "maintenance"),
-        "target_calories": goal_data.get("target_calories"),
-        "target_weight": goal_data.get("target_weight"),
-        "target_date": goal_data.get("target_date"),
-        "created_at": state["timestamp"].isoformat(),
+        "goal_type": goal.goal_type,
+        "target_calories": goal.target_calories,
+        "target_weight": goal.target_weight,
+        "target_date": goal.target_date,
+        "created_at": goal.created_at.isoformat(),
     }
 
-    # Check if goal exists
-    existing_goal = await db_client.query("goals", filters={"user_id": user_id})
-
-    if existing_goal:
-        await db_client.update("goals", goal_entry, {"user_id": user_id})
-        state["response"] = "✅ Goal updated successfully!"
-    else:
-        await db_client.insert("goals", goal_entry)
-        state["response"] = "✅ Goal set successfully!"
+    # Single upsert on user_id - no read-then-write race
+    goal_engine = goal_engine or GoalEngine(db_client)
+    await goal_engine.save_goal(user_id, goal_entry)
+    state["response"] = "✅ Goal saved successfully!"
 
     return state
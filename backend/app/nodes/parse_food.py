@@ -4,11 +4,25 @@ Food parsing node - extracts food items from user message
 
 from app.graph.state import AgentState
 from app.tools.llm import LLMClient
+from app.services.calorie_engine import CalorieEngine
+from app.services.estimate_cache import FoodEstimateCache
 from app.utils.prompts import get_food_parsing_prompt
-from app.utils.output_parsers import food_items_parser
+from app.utils.output_parsers import FoodItem, FoodItemsList
+from app.utils.json_stream import StreamingItemParser
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
 
+logger = logging.getLogger(__name__)
 
-async def parse_food_node(state: AgentState, llm_client: LLMClient) -> AgentState:
+
+async def parse_food_node(
+    state: AgentState,
+    llm_client: LLMClient,
+    estimate_cache: Optional[FoodEstimateCache] = None,
+    pipeline: bool = True,
+) -> AgentState:
     """
     Parse food items from user message
 
@@ -16,35 +30,37 @@ async def parse_food_node(state: AgentState, llm_client: LLMClient) -> AgentStat
     - Food name
     - Quantity
     - Unit (grams, cups, pieces, etc.)
+
+    With ``pipeline`` the parse is streamed and each item is sent to calorie
+    estimation as soon as its JSON object closes, so estimation overlaps the
+    rest of the generation; the estimates are left in ``estimated_calories``
+    for estimate_calories_node to reuse.
     """
 
     message = state["message"]
-    print(f"\n[PARSE_FOOD] Parsing items from: {message}")
+    logger.debug("Parsing food items", extra={"user_message": message})
 
     # Use LLM to parse food items with structured output
     prompt = get_food_parsing_prompt(message)
-    response = await llm_client.generate(prompt, temperature=0.3)
-
-    print(f"[PARSE_FOOD] Raw LLM response: {response[:200]}...")
 
     try:
-        # Clean response (remove <think> tags, markdown, etc.)
-        from app.utils.output_parsers import clean_llm_response
-
-        cleaned_response = clean_llm_response(response)
-        print(f"[PARSE_FOOD] Cleaned LLM response: {cleaned_response}")
+        if pipeline:
+            food_items, estimated_calories = await _parse_and_estimate(
+                prompt, llm_client, estimate_cache
+            )
+            if estimated_calories is not None:
+                state["estimated_calories"] = estimated_calories
+        else:
+            # Native JSON mode, validated into FoodItemsList
+            parsed_result = await llm_client.generate_structured(prompt, FoodItemsList)
+            food_items = [item.dict() for item in parsed_result.items]
 
-        # Use LangChain parser to extract structured data
-        parsed_result = food_items_parser.parse(cleaned_response)
-        food_items = [item.dict() for item in parsed_result.items]
-
-        print(f"[PARSE_FOOD] Parsed items: {food_items}")
+        logger.debug("Parsed food items", extra={"food_items": food_items})
         state["food_items"] = food_items
         state["needs_clarification"] = False
 
     except Exception as e:
-        print(f"[PARSE_FOOD] Error: {e}")
-        print(f"[PARSE_FOOD] Raw response was: {response}")
+        logger.warning("Food parsing failed", extra={"error": str(e)})
         state["food_items"] = []
         state["needs_clarification"] = True
         state["clarification_question"] = (
@@ -52,3 +68,59 @@ async def parse_food_node(state: AgentState, llm_client: LLMClient) -> AgentStat
         )
 
     return state
+
+
+async def _parse_and_estimate(
+    prompt: str,
+    llm_client: LLMClient,
+    estimate_cache: Optional[FoodEstimateCache],
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Stream the parse, estimating each item while later ones are generated
+
+    Returns:
+        (food_items, estimated_calories); estimated_calories is None when
+        the streamed items could not be used and estimation is left to the
+        estimate_calories node
+    """
+    calorie_engine = CalorieEngine(llm_client, estimate_cache=estimate_cache)
+    parser = StreamingItemParser("items")
+    streamed: List[Dict[str, Any]] = []
+    tasks: List[asyncio.Future] = []
+
+    try:
+        try:
+            async for chunk in llm_client.stream_structured(prompt, FoodItemsList):
+                for raw_item in parser.feed(chunk):
+                    try:
+                        item = FoodItem.model_validate(raw_item).dict()
+                    except ValidationError:
+                        continue
+                    streamed.append(item)
+                    tasks.append(asyncio.ensure_future(calorie_engine.estimate_items([item])))
+            parsed_result = llm_client.validate_structured(parser.text, FoodItemsList)
+        except Exception as e:
+            # Stream failed or its output was unusable; retry without the cache
+            logger.warning("Streamed parse failed, retrying", extra={"error": str(e)})
+            parsed_result = await llm_client.generate_structured(
+                prompt, FoodItemsList, use_cache=False, max_retries=0
+            )
+        food_items = [item.dict() for item in parsed_result.items]
+
+        if food_items != streamed:
+            logger.info("Streamed items differ from the final parse, re-estimating later")
+            return food_items, None
+
+        try:
+            estimates = await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.warning(
+                "Pipelined estimation failed, re-estimating later", extra={"error": str(e)}
+            )
+            return food_items, None
+        logger.debug("Estimated items while parsing", extra={"items": len(tasks)})
+        return food_items, CalorieEngine.summarize([e[0] for e in estimates])
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
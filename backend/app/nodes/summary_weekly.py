@@ -2,36 +2,30 @@
 Weekly summary node - generates weekly fitness summary
 """
 
+from typing import Optional
 from app.graph.state import AgentState
 from app.tools.db import SupabaseClient
+from app.services.goal_engine import GoalEngine
+from app.services.summary_cache import SummaryCache
 from app.services.summary_engine import SummaryEngine
-from datetime import datetime, timedelta
 
 
 async def summary_weekly_node(
-    state: AgentState, db_client: SupabaseClient
+    state: AgentState,
+    db_client: SupabaseClient,
+    goal_engine: Optional[GoalEngine] = None,
+    summary_cache: Optional[SummaryCache] = None,
 ) -> AgentState:
     """
     Generate weekly summary of calories, goals, and progress
     """
 
     user_id = state["user_id"]
-    period = state.get("summary_period", "weekly")
-
-    # Calculate date range
-    end_date = datetime.now()
-    if period == "daily":
-        start_date = end_date - timedelta(days=1)
-    elif period == "weekly":
-        start_date = end_date - timedelta(days=7)
-    else:  # monthly
-        start_date = end_date - timedelta(days=30)
-
-    # Get summary data
-    summary_engine = SummaryEngine(db_client)
-    summary_data = await summary_engine.generate_summary(
-        user_id=user_id, start_date=start_date, end_date=end_date
-    )
+    period = state.get("summary_period") or "weekly"
+
+    # Get summary data (cached per user, period and day)
+    summary_engine = SummaryEngine(db_client, goal_engine, summary_cache)
+    summary_data = await summary_engine.get_period_summary(user_id, period)
 
     state["summary_data"] = summary_data
 
@@ -2,23 +2,54 @@
 Calorie estimation engine
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from collections import defaultdict
+import logging
 from app.tools.llm import LLMClient
-from app.utils.prompts import CALORIE_ESTIMATION_PROMPT
+from app.services.nutrient_db import NutrientDatabase, food_key, get_default_nutrient_db
+from app.services.estimate_cache import FoodEstimateCache
+from app.utils.prompts import get_calorie_estimation_prompt
+from app.utils.output_parsers import CalorieEstimation
+
+logger = logging.getLogger(__name__)
 
 
 class CalorieEngine:
     """Engine for estimating calories from food items"""
 
-    def __init__(self, llm_client: LLMClient):
+    def __init__(
+        self,
+        llm_client: LLMClient,
+        nutrient_db: Optional[NutrientDatabase] = None,
+        estimate_cache: Optional[FoodEstimateCache] = None,
+    ):
         self.llm_client = llm_client
+        self.nutrient_db = nutrient_db or get_default_nutrient_db()
+        self.estimate_cache = estimate_cache
+
+    def _estimate_locally(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Resolve an item from the nutrient database or the estimate cache"""
+        estimate = self.nutrient_db.estimate(item)
+        if estimate is None and self.estimate_cache is not None:
+            estimate = self.estimate_cache.get(item)
+        return estimate
 
-    async def estimate_calories(self, food_items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def estimate_calories(
+        self,
+        food_items: List[Dict[str, Any]],
+        suggested: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
         """
         Estimate calories for a list of food items
 
+        Foods found in the local nutrient database or the estimate cache are
+        resolved without a network call; only the remaining items are sent to
+        the LLM, and their estimates are cached for next time.
+
         Args:
             food_items: List of {name, quantity, unit}
+            suggested: Estimates already generated with the items (fused
+                routing), used for local misses before asking the LLM
 
         Returns:
             {
@@ -27,19 +58,148 @@ class CalorieEngine:
             }
         """
 
+        result = self.summarize(await self.estimate_items(food_items, suggested=suggested))
+        logger.debug("Estimated calories", extra={"total": result["total"]})
+
+        return result
+
+    @staticmethod
+    def summarize(breakdown: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Build the {total, breakdown} result from per-item estimates"""
+        breakdown = [estimate for estimate in breakdown if estimate is not None]
+        return {
+            "total": round(sum(item.get("calories", 0) or 0 for item in breakdown)),
+            "breakdown": breakdown,
+        }
+
+    async def estimate_items(
+        self,
+        food_items: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        suggested: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Estimate each item, returning a list aligned with ``food_items``
+
+        Local hits are resolved first, then ``suggested`` estimates are
+        matched to the misses like LLM results; the remaining misses are sent
+        to the LLM in prompts of at most ``batch_size`` items (all at once by
+        default). Items the LLM still has not returned after one retry come
+        back as None.
+        """
+
+        breakdown: List[Optional[Dict[str, Any]]] = [
+            self._estimate_locally(item) for item in food_items
+        ]
+        misses = [i for i, estimate in enumerate(breakdown) if estimate is None]
+
+        logger.debug(
+            "Estimating items",
+            extra={"items": len(food_items), "local": len(food_items) - len(misses)},
+        )
+
+        if misses and suggested:
+            misses = self._apply_estimates(food_items, misses, suggested, breakdown)
+
+        batch_size = batch_size or len(misses) or 1
+        for start in range(0, len(misses), batch_size):
+            batch = misses[start : start + batch_size]
+            unmatched = await self._fill_from_llm(food_items, batch, breakdown)
+            if unmatched:
+                # One more prompt for the items the LLM dropped or renamed
+                unmatched = await self._fill_from_llm(food_items, unmatched, breakdown)
+            if unmatched:
+                logger.warning(
+                    "No LLM estimate for items",
+                    extra={"items": [food_items[i] for i in unmatched]},
+                )
+
+        return breakdown
+
+    async def _fill_from_llm(
+        self,
+        food_items: List[Dict[str, Any]],
+        indices: List[int],
+        breakdown: List[Optional[Dict[str, Any]]],
+    ) -> List[int]:
+        """
+        Estimate ``food_items[i]`` for ``indices`` in one prompt, filling ``breakdown``
+
+        Returns:
+            Indices that got no estimate
+        """
+
+        estimates = await self._estimate_with_llm([food_items[i] for i in indices])
+        return self._apply_estimates(food_items, indices, estimates, breakdown)
+
+    def _apply_estimates(
+        self,
+        food_items: List[Dict[str, Any]],
+        indices: List[int],
+        estimates: List[Dict[str, Any]],
+        breakdown: List[Optional[Dict[str, Any]]],
+    ) -> List[int]:
+        """
+        Fill ``breakdown[i]`` for ``indices`` from LLM-generated ``estimates``
+
+        The LLM may reorder, merge or drop items, so estimates are matched to
+        items by food name rather than by position; when a food appears more
+        than once, the estimate for the same portion is preferred. Only
+        matched estimates for the same portion are cached.
+
+        Returns:
+            Indices that got no estimate
+        """
+
+        by_name: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for estimate in estimates:
+            by_name[food_key(estimate.get("name", ""))].append(estimate)
+
+        unmatched = []
+        for i in indices:
+            item = food_items[i]
+            candidates = by_name.get(food_key(item.get("name", "")))
+            if not candidates:
+                unmatched.append(i)
+                continue
+
+            estimate = next(
+                (c for c in candidates if FoodEstimateCache.same_portion(item, c)),
+                candidates[0],
+            )
+            candidates.remove(estimate)
+            breakdown[i] = estimate
+
+            # put() rejects estimates for another unit or quantity
+            if self.estimate_cache is not None and not self.estimate_cache.put(item, estimate):
+                logger.warning(
+                    "Estimate does not match its item, not cached",
+                    extra={"item": item, "estimate": estimate},
+                )
+
+        extra = [estimate for candidates in by_name.values() for estimate in candidates]
+        if extra:
+            logger.debug("Ignoring estimates for items not asked about", extra={"extra": extra})
+
+        return unmatched
+
+    async def _estimate_with_llm(self, food_items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ask the LLM for the breakdown of items the local database does not know"""
+
         # Format food items for prompt
         items_text = "\n".join(
             [f"- {item['name']}: {item['quantity']} {item['unit']}" for item in food_items]
         )
 
-        print(f"\n[CALORIE_ENGINE] Estimating for {len(food_items)} items")
-        prompt = CALORIE_ESTIMATION_PROMPT.format(food_items=items_text)
+        prompt = get_calorie_estimation_prompt(items_text)
 
-        # Get LLM estimation
-        result = await self.llm_client.generate_json(prompt)
-        print(f"[CALORIE_ENGINE] Result: {result}")
+        # Get LLM estimation, validated against the CalorieEstimation schema
+        result = await self.llm_client.generate_structured(prompt, CalorieEstimation)
 
-        return result
+        return [
+            {**estimate.dict(), "calories": round(estimate.calories)}
+            for estimate in result.breakdown
+        ]
 
     async def estimate_single_item(self, name: str, quantity: float, unit: str) -> Dict[str, Any]:
         """Estimate calories for a single food item"""
@@ -0,0 +1,155 @@
+"""
+Per-food calorie estimate cache
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import json
+import os
+from app.services.nutrient_db import food_key
+from app.utils.ttl_cache import TTLCache
+from app.utils.units import CANONICAL_COUNT, canonicalize, normalize_unit
+
+NUTRITION_FIELDS = ["calories", "protein", "carbs", "fat"]
+
+# Relative difference under which two amounts count as the same portion
+PORTION_TOLERANCE = 0.01
+
+# Cache unit per count unit: a piece and an item are one whole food, but a
+# serving or a slice is a different amount, so each keeps its own entries
+COUNT_UNITS = {"pieces": "piece", "items": "piece", "servings": "serving", "slices": "slice"}
+
+
+class FoodEstimateCache:
+    """
+    Cache of per-unit nutrition keyed on (food key, canonical unit)
+
+    Estimates are stored per single canonical unit (1 g, 1 ml, or one
+    piece, serving or slice) under the singular normalized name, so
+    "2 eggs" is served by scaling a cached "1 egg" result.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = 7 * 24 * 3600,
+        persist_path: Optional[str] = None,
+    ):
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.persist_path = persist_path
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> Optional[Tuple[Tuple[str, str], float]]:
+        """Return ((name, canonical unit), quantity in that unit) for an item"""
+        name = food_key(item.get("name", ""))
+        try:
+            quantity = float(item.get("quantity") or 1)
+        except (TypeError, ValueError):
+            return None
+        if not name or quantity <= 0:
+            return None
+
+        canonical = canonicalize(quantity, item.get("unit"))
+        if canonical is None:
+            # Unknown units ("bowl", "can") still scale within themselves
+            unit = (item.get("unit") or "").strip().lower().rstrip("s")
+            canonical = (quantity, unit)
+
+        amount, unit = canonical
+        if unit == CANONICAL_COUNT:
+            unit = COUNT_UNITS[normalize_unit(item.get("unit"))]
+        return (name, unit), amount
+
+    @classmethod
+    def same_portion(cls, item: Dict[str, Any], estimate: Dict[str, Any]) -> bool:
+        """True when ``estimate`` is for the same food, unit and amount as ``item``"""
+        item_key, estimate_key = cls._key(item), cls._key(estimate)
+        if item_key is None or estimate_key is None:
+            return False
+
+        (item_name, item_unit), item_amount = item_key
+        (estimate_name, estimate_unit), estimate_amount = estimate_key
+        return (
+            item_name == estimate_name
+            and item_unit == estimate_unit
+            and abs(item_amount - estimate_amount) <= PORTION_TOLERANCE * item_amount
+        )
+
+    def get(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a scaled estimate for {name, quantity, unit}, or None on a miss"""
+        key = self._key(item)
+        if key is None:
+            return None
+
+        cache_key, amount = key
+        per_unit = self.cache.get(cache_key)
+        if per_unit is None:
+            return None
+
+        estimate = {
+            "name": item["name"],
+            "quantity": item.get("quantity"),
+            "unit": item.get("unit"),
+        }
+        for field in NUTRITION_FIELDS:
+            value = per_unit.get(field, 0) * amount
+            estimate[field] = round(value) if field == "calories" else round(value, 1)
+        return estimate
+
+    def put(self, item: Dict[str, Any], estimate: Dict[str, Any]) -> bool:
+        """
+        Store an estimate for {name, quantity, unit} as per-unit nutrition
+
+        The estimate must echo the item's food, unit and quantity (see
+        ``same_portion``), so an estimate for another food or portion never
+        poisons the entry. Returns whether it was stored.
+        """
+        key = self._key(item)
+        if key is None or not self.same_portion(item, estimate):
+            return False
+
+        cache_key, amount = key
+        try:
+            per_unit = {
+                field: float(estimate.get(field) or 0) / amount for field in NUTRITION_FIELDS
+            }
+        except (TypeError, ValueError):
+            return False
+        self.cache.set(cache_key, per_unit)
+        return True
+
+    def warm(self, seed_path: str) -> int:
+        """Load seed estimates (a JSON list of breakdown items); returns the count stored"""
+        with open(seed_path, encoding="utf-8") as f:
+            seeds: List[Dict[str, Any]] = json.load(f)
+
+        return sum(self.put(estimate, estimate) for estimate in seeds)
+
+    def load(self) -> int:
+        """Restore entries persisted by ``save``; returns the count"""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return 0
+
+        with open(self.persist_path, encoding="utf-8") as f:
+            entries = json.load(f)
+
+        for name, unit, per_unit, expires_at in entries:
+            self.cache.set((name, unit), per_unit, expires_at=expires_at)
+        return len(self.cache)
+
+    def save(self) -> None:
+        """Persist live entries to disk"""
+        if not self.persist_path:
+            return
+
+        entries = [
+            [name, unit, per_unit, expires_at]
+            for (name, unit), per_unit, expires_at in self.cache.items()
+        ]
+        tmp_path = f"{self.persist_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.persist_path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        return self.cache.stats()
@@ -0,0 +1,43 @@
+"""
+Per-user goal cache
+"""
+
+from typing import Any, Dict, Optional, Tuple
+from app.utils.ttl_cache import TTLCache
+
+_MISSING = object()
+
+
+class GoalCache:
+    """
+    In-process cache of each user's goal row
+
+    Users without a goal are cached too (as None), so repeated summaries for
+    them do not hit the database either. Goal writes keep the cache current
+    through ``set``; ``invalidate`` drops an entry when the new value is
+    unknown.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = 600):
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Return (hit, goal); goal is None for users known to have no goal"""
+        goal = self.cache.get(user_id, _MISSING)
+        if goal is _MISSING:
+            return False, None
+        return True, goal
+
+    def set(self, user_id: str, goal: Optional[Dict[str, Any]]) -> None:
+        """Store the user's current goal (None = no goal)"""
+        self.cache.set(user_id, dict(goal) if goal is not None else None)
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget the user's goal"""
+        if self.cache.delete(user_id):
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics"""
+        return {**self.cache.stats(), "invalidations": self.invalidations}
@@ -0,0 +1,97 @@
+"""
+Goal persistence engine
+"""
+
+from typing import Dict, Any, Optional
+from app.services.goal_cache import GoalCache
+from app.services.summary_cache import SummaryCache
+from app.tools.db import SupabaseClient
+from app.tools.keyed_lock import KeyedLock
+
+
+class GoalEngine:
+    """Engine for reading and writing a user's fitness goal"""
+
+    def __init__(
+        self,
+        db_client: SupabaseClient,
+        user_locks: Optional[KeyedLock] = None,
+        goal_cache: Optional[GoalCache] = None,
+        summary_cache: Optional[SummaryCache] = None,
+    ):
+        """
+        Initialize goal engine
+
+        Args:
+            db_client: Database client
+            user_locks: Shared per-user lock registry; writes for one user are
+                serialized through it while other users proceed in parallel
+            goal_cache: Optional goal cache, read through and written through
+            summary_cache: Optional summary cache, invalidated on goal changes
+        """
+        self.db_client = db_client
+        self.user_locks = user_locks or KeyedLock()
+        self.goal_cache = goal_cache
+        self.summary_cache = summary_cache
+
+    async def save_goal(self, user_id: str, goal_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create or replace the user's goal
+
+        A single upsert on the unique ``goals.user_id`` constraint, so the
+        write is one round-trip and atomic even across instances.
+
+        Returns:
+            The stored goal row
+        """
+
+        goal_entry = {**goal_data, "user_id": user_id}
+
+        async with self.user_locks.hold(user_id):
+            try:
+                rows = await self.db_client.upsert("goals", goal_entry, on_conflict="user_id")
+            except Exception:
+                # The write may or may not have landed
+                if self.goal_cache:
+                    self.goal_cache.invalidate(user_id)
+                raise
+
+            goal = rows[0] if rows else goal_entry
+            if self.goal_cache:
+                self.goal_cache.set(user_id, goal)
+            if self.summary_cache:
+                # Goal adherence and insights depend on the target
+                self.summary_cache.invalidate_user(user_id)
+
+        return goal
+
+    async def get_goal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the user's current goal, or None
+
+        A cache miss reads and fills under the user's write lock, so a fill
+        from a read that started before a concurrent ``save_goal`` can never
+        land after it and overwrite the new goal.
+        """
+
+        if self.goal_cache:
+            hit, goal = self.goal_cache.get(user_id)
+            if hit:
+                return goal
+        else:
+            return await self._read_goal(user_id)
+
+        async with self.user_locks.hold(user_id):
+            # Filled by a save or another reader while this one waited
+            hit, goal = self.goal_cache.get(user_id)
+            if hit:
+                return goal
+
+            goal = await self._read_goal(user_id)
+            self.goal_cache.set(user_id, goal)
+
+        return goal
+
+    async def _read_goal(self, user_id: str) -> Optional[Dict[str, Any]]:
+        goals = await self.db_client.query("goals", filters={"user_id": user_id}, limit=1)
+        return goals[0] if goals else None
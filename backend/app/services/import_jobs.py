@@ -0,0 +1,122 @@
+"""
+Background import jobs
+
+An upload is accepted and written to a spool file, then imported by a
+background task so the request returns immediately. Clients poll the job
+for the importer's running stats.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Optional
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJob:
+    """State of one background import"""
+
+    def __init__(self, user_id: str, source_id: str):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.source_id = source_id
+        self.status = "running"
+        self.stats: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self.started_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def update(self, stats: Dict[str, Any]) -> None:
+        """Progress callback for FoodHistoryImporter"""
+        self.stats = stats
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "user_id": self.user_id,
+            "status": self.status,
+            "stats": self.stats,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ImportJobRegistry:
+    """
+    Running and recently finished import jobs
+
+    Only the newest ``max_finished`` finished jobs are kept for polling.
+    """
+
+    def __init__(self, max_finished: int = 100):
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+
+    def running(self, source_id: str) -> Optional[ImportJob]:
+        """The running job importing ``source_id``, if any"""
+        return next(
+            (
+                job
+                for job in self.jobs.values()
+                if job.source_id == source_id and job.status == "running"
+            ),
+            None,
+        )
+
+    def start(
+        self,
+        user_id: str,
+        source_id: str,
+        run: Callable[[ImportJob], Awaitable[Dict[str, Any]]],
+    ) -> ImportJob:
+        """
+        Start ``run(job)`` as a background task
+
+        Args:
+            user_id: Owner of the import
+            source_id: Checkpoint key of the upload
+            run: Coroutine function performing the import; its result
+                becomes the job's final stats
+        """
+        job = ImportJob(user_id, source_id)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(job, run))
+        return job
+
+    async def _run(
+        self, job: ImportJob, run: Callable[[ImportJob], Awaitable[Dict[str, Any]]]
+    ) -> None:
+        try:
+            job.stats = await run(job)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            logger.exception("Import failed", extra={"job_id": job.id, "user_id": job.user_id})
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now()
+            job.task = None
+            self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.status != "running"]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self.jobs.get(job_id)
+
+    async def cancel_all(self) -> None:
+        """Cancel running jobs; their checkpoints let a new upload resume"""
+        tasks = [job.task for job in self.jobs.values() if job.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
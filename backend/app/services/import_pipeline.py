@@ -0,0 +1,382 @@
+"""
+Streaming food-history import pipeline
+
+Reads CSV or JSONL exports row by row in a worker thread, groups rows into
+meals, estimates nutrition in batches (local lookup first, batched LLM
+prompts for the rest) and writes ``food_logs`` and ``daily_rollups`` in
+bulk chunks.
+Progress is checkpointed after every chunk so an interrupted import can
+resume where it stopped.
+"""
+
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+from datetime import datetime
+import asyncio
+import csv
+import hashlib
+import itertools
+import json
+import os
+import time
+import logging
+from pydantic import ValidationError
+from app.models.schemas import FoodItem
+from app.services.calorie_engine import CalorieEngine
+from app.services.rollup_engine import RollupEngine, MACROS
+from app.services.summary_cache import SummaryCache
+from app.tools.db import SupabaseClient
+
+logger = logging.getLogger(__name__)
+
+# Distinct food names listed in the stats of rows that could not be estimated
+MAX_REPORTED_FAILURES = 50
+
+# Accepted column names for each field, in order of preference
+COLUMN_ALIASES = {
+    "name": ["name", "food", "food_name", "item", "description"],
+    "quantity": ["quantity", "amount", "qty", "servings"],
+    "unit": ["unit", "units", "serving_unit"],
+    "timestamp": ["timestamp", "datetime", "time", "date", "logged_at"],
+    "calories": ["calories", "kcal", "energy", "cals"],
+    "protein": ["protein", "protein_g"],
+    "carbs": ["carbs", "carbohydrates", "carbs_g"],
+    "fat": ["fat", "fat_g", "total_fat"],
+}
+
+
+def detect_format(filename: str) -> str:
+    """Guess "csv" or "jsonl" from a file name"""
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def iter_records(lines: Iterable[str], fmt: str) -> Iterator[Dict[str, Any]]:
+    """Lazily decode CSV or JSONL lines into dicts"""
+    if fmt == "csv":
+        yield from csv.DictReader(lines)
+    elif fmt == "jsonl":
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}. Choose from: csv, jsonl")
+
+
+def content_fingerprint(f: BinaryIO, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a binary file's content, read in blocks; rewinds the file"""
+    digest = hashlib.sha256()
+    for block in iter(lambda: f.read(block_size), b""):
+        digest.update(block)
+    f.seek(0)
+    return digest.hexdigest()
+
+
+def _field(record: Dict[str, Any], field: str) -> Any:
+    for column in COLUMN_ALIASES[field]:
+        value = record.get(column)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def normalize_record(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Turn an exported row into {timestamp, item, nutrition}
+
+    Returns None for rows without a usable food name, quantity or timestamp.
+    ``nutrition`` is set only when the export already carries calories.
+    """
+    record = {str(key).strip().lower(): value for key, value in record.items()}
+
+    try:
+        item = FoodItem(
+            name=str(_field(record, "name") or "").strip(),
+            quantity=float(_field(record, "quantity") or 1),
+            unit=str(_field(record, "unit") or "servings").strip(),
+        )
+        timestamp = datetime.fromisoformat(str(_field(record, "timestamp")).strip())
+    except (TypeError, ValueError, ValidationError):
+        return None
+
+    if not item.name or item.quantity <= 0:
+        return None
+
+    nutrition = None
+    calories = _field(record, "calories")
+    if calories is not None:
+        try:
+            nutrition = {"calories": round(float(calories))}
+            for macro in MACROS:
+                nutrition[macro] = float(_field(record, macro) or 0)
+        except ValueError:
+            nutrition = None
+
+    return {"timestamp": timestamp, "item": item.dict(), "nutrition": nutrition}
+
+
+async def parse_in_thread(
+    records: Iterable[Dict[str, Any]], batch_size: int
+) -> AsyncIterator[List[Optional[Dict[str, Any]]]]:
+    """
+    Decode and normalize records in a worker thread, ``batch_size`` at a time
+
+    Reading the upload and parsing CSV/JSON is blocking work, so it stays
+    off the event loop. Yields lists of ``normalize_record`` results (None
+    for unusable rows), in input order.
+    """
+    iterator = iter(records)
+
+    def next_batch() -> List[Optional[Dict[str, Any]]]:
+        return [normalize_record(record) for record in itertools.islice(iterator, batch_size)]
+
+    while True:
+        batch = await asyncio.to_thread(next_batch)
+        if not batch:
+            return
+        yield batch
+
+
+class ImportCheckpoint:
+    """Persisted import position (rows already written)"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.rows_done = 0
+        self.meals_done = 0
+
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.rows_done = data.get("rows_done", 0)
+            self.meals_done = data.get("meals_done", 0)
+
+    def save(self, rows_done: int, meals_done: int) -> None:
+        self.rows_done = rows_done
+        self.meals_done = meals_done
+        if not self.path:
+            return
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "rows_done": rows_done,
+                    "meals_done": meals_done,
+                    "updated_at": datetime.now().isoformat(),
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class FoodHistoryImporter:
+    """Bulk importer for exported food logs"""
+
+    def __init__(
+        self,
+        db_client: SupabaseClient,
+        calorie_engine: CalorieEngine,
+        chunk_size: int = 500,
+        estimate_batch_size: int = 25,
+        checkpoint_path: Optional[str] = None,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        summary_cache: Optional[SummaryCache] = None,
+        parse_batch_size: int = 1000,
+    ):
+        """
+        Initialize importer
+
+        Args:
+            db_client: Database client
+            calorie_engine: Engine used for rows without calories
+            chunk_size: Approximate number of rows written per bulk insert
+            estimate_batch_size: Maximum items per LLM estimation prompt
+            checkpoint_path: JSON file recording progress for resumable imports
+            progress: Called with the running stats after every chunk
+            summary_cache: Summary cache to invalidate for the user after each chunk
+            parse_batch_size: Records parsed per worker-thread hop
+        """
+        self.db_client = db_client
+        self.calorie_engine = calorie_engine
+        self.rollup_engine = RollupEngine(db_client)
+        self.chunk_size = chunk_size
+        self.estimate_batch_size = estimate_batch_size
+        self.checkpoint = ImportCheckpoint(checkpoint_path)
+        self.progress = progress
+        self.summary_cache = summary_cache
+        self.parse_batch_size = parse_batch_size
+
+    async def run(self, user_id: str, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Import records for a user
+
+        Consecutive rows with the same timestamp form one meal (one
+        ``food_logs`` row). Chunks always end on a meal boundary.
+
+        Rows that cannot be parsed are counted as ``skipped``; rows the
+        engine could not estimate are counted as ``failed`` (with their
+        distinct names in ``failed_items``) and are not written.
+
+        Returns:
+            Import stats: rows, meals, skipped and failed rows, rows_per_second, ...
+        """
+
+        stats = {
+            "rows": 0,
+            "meals": 0,
+            "skipped": 0,
+            "failed": 0,
+            "failed_items": [],
+            "resumed_from_row": self.checkpoint.rows_done,
+            "estimated_by_engine": 0,
+            "provided_by_export": 0,
+            "elapsed_seconds": 0.0,
+            "rows_per_second": 0.0,
+        }
+        start = time.perf_counter()
+
+        rows_seen = 0
+        chunk: List[List[Dict[str, Any]]] = []
+        chunk_rows = 0
+        meal: List[Dict[str, Any]] = []
+
+        async for rows in parse_in_thread(records, self.parse_batch_size):
+            for row in rows:
+                rows_seen += 1
+                if rows_seen <= self.checkpoint.rows_done:
+                    continue
+
+                if row is None:
+                    stats["skipped"] += 1
+                    continue
+
+                if meal and row["timestamp"] != meal[0]["timestamp"]:
+                    chunk.append(meal)
+                    chunk_rows += len(meal)
+                    meal = []
+
+                    if chunk_rows >= self.chunk_size:
+                        # Everything before the current row has been seen
+                        await self._flush(user_id, chunk, rows_seen - 1, stats, start)
+                        chunk, chunk_rows = [], 0
+
+                meal.append(row)
+
+        if meal:
+            chunk.append(meal)
+        if chunk or rows_seen > self.checkpoint.rows_done:
+            await self._flush(user_id, chunk, rows_seen, stats, start)
+
+        self.checkpoint.clear()
+        return stats
+
+    async def _flush(
+        self,
+        user_id: str,
+        meals: List[List[Dict[str, Any]]],
+        rows_done: int,
+        stats: Dict[str, Any],
+        start: float,
+    ) -> None:
+        """Estimate, bulk-write and checkpoint one chunk of meals"""
+
+        await self._estimate(meals, stats)
+
+        # Rows without nutrition would be logged but left out of the totals
+        written = []
+        for meal in meals:
+            estimated = [row for row in meal if row["nutrition"]]
+            for row in meal:
+                if not row["nutrition"]:
+                    self._record_failure(row, stats)
+            if estimated:
+                written.append(estimated)
+
+        log_entries = []
+        for meal in written:
+            breakdown = [{**row["item"], **row["nutrition"]} for row in meal]
+            log_entries.append(
+                {
+                    "user_id": user_id,
+                    "timestamp": meal[0]["timestamp"].isoformat(),
+                    "food_items": [row["item"] for row in meal],
+                    "total_calories": round(sum(item["calories"] for item in breakdown)),
+                    "breakdown": breakdown,
+                }
+            )
+
+        # Logs and rollups of the whole chunk are written in one transaction
+        if log_entries:
+            await self.rollup_engine.log_meals(user_id, log_entries)
+        if self.summary_cache:
+            self.summary_cache.invalidate_user(user_id)
+
+        stats["rows"] += sum(len(meal) for meal in written)
+        stats["meals"] += len(written)
+        stats["elapsed_seconds"] = time.perf_counter() - start
+        stats["rows_per_second"] = (
+            stats["rows"] / stats["elapsed_seconds"] if stats["elapsed_seconds"] else 0.0
+        )
+        self.checkpoint.save(rows_done, self.checkpoint.meals_done + len(written))
+
+        logger.info(
+            "Import progress",
+            extra={
+                "rows": stats["rows"],
+                "meals": stats["meals"],
+                "failed": stats["failed"],
+                "rows_per_second": round(stats["rows_per_second"]),
+            },
+        )
+        if self.progress:
+            self.progress(dict(stats))
+
+    @staticmethod
+    def _record_failure(row: Dict[str, Any], stats: Dict[str, Any]) -> None:
+        stats["failed"] += 1
+        name = row["item"]["name"]
+        if len(stats["failed_items"]) < MAX_REPORTED_FAILURES and name not in stats["failed_items"]:
+            stats["failed_items"].append(name)
+
+    async def _estimate(self, meals: List[List[Dict[str, Any]]], stats: Dict[str, Any]) -> None:
+        """Fill in nutrition for rows the export did not provide it for"""
+
+        pending = [row for meal in meals for row in meal if row["nutrition"] is None]
+        stats["provided_by_export"] += sum(len(meal) for meal in meals) - len(pending)
+        if not pending:
+            return
+
+        # Estimate each distinct (name, quantity, unit) once per chunk
+        unique: Dict[tuple, Dict[str, Any]] = {}
+        for row in pending:
+            item = row["item"]
+            unique.setdefault((item["name"].lower(), item["quantity"], item["unit"]), item)
+
+        keys = list(unique)
+        estimates = await self.calorie_engine.estimate_items(
+            [unique[key] for key in keys], batch_size=self.estimate_batch_size
+        )
+        by_key = dict(zip(keys, estimates))
+
+        for row in pending:
+            item = row["item"]
+            estimate = by_key.get((item["name"].lower(), item["quantity"], item["unit"]))
+            if estimate:
+                row["nutrition"] = {
+                    "calories": round(float(estimate.get("calories") or 0)),
+                    **{macro: float(estimate.get(macro) or 0) for macro in MACROS},
+                }
+                stats["estimated_by_engine"] += 1
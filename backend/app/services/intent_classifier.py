@@ -0,0 +1,272 @@
+"""
+Fast-path intent classifier
+
+Answers high-confidence intents locally (keyword/regex rules, then an
+optional hashed bag-of-words logistic regression model) so that only
+ambiguous messages pay for an LLM round-trip in ``route_intent``.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections import Counter
+from datetime import datetime
+import asyncio
+import json
+import logging
+import re
+import threading
+import zlib
+from app.utils.constants import (
+    INTENTS,
+    INTENT_LOG_FOOD,
+    INTENT_SET_GOAL,
+    INTENT_GET_SUMMARY,
+    INTENT_ASK_QUESTION,
+    CONFIDENCE_THRESHOLD_HIGH,
+)
+
+logger = logging.getLogger(__name__)
+
+# (intent, pattern, weight) - a message is answered by the rules only when
+# every matching pattern agrees on a single intent.
+INTENT_RULES = [
+    (INTENT_GET_SUMMARY, r"\b(summary|summarize|recap)\b", 0.95),
+    (INTENT_GET_SUMMARY, r"\b(my|daily|weekly|monthly) (report|stats|statistics)\b", 0.9),
+    (INTENT_GET_SUMMARY, r"\bhow (am i|have i been) doing\b", 0.9),
+    (INTENT_GET_SUMMARY, r"\b(my|show|see) (progress|week|month|day)\b", 0.9),
+    (INTENT_SET_GOAL, r"\b(set|change|update|new) (my )?(goal|target)\b", 0.95),
+    (INTENT_SET_GOAL, r"\bi want to (lose|gain|maintain|bulk|cut)\b", 0.9),
+    (INTENT_SET_GOAL, r"\btarget (of )?\d+\s*(k?cals?|calories)\b", 0.9),
+    (INTENT_LOG_FOOD, r"\bi (just )?(ate|had|eaten|drank|drink|snacked on)\b", 0.9),
+    (INTENT_LOG_FOOD, r"\b(for|at) (breakfast|lunch|dinner|brunch)\b", 0.9),
+    # "log 2 eggs" but not "track my weight" or "add a goal"
+    (INTENT_LOG_FOOD, r"^(log|add|track)\b(?!.*\b(goals?|targets?|weight|progress)\b)", 0.9),
+    (INTENT_ASK_QUESTION, r"^(what|why|how|is|are|should|can|does|do)\b.*\?$", 0.85),
+]
+
+# Messages about things no intent covers (e.g. "add a reminder for lunch")
+# are left to the LLM even when a rule matches
+RULE_VETOES = [r"\b(remind|reminders?|alarms?|notifications?)\b"]
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def _tokenize(message: str) -> List[str]:
+    """Lowercase word tokens plus bigrams"""
+    words = _TOKEN_RE.findall(message.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class IntentModel:
+    """Multinomial logistic regression over hashed bag-of-words features"""
+
+    def __init__(self, weights, bias, labels: List[str], n_features: int):
+        self.weights = weights
+        self.bias = bias
+        self.labels = labels
+        self.n_features = n_features
+
+    @staticmethod
+    def featurize(messages: List[str], n_features: int):
+        """Hash unigram/bigram counts into a dense, L2-normalized matrix"""
+        import numpy as np
+
+        features = np.zeros((len(messages), n_features), dtype=np.float32)
+        for row, message in enumerate(messages):
+            for token in _tokenize(message):
+                features[row, zlib.crc32(token.encode()) % n_features] += 1.0
+
+        norms = np.linalg.norm(features, axis=1, keepdims=True)
+        return features / np.maximum(norms, 1e-6)
+
+    def predict(self, message: str) -> Tuple[str, float]:
+        """Return (intent, probability) for a single message"""
+        import numpy as np
+
+        logits = self.featurize([message], self.n_features) @ self.weights + self.bias
+        logits = logits[0] - logits[0].max()
+        probs = np.exp(logits) / np.exp(logits).sum()
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    @classmethod
+    def train(
+        cls,
+        messages: List[str],
+        intents: List[str],
+        n_features: int = 4096,
+        epochs: int = 200,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+    ) -> "IntentModel":
+        """Fit the model with full-batch gradient descent"""
+        import numpy as np
+
+        labels = sorted(set(intents))
+        index = {label: i for i, label in enumerate(labels)}
+        x = cls.featurize(messages, n_features)
+        y = np.zeros((len(intents), len(labels)), dtype=np.float32)
+        y[np.arange(len(intents)), [index[i] for i in intents]] = 1.0
+
+        weights = np.zeros((n_features, len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+
+        for _ in range(epochs):
+            logits = x @ weights + bias
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            grad = (probs - y) / len(messages)
+            weights -= learning_rate * (x.T @ grad + l2 * weights)
+            bias -= learning_rate * grad.sum(axis=0)
+
+        return cls(weights, bias, labels, n_features)
+
+    def save(self, path: str) -> None:
+        """Save the model to an ``.npz`` file"""
+        import numpy as np
+
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=self.bias,
+            labels=np.array(self.labels),
+            n_features=np.array(self.n_features),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        """Load a model saved with ``save``"""
+        import numpy as np
+
+        data = np.load(path)
+        return cls(
+            data["weights"],
+            data["bias"],
+            [str(label) for label in data["labels"]],
+            int(data["n_features"]),
+        )
+
+
+class FastIntentClassifier:
+    """Local intent classifier that falls back to the LLM when unsure"""
+
+    def __init__(
+        self,
+        model: Optional[IntentModel] = None,
+        threshold: float = CONFIDENCE_THRESHOLD_HIGH,
+        decision_log_path: Optional[str] = None,
+    ):
+        """
+        Initialize classifier
+
+        Args:
+            model: Optional trained IntentModel used after the rules
+            threshold: Minimum model probability to answer without the LLM
+            decision_log_path: JSONL file where LLM routing decisions are
+                appended as training data for the model
+        """
+        self.model = model
+        self.threshold = threshold
+        self.decision_log_path = decision_log_path
+        self._log_lock = threading.Lock()
+        self.rules = [
+            (intent, re.compile(pattern, re.IGNORECASE), weight)
+            for intent, pattern, weight in INTENT_RULES
+        ]
+        self.vetoes = [re.compile(pattern, re.IGNORECASE) for pattern in RULE_VETOES]
+
+        self.total = 0
+        self.rule_hits = 0
+        self.model_hits = 0
+        self.llm_fallbacks = 0
+        self.hits_by_intent: Counter = Counter()
+        self.fallbacks_by_intent: Counter = Counter()
+
+    def _match_rules(self, message: str) -> Optional[Tuple[str, float]]:
+        """Return (intent, confidence) when all matching rules agree"""
+        if any(veto.search(message) for veto in self.vetoes):
+            return None
+
+        matches: Dict[str, float] = {}
+        for intent, pattern, weight in self.rules:
+            if pattern.search(message):
+                matches[intent] = max(weight, matches.get(intent, 0.0))
+
+        if len(matches) != 1:
+            return None
+        return next(iter(matches.items()))
+
+    def classify(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Classify a message locally
+
+        Returns:
+            {"intent": str, "confidence": float, "source": "rules" | "model"}
+            or None when the LLM should decide
+        """
+
+        self.total += 1
+        text = message.strip()
+
+        rule_match = self._match_rules(text)
+        if rule_match:
+            intent, confidence = rule_match
+            self.rule_hits += 1
+            self.hits_by_intent[intent] += 1
+            return {"intent": intent, "confidence": confidence, "source": "rules"}
+
+        if self.model is not None:
+            intent, confidence = self.model.predict(text)
+            if confidence >= self.threshold and intent in INTENTS:
+                self.model_hits += 1
+                self.hits_by_intent[intent] += 1
+                return {"intent": intent, "confidence": confidence, "source": "model"}
+
+        return None
+
+    async def record_fallback(self, message: str, intent: str, confidence: float) -> None:
+        """Count an LLM-routed message and log it as training data"""
+
+        self.llm_fallbacks += 1
+        self.fallbacks_by_intent[intent] += 1
+
+        if not self.decision_log_path:
+            return
+
+        entry = {
+            "message": message,
+            "intent": intent,
+            "confidence": confidence,
+            "timestamp": datetime.now().isoformat(),
+        }
+        # The append runs in a worker thread so a slow disk never blocks the event
+        # loop; a failed write loses the training example, never the routing
+        try:
+            await asyncio.to_thread(self._append_decision, json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.warning(
+                "Could not log routing decision",
+                extra={"path": self.decision_log_path, "error": str(e)},
+            )
+
+    def _append_decision(self, line: str) -> None:
+        with self._log_lock:
+            with open(self.decision_log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics: how many LLM routing calls were avoided"""
+
+        hits = self.rule_hits + self.model_hits
+        return {
+            "total": self.total,
+            "rule_hits": self.rule_hits,
+            "model_hits": self.model_hits,
+            "llm_fallbacks": self.llm_fallbacks,
+            "hit_rate": hits / self.total if self.total else 0.0,
+            "llm_calls_saved": hits,
+            "hits_by_intent": {intent: self.hits_by_intent[intent] for intent in INTENTS},
+            "fallbacks_by_intent": {
+                intent: self.fallbacks_by_intent[intent] for intent in INTENTS
+            },
+        }
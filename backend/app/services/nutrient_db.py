@@ -0,0 +1,148 @@
+"""
+Local nutrient database
+
+A bundled per-100g nutrient table (values approximated from USDA FoodData
+Central SR Legacy) indexed by normalized food name and alias, so common
+foods are estimated without a network call.
+"""
+
+from typing import List, Dict, Any, Optional, NamedTuple
+from functools import lru_cache
+import csv
+import os
+import re
+from app.utils.units import to_grams
+
+DEFAULT_NUTRIENTS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), "data", "nutrients.csv"
+)
+
+# "raw" and "cooked" are kept: dry rice, pasta or oats have about three times
+# the calories per gram of cooked ones, so the state picks the table entry and
+# an unknown "raw ..." goes to the LLM instead of matching the cooked food
+_STOPWORDS = {"a", "an", "the", "of", "some", "plain", "fresh"}
+
+
+class Nutrient(NamedTuple):
+    """Nutrition facts per 100 g"""
+
+    name: str
+    kcal: float
+    protein: float
+    carbs: float
+    fat: float
+    piece_grams: Optional[float]  # Weight of one piece/slice/serving
+    density: Optional[float]  # Grams per milliliter
+
+
+def normalize_food_name(name: str) -> str:
+    """Lowercase, strip punctuation and filler words"""
+    words = re.findall(r"[a-z]+", (name or "").lower())
+    return " ".join(word for word in words if word not in _STOPWORDS)
+
+
+def _singular(name: str) -> str:
+    """Naive singular form of the last word ("blueberries" -> "blueberry")"""
+    if name.endswith("ies"):
+        return name[:-3] + "y"
+    if name.endswith("oes"):
+        return name[:-2]
+    if name.endswith("s") and not name.endswith("ss"):
+        return name[:-1]
+    return name
+
+
+def food_key(name: str) -> str:
+    """Normalized singular name, for matching the same food across spellings"""
+    return _singular(normalize_food_name(name))
+
+
+class NutrientDatabase:
+    """Indexed lookup over the bundled nutrient table"""
+
+    def __init__(self, foods: List[Nutrient], aliases: Optional[Dict[str, str]] = None):
+        self.foods = foods
+        self.index: Dict[str, int] = {}
+
+        for i, food in enumerate(foods):
+            self.index[normalize_food_name(food.name)] = i
+        for alias, name in (aliases or {}).items():
+            key = normalize_food_name(name)
+            if key in self.index:
+                self.index.setdefault(normalize_food_name(alias), self.index[key])
+
+    @classmethod
+    def from_csv(cls, path: str = DEFAULT_NUTRIENTS_PATH) -> "NutrientDatabase":
+        """Load a nutrient table (name, aliases, kcal, protein, carbs, fat, piece_g, density)"""
+
+        def optional_float(value: str) -> Optional[float]:
+            return float(value) if value else None
+
+        foods, aliases = [], {}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                foods.append(
+                    Nutrient(
+                        name=row["name"],
+                        kcal=float(row["kcal"]),
+                        protein=float(row["protein"]),
+                        carbs=float(row["carbs"]),
+                        fat=float(row["fat"]),
+                        piece_grams=optional_float(row["piece_g"]),
+                        density=optional_float(row["density"]),
+                    )
+                )
+                for alias in filter(None, row["aliases"].split("|")):
+                    aliases[alias] = row["name"]
+
+        return cls(foods, aliases)
+
+    def __len__(self) -> int:
+        return len(self.foods)
+
+    def lookup(self, name: str) -> Optional[Nutrient]:
+        """Find a food by name or alias"""
+        key = normalize_food_name(name)
+
+        for candidate in (key, _singular(key)):
+            if candidate in self.index:
+                return self.foods[self.index[candidate]]
+        return None
+
+    def estimate(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Estimate nutrition for {name, quantity, unit}
+
+        Returns:
+            {name, quantity, unit, calories, protein, carbs, fat}, or None when
+            the food is unknown or its unit cannot be converted to grams
+        """
+        food = self.lookup(item.get("name", ""))
+        if food is None:
+            return None
+
+        try:
+            quantity = float(item.get("quantity") or 1)
+        except (TypeError, ValueError):
+            return None
+
+        grams = to_grams(quantity, item.get("unit"), food.density, food.piece_grams)
+        if grams is None:
+            return None
+
+        factor = grams / 100
+        return {
+            "name": item["name"],
+            "quantity": item.get("quantity"),
+            "unit": item.get("unit"),
+            "calories": round(food.kcal * factor),
+            "protein": round(food.protein * factor, 1),
+            "carbs": round(food.carbs * factor, 1),
+            "fat": round(food.fat * factor, 1),
+        }
+
+
+@lru_cache()
+def get_default_nutrient_db() -> NutrientDatabase:
+    """Load the bundled nutrient table once per process"""
+    return NutrientDatabase.from_csv()
@@ -17,17 +17,10 @@ class ReminderEngine:
         self.calendar_client = calendar_client
         self.db_client = db_client
 
-    async def schedule_meal_reminder(
+    def _meal_reminder_entry(
         self, user_id: str, meal_type: str, time: datetime
     ) -> Dict[str, Any]:
-        """
-        Schedule a meal logging reminder
-
-        Args:
-            user_id: User ID
-            meal_type: "breakfast", "lunch", "dinner", "snack"
-            time: When to send the reminder
-        """
+        """Create the calendar event for a meal reminder and build its row"""
 
         title = f"Log your {meal_type}"
         description = f"Don't forget to log your {meal_type} in the Fitness AI Agent!"
@@ -36,8 +29,7 @@ class ReminderEngine:
             title=title, description=description, start_time=time
         )
 
-        # Save reminder to database
-        reminder_entry = {
+        return {
             "user_id": user_id,
             "type": "meal_log",
             "meal_type": meal_type,
@@ -46,10 +38,45 @@ class ReminderEngine:
             "status": "scheduled",
         }
 
+    async def schedule_meal_reminder(
+        self, user_id: str, meal_type: str, time: datetime
+    ) -> Dict[str, Any]:
+        """
+        Schedule a meal logging reminder
+
+        Args:
+            user_id: User ID
+            meal_type: "breakfast", "lunch", "dinner", "snack"
+            time: When to send the reminder
+        """
+
+        reminder_entry = self._meal_reminder_entry(user_id, meal_type, time)
+
+        # Save reminder to database
         await self.db_client.insert("reminders", reminder_entry)
 
         return reminder_entry
 
+    async def schedule_meal_reminders(
+        self, user_id: str, meal_times: Dict[str, datetime]
+    ) -> List[Dict[str, Any]]:
+        """
+        Schedule several meal reminders with a single database write
+
+        Args:
+            user_id: User ID
+            meal_times: Reminder time per meal type, e.g. {"breakfast": ..., "lunch": ...}
+        """
+
+        reminder_entries = [
+            self._meal_reminder_entry(user_id, meal_type, time)
+            for meal_type, time in meal_times.items()
+        ]
+
+        await self.db_client.insert_many("reminders", reminder_entries)
+
+        return reminder_entries
+
     async def schedule_weekly_summary(
         self, user_id: str, day_of_week: int = 0
     ) -> Dict[str, Any]:
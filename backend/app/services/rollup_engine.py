@@ -0,0 +1,52 @@
+"""
+Daily rollup engine
+"""
+
+from typing import List, Dict, Any
+from datetime import date
+from app.tools.db import SupabaseClient
+
+MACROS = ["protein", "carbs", "fat"]
+
+
+class RollupEngine:
+    """Engine for maintaining per-user, per-day nutrition rollups"""
+
+    def __init__(self, db_client: SupabaseClient):
+        self.db_client = db_client
+
+    async def log_meals(self, user_id: str, log_entries: List[Dict[str, Any]]) -> None:
+        """
+        Write food logs and add them to the user's daily rollups
+
+        Runs the ``log_meals`` function (scripts/migrate_db.py), which
+        inserts the logs and upserts the rollups in one statement, so a log
+        is never stored without its rollup and concurrent logs for the same
+        day never lose updates. Days are the UTC date of each timestamp.
+
+        Args:
+            user_id: Owner of the logs
+            log_entries: ``food_logs`` rows (timestamp, food_items,
+                total_calories, breakdown)
+        """
+
+        await self.db_client.rpc(
+            "log_meals",
+            {
+                "p_user_id": user_id,
+                "p_logs": [
+                    {
+                        "timestamp": entry["timestamp"],
+                        "food_items": entry.get("food_items", []),
+                        "total_calories": int(round(entry.get("total_calories") or 0)),
+                        "breakdown": entry.get("breakdown", []),
+                    }
+                    for entry in log_entries
+                ],
+            },
+        )
+
+    async def get_totals(self, user_id: str, start_day: date, end_day: date) -> Dict[str, Any]:
+        """Sum the daily rollups for an inclusive range of UTC days server-side"""
+
+        return await self.db_client.aggregate(user_id, start_day, end_day)
@@ -0,0 +1,100 @@
+"""
+Summary result cache
+"""
+
+from typing import Any, Dict, Hashable, Optional, Set
+from collections import OrderedDict
+from datetime import date
+from app.utils.ttl_cache import TTLCache
+
+
+class SummaryCache:
+    """
+    Cache of computed summaries keyed on (user, period, local day)
+
+    A user's entries are dropped whenever they log food or change their
+    goal through this process. Each invalidation also bumps the user's
+    generation: a summary computed from data read before the change is
+    refused by ``set`` instead of being cached after it. Changes made by
+    other instances are only picked up when entries expire (``ttl_seconds``).
+    The day in the key rolls entries over at midnight.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 5000,
+        ttl_seconds: Optional[float] = 3600,
+        max_tracked_users: int = 10000,
+    ):
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        self._user_keys: Dict[str, Set[Hashable]] = {}
+        self.invalidations = 0
+        self.stale_fills = 0
+
+        # Generation at each user's latest invalidation, oldest first. Users
+        # dropped from the map raise the floor, below which every fill is
+        # treated as stale.
+        self.max_tracked_users = max_tracked_users
+        self._generation = 0
+        self._invalidated_at: "OrderedDict[str, int]" = OrderedDict()
+        self._floor = 0
+
+    def generation(self) -> int:
+        """Token to take before reading the data a summary is computed from"""
+        return self._generation
+
+    def _is_stale(self, user_id: str, generation: int) -> bool:
+        return generation < self._floor or self._invalidated_at.get(user_id, 0) > generation
+
+    def get(self, user_id: str, period: str, day: date) -> Optional[Dict[str, Any]]:
+        """Return a cached summary or None"""
+        summary = self.cache.get((user_id, period, day))
+        return dict(summary) if summary is not None else None
+
+    def set(
+        self,
+        user_id: str,
+        period: str,
+        day: date,
+        summary: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a computed summary
+
+        Args:
+            generation: ``generation()`` taken before the summary's data was
+                read; the summary is dropped if the user was invalidated since
+        """
+        if generation is not None and self._is_stale(user_id, generation):
+            self.stale_fills += 1
+            return
+
+        key = (user_id, period, day)
+        self.cache.set(key, dict(summary))
+
+        # Forget keys the LRU has already evicted while recording the new one
+        keys = {k for k in self._user_keys.get(user_id, ()) if k in self.cache}
+        keys.add(key)
+        self._user_keys[user_id] = keys
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached summary for a user"""
+        self._generation += 1
+        self._invalidated_at[user_id] = self._generation
+        self._invalidated_at.move_to_end(user_id)
+        if len(self._invalidated_at) > self.max_tracked_users:
+            _, generation = self._invalidated_at.popitem(last=False)
+            self._floor = max(self._floor, generation)
+
+        for key in self._user_keys.pop(user_id, ()):
+            if self.cache.delete(key):
+                self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics"""
+        return {
+            **self.cache.stats(),
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+        }
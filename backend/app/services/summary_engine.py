@@ -2,22 +2,68 @@
 Summary generation engine
 """
 
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional
+from datetime import date, datetime, timedelta, timezone
+import asyncio
 from app.tools.db import SupabaseClient
+from app.services.goal_engine import GoalEngine
+from app.services.rollup_engine import RollupEngine
+from app.services.summary_cache import SummaryCache
+
+# Days per summary period, ending today (UTC, the day boundary of the rollups)
+PERIOD_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
 
 
 class SummaryEngine:
     """Engine for generating fitness summaries"""
 
-    def __init__(self, db_client: SupabaseClient):
+    def __init__(
+        self,
+        db_client: SupabaseClient,
+        goal_engine: Optional[GoalEngine] = None,
+        summary_cache: Optional[SummaryCache] = None,
+    ):
         self.db_client = db_client
+        self.rollup_engine = RollupEngine(db_client)
+        self.goal_engine = goal_engine or GoalEngine(db_client)
+        self.summary_cache = summary_cache
+
+    async def get_period_summary(self, user_id: str, period: str = "weekly") -> Dict[str, Any]:
+        """
+        Summary of the period's last N UTC days including today, served from
+        the cache when possible
+
+        Args:
+            user_id: User ID
+            period: "daily", "weekly", or "monthly"
+        """
+
+        today = datetime.now(timezone.utc).date()
+
+        generation = None
+        if self.summary_cache:
+            cached = self.summary_cache.get(user_id, period, today)
+            if cached is not None:
+                return cached
+            # A log or goal change during generation makes this summary stale
+            generation = self.summary_cache.generation()
+
+        start_day = today - timedelta(days=PERIOD_DAYS.get(period, 30) - 1)
+        summary = await self.generate_summary(user_id, start_day, today)
+
+        if self.summary_cache:
+            self.summary_cache.set(user_id, period, today, summary, generation=generation)
+
+        return summary
 
     async def generate_summary(
-        self, user_id: str, start_date: datetime, end_date: datetime
+        self, user_id: str, start_day: date, end_day: date
     ) -> Dict[str, Any]:
         """
-        Generate summary for a date range
+        Generate summary for an inclusive range of UTC days
+
+        Sums the range's ``daily_rollups`` rows in the database, so one row
+        of totals is read whatever the range or the user's history.
 
         Returns:
             {
@@ -29,40 +75,28 @@ class SummaryEngine:
             }
         """
 
-        # Get food logs for the period
-        food_logs = await self.db_client.query(
-            "food_logs", filters={"user_id": user_id}
+        # Read the rollup totals and the (usually cached) goal concurrently
+        totals, goal = await asyncio.gather(
+            self.rollup_engine.get_totals(user_id, start_day, end_day),
+            self.goal_engine.get_goal(user_id),
         )
+        target_calories = (goal.get("target_calories") if goal else None) or 2000
 
-        # Filter by date range
-        filtered_logs = [
-            log
-            for log in food_logs
-            if start_date <= datetime.fromisoformat(log["timestamp"]) <= end_date
-        ]
-
-        if not filtered_logs:
+        if not totals["days_logged"]:
             return {
                 "avg_calories": 0,
                 "total_calories": 0,
                 "days_logged": 0,
                 "goal_adherence": 0,
                 "insights": "No data logged for this period.",
+                "target_calories": target_calories,
             }
 
         # Calculate metrics
-        total_calories = sum(log["total_calories"] for log in filtered_logs)
-        days_logged = len(
-            set(
-                datetime.fromisoformat(log["timestamp"]).date() for log in filtered_logs
-            )
-        )
+        total_calories = totals["total_calories"]
+        days_logged = totals["days_logged"]
         avg_calories = total_calories / days_logged if days_logged > 0 else 0
 
-        # Get user goal
-        goals = await self.db_client.query("goals", filters={"user_id": user_id})
-        target_calories = goals[0]["target_calories"] if goals else 2000
-
         # Calculate goal adherence
         goal_adherence = (
             min(100, (avg_calories / target_calories) * 100)
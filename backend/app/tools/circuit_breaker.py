@@ -0,0 +1,193 @@
+"""
+Circuit breaker with adaptive timeouts
+"""
+
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+from collections import deque
+import asyncio
+import time
+import logging
+from app.utils.latency import LatencyWindow
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the backend while its breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker
+
+    Keeps a rolling window of call outcomes and latencies. Calls time out
+    after a multiple of the recent latency percentile (clamped to
+    [min_timeout, max_timeout]). When the error rate over the window crosses
+    the threshold the breaker opens and calls fail fast; after
+    ``open_seconds`` a single probe call is let through and its outcome
+    closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = 50,
+        error_threshold: float = 0.5,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        timeout_percentile: float = 0.99,
+        timeout_multiplier: float = 2.0,
+        min_timeout: float = 2.0,
+        max_timeout: float = 120.0,
+        default_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize breaker
+
+        Args:
+            name: Backend name (shown in health output)
+            window_size: Number of recent calls the error rate is computed over
+            error_threshold: Error rate that opens the breaker
+            min_calls: Calls needed in the window before the breaker can open
+            open_seconds: How long the breaker stays open before a probe
+            timeout_percentile: Latency percentile the adaptive timeout is based on
+            timeout_multiplier: Headroom applied to that percentile
+            min_timeout: Lower bound for the adaptive timeout (seconds)
+            max_timeout: Upper bound for the adaptive timeout (seconds)
+            default_timeout: Timeout until min_calls latencies are known (seconds)
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.error_threshold = error_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.timeout_percentile = timeout_percentile
+        self.timeout_multiplier = timeout_multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.default_timeout = default_timeout
+        self.clock = clock
+
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)
+        self.latency = LatencyWindow(window_size)
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+        self.trips = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def timeout(self) -> float:
+        """Current adaptive timeout in seconds"""
+        if len(self.latency) < self.min_calls:
+            return self.default_timeout
+        observed = self.latency.percentile(self.timeout_percentile) * self.timeout_multiplier
+        return min(self.max_timeout, max(self.min_timeout, observed))
+
+    @property
+    def current_state(self) -> str:
+        """State as seen by the next call (an expired open state is half-open)"""
+        if self.state == OPEN and self.clock() - self.opened_at >= self.open_seconds:
+            return HALF_OPEN
+        return self.state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may go through now"""
+        if self.state == CLOSED:
+            return
+
+        self.state = self.current_state
+
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(f"{self.name} circuit is open")
+
+    def record(self, success: bool, seconds: Optional[float] = None) -> None:
+        """Record the outcome of a call that ``before_call`` let through"""
+        self.outcomes.append(success)
+        if success and seconds is not None:
+            self.latency.record(seconds)
+
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+            if success:
+                self.state = CLOSED
+                self.outcomes.clear()
+            else:
+                self._open()
+        elif (
+            self.state == CLOSED
+            and len(self.outcomes) >= self.min_calls
+            and self.error_rate >= self.error_threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Give up a call without an outcome (e.g. the caller was cancelled)"""
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.trips += 1
+        logger.warning(
+            "Circuit breaker opened",
+            extra={"breaker": self.name, "error_rate": round(self.error_rate, 3)},
+        )
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` under the breaker with the adaptive timeout"""
+        self.before_call()
+        start = self.clock()
+
+        try:
+            result = await asyncio.wait_for(fn(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.record(False)
+            raise
+        except asyncio.CancelledError:
+            # Cancelled by the caller (e.g. a lost hedge) - not the backend's fault
+            self.release()
+            raise
+        except Exception:
+            self.record(False)
+            raise
+
+        self.record(True, self.clock() - start)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Breaker state for health checks and stats"""
+        return {
+            "name": self.name,
+            # Reported as half-open once the cool-off is over, so a drained
+            # instance is put back into rotation and can send its probe
+            "state": self.current_state,
+            "error_rate": round(self.error_rate, 3),
+            "calls_in_window": len(self.outcomes),
+            "timeout_s": round(self.timeout, 3),
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            **self.latency.summary(),
+        }
@@ -1,21 +1,260 @@
 """
 Supabase database client
+
+Talks to Supabase's PostgREST API over a pooled ``httpx.AsyncClient`` so that
+database round-trips never block the event loop.
 """
 
-from typing import List, Dict, Any, Optional
-from supabase import create_client, Client
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
+from datetime import date, datetime
+import httpx
+from app.utils.tracing import DB_SECONDS, span
+
+FILTER_OPERATORS = {"eq", "neq", "gt", "gte", "lt", "lte", "in"}
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert filter operands into JSON/PostgREST friendly values"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _quote_in_value(value: Any) -> str:
+    """Quote a value for a PostgREST ``in.(...)`` list"""
+    text = str(value)
+    if any(c in text for c in ',()"'):
+        return '"' + text.replace('"', '\\"') + '"'
+    return text
 
 
 class SupabaseClient:
     """Wrapper for Supabase database operations"""
 
-    def __init__(self, url: str, key: str):
-        self.client: Client = create_client(url, key)
+    def __init__(
+        self,
+        url: str,
+        key: str,
+        pool_size: int = 20,
+        keepalive: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 10.0,
+        batch_size: int = 500,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize database client
+
+        Args:
+            url: Supabase project URL
+            key: Supabase API key
+            pool_size: Maximum number of concurrent connections
+            keepalive: Maximum number of idle keep-alive connections
+            keepalive_expiry: Seconds an idle connection is kept open
+            timeout: Default per-call timeout in seconds
+            batch_size: Default rows per request for insert_many/upsert
+            transport: Optional httpx transport (used by benchmarks)
+        """
+        self.rest_url = f"{url.rstrip('/')}/rest/v1"
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.client = httpx.AsyncClient(
+            headers={
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=keepalive,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=timeout,
+            transport=transport,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        table: str,
+        params: Optional[List[Tuple[str, str]]] = None,
+        json: Any = None,
+        prefer: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Send a PostgREST request and return the decoded rows"""
+        headers = {"Prefer": prefer} if prefer else None
+
+        with span(DB_SECONDS, "db request", method=method, table=table):
+            response = await self.client.request(
+                method,
+                f"{self.rest_url}/{table}",
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+            response.raise_for_status()
+
+        if not response.content:
+            return []
+        return response.json()
+
+    @staticmethod
+    def _normalize_filters(
+        filters: Optional[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Normalize filters into ``{column: {operator: value}}``
+
+        A filter value may be a scalar (equality), a list/tuple/set
+        (membership) or a dict of operators, e.g.
+        ``{"timestamp": {"gte": start, "lte": end}}``.
+        """
+        normalized = {}
 
-    async def insert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        for column, value in (filters or {}).items():
+            if isinstance(value, dict):
+                spec = dict(value)
+            elif isinstance(value, (list, tuple, set)):
+                spec = {"in": list(value)}
+            else:
+                spec = {"eq": value}
+
+            for op, operand in spec.items():
+                if op not in FILTER_OPERATORS:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+                if isinstance(operand, (list, tuple, set)):
+                    spec[op] = [_to_json_value(v) for v in operand]
+                else:
+                    spec[op] = _to_json_value(operand)
+
+            normalized[column] = spec
+
+        return normalized
+
+    @classmethod
+    def _filter_params(cls, filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Translate filters into PostgREST query parameters"""
+        params = []
+
+        for column, spec in cls._normalize_filters(filters).items():
+            for op, operand in spec.items():
+                if op == "in":
+                    values = ",".join(_quote_in_value(v) for v in operand)
+                    params.append((column, f"in.({values})"))
+                else:
+                    params.append((column, f"{op}.{operand}"))
+
+        return params
+
+    async def insert(
+        self, table: str, data: Dict[str, Any], timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
         """Insert a record"""
-        response = self.client.table(table).insert(data).execute()
-        return response.data[0] if response.data else {}
+        rows = await self._request(
+            "POST", table, json=data, prefer="return=representation", timeout=timeout
+        )
+        return rows[0] if rows else {}
+
+    async def _write_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        resolution: Optional[str],
+        params: Optional[List[Tuple[str, str]]],
+        batch_size: Optional[int],
+        timeout: Optional[float],
+    ) -> List[Dict[str, Any]]:
+        """POST rows in chunks of ``batch_size`` and collect every returned row"""
+        if not rows:
+            return []
+
+        # PostgREST needs one key set per request; missing keys take column defaults
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        params = list(params or []) + [("columns", ",".join(columns))]
+        prefer = "return=representation,missing=default"
+        if resolution:
+            prefer = f"resolution={resolution},{prefer}"
+
+        size = max(1, batch_size or self.batch_size)
+        affected: List[Dict[str, Any]] = []
+
+        # Chunks go out one after another so a large write never hogs the pool
+        for start in range(0, len(rows), size):
+            affected.extend(
+                await self._request(
+                    "POST",
+                    table,
+                    params=params,
+                    json=rows[start:start + size],
+                    prefer=prefer,
+                    timeout=timeout,
+                )
+            )
+
+        return affected
+
+    async def insert_many(
+        self,
+        table: str,
+        rows: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert several records, one round-trip per chunk
+
+        Args:
+            table: Table name
+            rows: Records to insert
+            batch_size: Rows per request (defaults to the client's batch_size)
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            All inserted rows, in input order
+        """
+        return await self._write_many(
+            table, rows, None, None, batch_size, timeout
+        )
+
+    async def upsert(
+        self,
+        table: str,
+        rows: Union[Dict[str, Any], List[Dict[str, Any]]],
+        on_conflict: Optional[Union[str, Sequence[str]]] = None,
+        ignore_duplicates: bool = False,
+        batch_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert records, updating (or skipping) rows that hit a unique constraint
+
+        Args:
+            table: Table name
+            rows: A record or a list of records
+            on_conflict: Column(s) of the unique constraint to resolve on
+                (defaults to the primary key)
+            ignore_duplicates: Keep existing rows instead of merging into them
+            batch_size: Rows per request (defaults to the client's batch_size)
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            All inserted or updated rows (skipped duplicates are not returned)
+        """
+        if isinstance(rows, dict):
+            rows = [rows]
+
+        params = []
+        if on_conflict:
+            if not isinstance(on_conflict, str):
+                on_conflict = ",".join(on_conflict)
+            params.append(("on_conflict", on_conflict))
+
+        resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        return await self._write_many(
+            table, rows, resolution, params, batch_size, timeout
+        )
 
     async def query(
         self,
@@ -23,53 +262,117 @@ class SupabaseClient:
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[str] = None,
         limit: Optional[int] = None,
+        timeout: Optional[float] = None,
+        columns: str = "*",
+        descending: bool = False,
+        offset: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
-        """Query records with filters"""
-        query = self.client.table(table).select("*")
+        """
+        Query records with filters
 
-        if filters:
-            for key, value in filters.items():
-                query = query.eq(key, value)
+        Args:
+            table: Table name
+            filters: Equality, membership or range filters (see _normalize_filters)
+            order_by: Column to order by
+            limit: Maximum number of rows
+            timeout: Per-call timeout in seconds
+            columns: Comma-separated column projection
+            descending: Order descending instead of ascending
+            offset: Number of rows to skip
+        """
+        params = [("select", columns), *self._filter_params(filters)]
 
         if order_by:
-            query = query.order(order_by)
+            params.append(("order", f"{order_by}.{'desc' if descending else 'asc'}"))
 
         if limit:
-            query = query.limit(limit)
+            params.append(("limit", str(limit)))
+
+        if offset:
+            params.append(("offset", str(offset)))
 
-        response = query.execute()
-        return response.data
+        return await self._request("GET", table, params=params, timeout=timeout)
 
     async def update(
-        self, table: str, data: Dict[str, Any], filters: Dict[str, Any]
+        self,
+        table: str,
+        data: Dict[str, Any],
+        filters: Dict[str, Any],
+        timeout: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Update records"""
-        query = self.client.table(table).update(data)
-
-        for key, value in filters.items():
-            query = query.eq(key, value)
-
-        response = query.execute()
-        return response.data[0] if response.data else {}
+        rows = await self._request(
+            "PATCH",
+            table,
+            params=self._filter_params(filters),
+            json=data,
+            prefer="return=representation",
+            timeout=timeout,
+        )
+        return rows[0] if rows else {}
 
-    async def delete(self, table: str, filters: Dict[str, Any]) -> bool:
+    async def delete(
+        self, table: str, filters: Dict[str, Any], timeout: Optional[float] = None
+    ) -> bool:
         """Delete records"""
-        query = self.client.table(table).delete()
+        rows = await self._request(
+            "DELETE",
+            table,
+            params=self._filter_params(filters),
+            prefer="return=representation",
+            timeout=timeout,
+        )
+        return len(rows) > 0
 
-        for key, value in filters.items():
-            query = query.eq(key, value)
-
-        response = query.execute()
-        return len(response.data) > 0
+    async def rpc(
+        self,
+        function: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Call a Postgres function exposed through PostgREST"""
+        return await self._request(
+            "POST", f"rpc/{function}", json=params or {}, timeout=timeout
+        )
 
     async def aggregate(
         self,
-        table: str,
-        filters: Optional[Dict[str, Any]] = None,
-        group_by: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        """Aggregate data (for summaries)"""
-        # Supabase aggregation would use RPC or views
-        # This is a simplified version
-        records = await self.query(table, filters)
-        return records
+        user_id: str,
+        start_day: date,
+        end_day: date,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sum a user's daily rollups over a day range server-side (for summaries)
+
+        Runs the ``summarize_rollups`` function (see scripts/migrate_db.py),
+        so one row of totals crosses the network whatever the range.
+
+        Args:
+            user_id: User whose rollups are summed
+            start_day: First UTC day of the range
+            end_day: Last UTC day of the range (inclusive)
+            timeout: Per-call timeout in seconds
+
+        Returns:
+            {"total_calories": int, "meal_count": int, "days_logged": int,
+             "protein": float, "carbs": float, "fat": float}; days_logged
+            counts the days with at least one meal
+        """
+        rows = await self.rpc(
+            "summarize_rollups",
+            {"p_user_id": user_id, "p_start": start_day.isoformat(), "p_end": end_day.isoformat()},
+            timeout=timeout,
+        )
+        result = rows[0] if rows else {}
+
+        return {
+            "total_calories": int(result.get("total_calories") or 0),
+            "meal_count": int(result.get("meal_count") or 0),
+            "days_logged": int(result.get("days_logged") or 0),
+            **{macro: float(result.get(macro) or 0) for macro in ("protein", "carbs", "fat")},
+        }
+
+    async def close(self):
+        """Close the pooled HTTP connections"""
+        await self.client.aclose()
@@ -0,0 +1,106 @@
+"""
+Savings accounting for JSON generations that are cut off early
+"""
+
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+import random
+
+# Rough token size used where the provider reports no usage
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> float:
+    """Approximate token count of ``text``"""
+    return len(text) / CHARS_PER_TOKEN
+
+
+class EarlyStopMonitor:
+    """
+    Track what stopping a stream after its JSON value saves
+
+    A stopped call cannot know how much the model would still have produced,
+    so a small sample of calls is allowed to run to completion; the text and
+    time they spent after the JSON value calibrate the per-call estimates for
+    the calls that were stopped.
+    """
+
+    def __init__(self, sample_rate: float = 0.05, history: int = 100, window: int = 50):
+        self.sample_rate = sample_rate
+        self.window = window
+        self.calls = 0
+        self.stopped = 0
+        self.calibration_calls = 0
+        self.tokens_saved = 0.0
+        self.ms_saved = 0.0
+        self._tail_chars = 0.0
+        self._tail_ms = 0.0
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+    def should_sample(self) -> bool:
+        """True if this call should run to completion to calibrate the estimate"""
+        return self.calibration_calls == 0 or random.random() < self.sample_rate
+
+    def record_stopped(self, elapsed: float) -> Dict[str, Any]:
+        """Record a stream cancelled once its JSON value was complete"""
+        self.calls += 1
+        self.stopped += 1
+
+        tokens_saved = ms_saved = None
+        if self.calibration_calls:
+            tokens_saved = round(self._tail_chars / CHARS_PER_TOKEN, 1)
+            ms_saved = round(self._tail_ms, 1)
+            self.tokens_saved += tokens_saved
+            self.ms_saved += ms_saved
+
+        entry = {
+            "stopped": True,
+            "ms": round(elapsed * 1000, 1),
+            "tokens_saved": tokens_saved,
+            "ms_saved": ms_saved,
+        }
+        self.recent.append(entry)
+        return entry
+
+    def record_completed(
+        self, elapsed: float, tail_chars: int, tail_seconds: Optional[float]
+    ) -> Dict[str, Any]:
+        """
+        Record a stream that ran to completion
+
+        Args:
+            elapsed: Total stream time in seconds
+            tail_chars: Characters generated after the JSON value
+            tail_seconds: Time spent after the JSON value (None if the
+                response never contained a complete value)
+        """
+        self.calls += 1
+
+        if tail_seconds is not None:
+            # Moving averages of what a stopped call avoids
+            self.calibration_calls += 1
+            n = min(self.calibration_calls, self.window)
+            self._tail_chars += (tail_chars - self._tail_chars) / n
+            self._tail_ms += (tail_seconds * 1000 - self._tail_ms) / n
+
+        entry = {
+            "stopped": False,
+            "ms": round(elapsed * 1000, 1),
+            "tail_tokens": round(tail_chars / CHARS_PER_TOKEN, 1),
+            "tail_ms": round(tail_seconds * 1000, 1) if tail_seconds is not None else None,
+        }
+        self.recent.append(entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals, the calibrated per-call estimate and the most recent calls"""
+        return {
+            "calls": self.calls,
+            "stopped": self.stopped,
+            "calibration_calls": self.calibration_calls,
+            "tokens_saved": round(self.tokens_saved),
+            "ms_saved": round(self.ms_saved, 1),
+            "avg_tail_tokens": round(self._tail_chars / CHARS_PER_TOKEN, 1),
+            "avg_tail_ms": round(self._tail_ms, 1),
+            "recent": list(self.recent),
+        }
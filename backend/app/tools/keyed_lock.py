@@ -0,0 +1,52 @@
+"""
+Per-key async lock registry
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Hashable
+import asyncio
+
+
+class KeyedLock:
+    """
+    Serialize coroutines that share a key
+
+    Work for the same key (e.g. one user) runs one at a time, in arrival
+    order; different keys never wait on each other. A key's lock is dropped
+    as soon as nobody holds or waits for it, so the registry stays as small
+    as the number of keys currently in use.
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._users: Dict[Hashable, int] = {}
+        self.acquired = 0
+        self.contended = 0
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable) -> AsyncIterator[None]:
+        """Hold the lock for ``key`` for the duration of the ``async with`` block"""
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        elif lock.locked():
+            self.contended += 1
+        self._users[key] = self._users.get(key, 0) + 1
+
+        try:
+            async with lock:
+                self.acquired += 1
+                yield
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._locks[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Lock counters"""
+        return {
+            "acquired": self.acquired,
+            "contended": self.contended,
+            "active_keys": len(self._locks),
+        }
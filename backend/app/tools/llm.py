@@ -1,12 +1,69 @@
 """
 LLM client for Gemini, OpenAI, Groq, and Ollama
+
+Provider SDKs are imported when a client for that provider is created, so
+only the configured provider's SDK is loaded (each takes hundreds of
+milliseconds to import).
 """
 
-from typing import Optional, Dict, Any
-import google.generativeai as genai
-from openai import AsyncOpenAI
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Dict,
+    Any,
+    AsyncIterator,
+    Callable,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from contextlib import aclosing, contextmanager
+from contextvars import ContextVar
+import asyncio
 import httpx
 import json
+import logging
+import time
+from pydantic import BaseModel, ValidationError
+from app.tools.circuit_breaker import CircuitBreaker
+from app.tools.early_stop import EarlyStopMonitor, estimate_tokens
+from app.tools.mock_llm import MockLLMBackend
+from app.tools.llm_cache import ResponseCache, make_cache_key
+from app.tools.llm_replay import LLMRecorder, ReplayLLMBackend
+from app.tools.provider_chain import ProviderChain
+from app.tools.singleflight import SingleFlight
+from app.utils.json_stream import JsonValueScanner
+from app.utils.tracing import LLM_PROVIDER_SECONDS, LLM_SECONDS, LLM_TOKENS, span
+
+if TYPE_CHECKING:
+    import google.generativeai as genai
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+# Receives user-facing tokens while a streaming chat request is in progress
+_token_sink: ContextVar[Optional[Callable[[str], None]]] = ContextVar(
+    "llm_token_sink", default=None
+)
+
+
+@contextmanager
+def stream_tokens_to(callback: Callable[[str], None]):
+    """Relay tokens of ``generate(..., stream_tokens=True)`` calls to ``callback``"""
+    token = _token_sink.set(callback)
+    try:
+        yield
+    finally:
+        _token_sink.reset(token)
+
+
+async def _next_chunk(chunks: AsyncIterator[str], deadline: Optional[float]) -> str:
+    """Next chunk of a provider stream, raising asyncio.TimeoutError past ``deadline``"""
+    if deadline is None:
+        return await chunks.__anext__()
+    return await asyncio.wait_for(chunks.__anext__(), max(0.0, deadline - time.monotonic()))
 
 
 class LLMClient:
@@ -18,101 +75,712 @@ class LLMClient:
         api_key: str = None,
         model: str = None,
         base_url: str = None,
+        cache: Optional[ResponseCache] = None,
+        coalesce: bool = True,
+        fallbacks: Optional[List["LLMClient"]] = None,
+        hedge: bool = True,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        hedge_default_delay: float = 2.0,
+        breaker: Optional[CircuitBreaker] = None,
+        timeout: float = 300.0,
+        native_json: bool = True,
+        early_stop: Optional[EarlyStopMonitor] = None,
+        mock_backend: Optional[MockLLMBackend] = None,
+        replay_backend: Optional[ReplayLLMBackend] = None,
+        recorder: Optional[LLMRecorder] = None,
     ):
         """
         Initialize LLM client
 
         Args:
-            provider: "gemini", "openai", "groq", or "ollama"
+            provider: "gemini", "openai", "groq", "ollama", or "mock" / "replay" (offline)
             api_key: API key (not needed for Ollama)
             model: Model name
             base_url: Base URL for Ollama (default: http://localhost:11434)
+            cache: Optional response cache (see tools/llm_cache.py)
+            coalesce: Share one provider call between concurrent identical requests
+            fallbacks: Clients for providers tried after this one (provider chain)
+            hedge: Start the next provider when the current one exceeds its
+                hedge_percentile latency (see tools/provider_chain.py)
+            hedge_percentile: Latency percentile used as the hedge delay
+            hedge_min_delay: Lower bound for the hedge delay in seconds
+            hedge_default_delay: Hedge delay before enough latency samples exist
+            breaker: Optional circuit breaker; also applies its adaptive timeout
+            timeout: Hard upper bound for a provider request in seconds
+            native_json: Use the provider's JSON mode for structured output
+            early_stop: Stream JSON calls and cancel them once the JSON value is
+                complete, recording the savings in this monitor
+            mock_backend: Canned responses and latency for the "mock" provider
+            replay_backend: Recorded responses for the "replay" provider
+            recorder: Write every provider call to this traffic log
         """
         self.provider = provider.lower()
         self.model = model
         self.base_url = base_url
+        self.cache = cache
+        self.singleflight = SingleFlight() if coalesce else None
+        self.fallbacks = fallbacks or []
+        self.breaker = breaker
+        self.native_json = native_json
+        self.early_stop = early_stop
+        self.recorder = recorder
+        self.structured_stats = {
+            "calls": 0,
+            "validation_failures": 0,
+            "retries": 0,
+            "prompt_chars_saved": 0,
+        }
 
         if self.provider == "gemini":
             if not api_key:
                 raise ValueError("API key required for Gemini")
+            import google.generativeai as genai
+
             genai.configure(api_key=api_key)
             self.client = genai.GenerativeModel(model or "gemini-pro")
 
         elif self.provider == "openai":
             if not api_key:
                 raise ValueError("API key required for OpenAI")
-            self.client = AsyncOpenAI(api_key=api_key)
+            from openai import AsyncOpenAI
+
+            self.client = AsyncOpenAI(api_key=api_key, timeout=timeout)
             self.model = model or "gpt-3.5-turbo"
 
         elif self.provider == "groq":
             if not api_key:
                 raise ValueError("API key required for Groq")
             # Groq uses OpenAI-compatible API
-            self.client = AsyncOpenAI(api_key=api_key, base_url="https://api.groq.com/openai/v1")
+            from openai import AsyncOpenAI
+
+            self.client = AsyncOpenAI(
+                api_key=api_key, base_url="https://api.groq.com/openai/v1", timeout=timeout
+            )
             self.model = model or "llama-3.1-70b-versatile"
 
         elif self.provider == "ollama":
             # Ollama runs locally, no API key needed
             self.base_url = base_url or "http://localhost:11434"
             self.model = model or "llama3.2"
-            # Increase timeout for Ollama (can be slow on first run)
-            self.client = httpx.AsyncClient(timeout=300.0)
+            # Generous hard timeout (Ollama can be slow on first run); the
+            # breaker's adaptive timeout is normally much tighter
+            self.client = httpx.AsyncClient(timeout=timeout)
+
+        elif self.provider == "mock":
+            # Offline stand-in for load tests and benchmarks (see tools/mock_llm.py)
+            self.client = mock_backend or MockLLMBackend()
+            self.model = model or "mock"
+
+        elif self.provider == "replay":
+            # Recorded traffic (see tools/llm_replay.py)
+            if replay_backend is None:
+                raise ValueError("Replay backend required for the replay provider")
+            self.client = replay_backend
+            self.model = model or "replay"
 
         else:
             raise ValueError(
-                f"Unsupported provider: {provider}. Choose from: gemini, openai, groq, ollama"
+                f"Unsupported provider: {provider}. "
+                "Choose from: gemini, openai, groq, ollama, mock, replay"
+            )
+
+        self.chain = (
+            ProviderChain(
+                [self, *self.fallbacks],
+                hedge=hedge,
+                hedge_percentile=hedge_percentile,
+                hedge_min_delay=hedge_min_delay,
+                hedge_default_delay=hedge_default_delay,
             )
+            if self.fallbacks
+            else None
+        )
 
     async def generate(
-        self, prompt: str, temperature: float = 0.7, max_tokens: Optional[int] = None
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        stream_tokens: bool = False,
+        json_schema: Optional[Dict[str, Any]] = None,
+        stop_at_json: bool = False,
+        refresh_cache: bool = False,
+        validate: Optional[Callable[[str], Any]] = None,
     ) -> str:
-        """Generate text from prompt"""
+        """
+        Generate text from prompt
 
-        if self.provider == "gemini":
-            response = await self.client.generate_content_async(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                ),
-            )
-            return response.text
+        Args:
+            prompt: Prompt text
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            use_cache: Set to False to bypass the response cache for this call
+            stream_tokens: Relay tokens to the active ``stream_tokens_to`` callback
+                as they arrive (for user-facing text)
+            json_schema: Use the provider's native JSON mode, constrained to this
+                schema where supported ({} = any JSON object)
+            stop_at_json: The caller only needs the first JSON value; with early
+                stop enabled the response is streamed and cut off after it
+            refresh_cache: Skip the cached response but cache the new one
+                (replaces a cached response the caller rejected)
+            validate: Only cache the response if this does not raise ValueError
+        """
+
+        sink = _token_sink.get() if stream_tokens else None
+        # JSON-mode calls get their own cache entries; plain keys are unchanged
+        extra = {"json_schema": json_schema} if json_schema is not None else {}
+        key = make_cache_key(self.provider, self.model, prompt, temperature, max_tokens, **extra)
+
+        with span(
+            LLM_SECONDS,
+            "llm generate",
+            provider=self.provider,
+            model=self.model or "",
+            source="provider",
+        ) as attributes:
+            if self.cache is not None:
+                if use_cache and not refresh_cache:
+                    cached = await self.cache.get(key)
+                    if cached is not None:
+                        attributes["source"] = "cache"
+                        if sink is not None:
+                            sink(cached)
+                        return cached
+                else:
+                    self.cache.record_bypass()
+
+            if stop_at_json and self.early_stop is not None:
+                complete = self._complete_json
+            else:
+                complete = self._complete
 
+            if sink is not None:
+                response = await self._stream_to_sink(sink, prompt, temperature, max_tokens)
+            elif self.singleflight is not None:
+                # Identical concurrent requests await one shared provider call
+                response = await self.singleflight.do(
+                    key, lambda: complete(prompt, temperature, max_tokens, json_schema)
+                )
+            else:
+                response = await complete(prompt, temperature, max_tokens, json_schema)
+
+            if self.cache is not None and use_cache and self._cacheable(response, validate):
+                await self.cache.set(key, response)
+            return response
+
+    @staticmethod
+    def _cacheable(response: str, validate: Optional[Callable[[str], Any]]) -> bool:
+        if validate is None:
+            return True
+        try:
+            validate(response)
+        except ValueError:
+            return False  # The caller rejects it and retries; never serve it again
+        return True
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream generated text chunks from the provider as they arrive"""
+
+        if self.provider == "gemini":
+            chunks = self._stream_gemini(prompt, temperature, max_tokens, json_schema)
         elif self.provider in ["openai", "groq"]:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            return response.choices[0].message.content
+            chunks = self._stream_openai(prompt, temperature, max_tokens, json_schema)
+        elif self.provider == "mock":
+            chunks = self.client.stream(prompt)
+        elif self.provider == "replay":
+            chunks = self.client.stream(prompt, temperature, max_tokens, json_schema)
+        else:
+            chunks = self._stream_ollama(prompt, temperature, max_tokens, json_schema)
+
+        # Streams fail fast while the breaker is open, report their outcome and
+        # must finish within the adaptive timeout; a provider that goes silent
+        # before the first chunk or mid-stream is cut off at that deadline
+        deadline = None
+        if self.breaker is not None:
+            self.breaker.before_call()
+            deadline = time.monotonic() + self.breaker.timeout
+        call = (prompt, temperature, max_tokens, json_schema)
+        start = time.monotonic()
+        first_chunk = None
+        generated = []
+        try:
+            with span(
+                LLM_PROVIDER_SECONDS,
+                "llm stream",
+                provider=self.provider,
+                model=self.model or "",
+                mode="stream",
+            ):
+                async with aclosing(chunks):
+                    while True:
+                        try:
+                            chunk = await _next_chunk(chunks, deadline)
+                        except StopAsyncIteration:
+                            break
+                        if chunk:
+                            if first_chunk is None:
+                                first_chunk = time.monotonic() - start
+                            generated.append(chunk)
+                            yield chunk
+        except GeneratorExit:
+            # The consumer stopped early (e.g. a complete JSON value); what it
+            # received is the response it would get again on replay
+            elapsed = time.monotonic() - start
+            self._record_call(call, "".join(generated), elapsed, "stream", first_chunk)
+            if self.breaker is not None:
+                if first_chunk is not None:
+                    # The provider answered; stopping early is not its failure
+                    self.breaker.record(True, elapsed)
+                else:
+                    self.breaker.release()
+            raise
+        except asyncio.CancelledError:
+            if self.breaker is not None:
+                self.breaker.release()
+            raise
+        except asyncio.TimeoutError:
+            if self.breaker is not None:
+                self.breaker.timeouts += 1
+                self.breaker.record(False)
+            raise
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record(False)
+            raise
+        finally:
+            # Streams report no usage; estimate what was generated before closing
+            self._record_tokens(prompt, "".join(generated))
+
+        elapsed = time.monotonic() - start
+        self._record_call(call, "".join(generated), elapsed, "stream", first_chunk)
+        if self.breaker is not None:
+            self.breaker.record(True, elapsed)
+
+    async def _stream_to_sink(
+        self,
+        sink: Callable[[str], None],
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> str:
+        """
+        Stream from this provider into ``sink``
+
+        Streams are not hedged; if the provider fails before the first token
+        the provider chain answers instead and its text is sent in one chunk.
+        """
+        chunks = []
+        try:
+            async for chunk in self.stream(prompt, temperature, max_tokens):
+                sink(chunk)
+                chunks.append(chunk)
+        except Exception:
+            if chunks or self.chain is None:
+                raise
+            response = await self.chain.call(prompt, temperature, max_tokens, start=1)
+            sink(response)
+            return response
 
+        return "".join(chunks)
+
+    async def _stream_json(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a JSON response, cancelling the request once the value is complete
+
+        Yields text up to the end of the first complete JSON value; closing the
+        provider stream there means the rest is never generated. Calls sampled
+        by the early-stop monitor (and all calls without one) run to the end,
+        with the extra text dropped. Streams are not hedged; if this provider
+        fails before the first chunk the rest of the provider chain answers
+        instead, in one chunk.
+        """
+        monitor = self.early_stop
+        stop = monitor is not None and not monitor.should_sample()
+        scanner = JsonValueScanner()
+        start = time.monotonic()
+        done_at = None
+        tail_chars = 0
+
+        chunks = self.stream(prompt, temperature, max_tokens, json_schema=json_schema)
+        try:
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    if done_at is not None:
+                        tail_chars += len(chunk)
+                        continue
+                    if not scanner.feed(chunk):
+                        yield chunk
+                        continue
+                    done_at = time.monotonic()
+                    tail_chars = len(scanner.text) - scanner.end
+                    yield chunk[: len(chunk) - tail_chars]
+                    if stop:
+                        break
+        except Exception:
+            if done_at is not None:
+                pass  # Only the discarded tail of a sampled call was lost
+            elif scanner.text or self.chain is None:
+                raise
+            else:
+                yield await self.chain.call(
+                    prompt, temperature, max_tokens, start=1, json_schema=json_schema
+                )
+                return
+
+        if monitor is None:
+            return
+        elapsed = time.monotonic() - start
+        if stop and done_at is not None:
+            entry = monitor.record_stopped(elapsed)
+            logger.debug("JSON complete, stream stopped", extra=entry)
+        elif done_at is not None:
+            monitor.record_completed(elapsed, tail_chars, time.monotonic() - done_at)
+        else:
+            monitor.record_completed(elapsed, 0, None)
+
+    async def _complete_json(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Get a completion that ends with its first JSON value (see _stream_json)"""
+        chunks = [
+            chunk
+            async for chunk in self._stream_json(prompt, temperature, max_tokens, json_schema)
+        ]
+        return "".join(chunks)
+
+    async def _complete(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Get a completion from the provider chain, or this provider alone"""
+        if self.chain is not None:
+            return await self.chain.call(prompt, temperature, max_tokens, json_schema=json_schema)
+        return await self._call_provider(prompt, temperature, max_tokens, json_schema)
+
+    async def _call_provider(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Send the prompt to this client's provider (through its breaker, if any)"""
+
+        with span(
+            LLM_PROVIDER_SECONDS,
+            "llm request",
+            provider=self.provider,
+            model=self.model or "",
+            mode="request",
+        ):
+            start = time.monotonic()
+            if self.breaker is not None:
+                response = await self.breaker.call(
+                    lambda: self._dispatch(prompt, temperature, max_tokens, json_schema)
+                )
+            else:
+                response = await self._dispatch(prompt, temperature, max_tokens, json_schema)
+
+        elapsed = time.monotonic() - start
+        self._record_call((prompt, temperature, max_tokens, json_schema), response, elapsed)
+        return response
+
+    def _record_call(
+        self,
+        call: Tuple[str, float, Optional[int], Optional[Dict[str, Any]]],
+        response: str,
+        latency: float,
+        mode: str = "request",
+        first_chunk: Optional[float] = None,
+    ) -> None:
+        """
+        Write a completed provider call to the traffic log, if recording
+
+        Args:
+            call: (prompt, temperature, max_tokens, json_schema)
+            response: The generated text
+            latency: Seconds the provider took
+            mode: "request" or "stream"
+            first_chunk: Seconds to the first streamed chunk
+        """
+        if self.recorder is None:
+            return
+        self.recorder.record_call(
+            self.provider,
+            self.model,
+            *call,
+            response,
+            latency,
+            mode=mode,
+            first_chunk=first_chunk,
+        )
+
+    def _record_tokens(
+        self,
+        prompt: str,
+        completion: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> None:
+        """Count tokens for metrics, estimating from the text where usage is unknown"""
+        labels = {"provider": self.provider, "model": self.model or ""}
+        if prompt_tokens is None:
+            prompt_tokens = round(estimate_tokens(prompt))
+        if completion_tokens is None:
+            completion_tokens = round(estimate_tokens(completion or ""))
+        LLM_TOKENS.inc(prompt_tokens, kind="prompt", **labels)
+        LLM_TOKENS.inc(completion_tokens, kind="completion", **labels)
+
+    async def _dispatch(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        if self.provider == "gemini":
+            return await self._generate_gemini(prompt, temperature, max_tokens, json_schema)
+        elif self.provider in ["openai", "groq"]:
+            return await self._generate_openai(prompt, temperature, max_tokens, json_schema)
         elif self.provider == "ollama":
-            # Ollama API call
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                },
-            }
-
-            if max_tokens:
-                payload["options"]["num_predict"] = max_tokens
-
-            response = await self.client.post(f"{self.base_url}/api/generate", json=payload)
+            return await self._generate_ollama(prompt, temperature, max_tokens, json_schema)
+        elif self.provider == "mock":
+            return await self._generate_mock(prompt)
+        elif self.provider == "replay":
+            return await self._generate_replay(prompt, temperature, max_tokens, json_schema)
+
+    async def _generate_mock(self, prompt: str) -> str:
+        text = await self.client.complete(prompt)
+        self._record_tokens(prompt, text)
+        return text
+
+    async def _generate_replay(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        text = await self.client.complete(prompt, temperature, max_tokens, json_schema)
+        self._record_tokens(prompt, text)
+        return text
+
+    async def _generate_gemini(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        response = await self.client.generate_content_async(
+            prompt,
+            generation_config=self._gemini_config(temperature, max_tokens, json_schema),
+        )
+        usage = getattr(response, "usage_metadata", None)
+        self._record_tokens(
+            prompt,
+            response.text,
+            getattr(usage, "prompt_token_count", None),
+            getattr(usage, "candidates_token_count", None),
+        )
+        return response.text
+
+    @staticmethod
+    def _gemini_config(
+        temperature: float, max_tokens: Optional[int], json_schema: Optional[Dict[str, Any]]
+    ) -> "genai.GenerationConfig":
+        import google.generativeai as genai
+
+        json_options = {}
+        if json_schema is not None:
+            json_options["response_mime_type"] = "application/json"
+            if json_schema:
+                json_options["response_schema"] = json_schema
+
+        return genai.GenerationConfig(
+            temperature=temperature,
+            max_output_tokens=max_tokens,
+            **json_options,
+        )
+
+    async def _stream_gemini(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        response = await self.client.generate_content_async(
+            prompt,
+            generation_config=self._gemini_config(temperature, max_tokens, json_schema),
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk.text
+
+    async def _generate_openai(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **self._openai_json_options(json_schema),
+        )
+        text = response.choices[0].message.content
+        usage = response.usage
+        self._record_tokens(
+            prompt,
+            text,
+            usage.prompt_tokens if usage else None,
+            usage.completion_tokens if usage else None,
+        )
+        return text
+
+    @staticmethod
+    def _openai_json_options(json_schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # JSON object mode works on both OpenAI and Groq; the schema itself is
+        # described in the prompt (see generate_structured)
+        if json_schema is None:
+            return {}
+        return {"response_format": {"type": "json_object"}}
+
+    async def _stream_openai(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            **self._openai_json_options(json_schema),
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Closing the response cancels generation when the caller stops early
+            await stream.close()
+
+    def _ollama_payload(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream,
+            "options": {
+                "temperature": temperature,
+            },
+        }
+
+        if max_tokens:
+            payload["options"]["num_predict"] = max_tokens
+
+        if json_schema is not None:
+            # Ollama accepts either "json" or a JSON schema
+            payload["format"] = json_schema or "json"
+
+        return payload
+
+    async def _generate_ollama(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        # Ollama API call
+        payload = self._ollama_payload(
+            prompt, temperature, max_tokens, stream=False, json_schema=json_schema
+        )
+
+        response = await self.client.post(f"{self.base_url}/api/generate", json=payload)
+        response.raise_for_status()
+        result = response.json()
+        text = result.get("response", "")
+        self._record_tokens(
+            prompt, text, result.get("prompt_eval_count"), result.get("eval_count")
+        )
+        return text
+
+    async def _stream_ollama(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        # Ollama streams one JSON object per line
+        payload = self._ollama_payload(
+            prompt, temperature, max_tokens, stream=True, json_schema=json_schema
+        )
+
+        async with self.client.stream(
+            "POST", f"{self.base_url}/api/generate", json=payload
+        ) as response:
             response.raise_for_status()
-            result = response.json()
-            return result.get("response", "")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                yield result.get("response", "")
+                if result.get("done"):
+                    break
 
     async def generate_json(
-        self, prompt: str, schema: Optional[Dict[str, Any]] = None
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """Generate structured JSON output"""
 
         json_prompt = f"{prompt}\n\nRespond with valid JSON only."
-        response = await self.generate(json_prompt, temperature=0.3)
+        response = await self.generate(
+            json_prompt,
+            temperature=0.3,
+            use_cache=use_cache,
+            json_schema=(schema or {}) if self.native_json else None,
+            stop_at_json=True,
+        )
 
         # Use robust cleaning utility
         from app.utils.output_parsers import clean_llm_response
@@ -121,7 +789,142 @@ class LLMClient:
 
         return json.loads(cleaned_response)
 
+    def _structured_prompt(
+        self, prompt: str, model: Type[BaseModel]
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """Append format instructions for ``model``; returns (prompt, json_schema)"""
+        from app.utils.output_parsers import (
+            compact_format_instructions,
+            full_format_instructions,
+            provider_schema,
+        )
+
+        full_instructions = full_format_instructions(model)
+        self.structured_stats["calls"] += 1
+
+        if not self.native_json:
+            return f"{prompt}\n\n{full_instructions}", None
+
+        instructions = compact_format_instructions(model)
+        self.structured_stats["prompt_chars_saved"] += len(full_instructions) - len(instructions)
+        return f"{prompt}\n\n{instructions}", provider_schema(model)
+
+    async def generate_structured(
+        self,
+        prompt: str,
+        model: Type[ModelT],
+        temperature: float = 0.3,
+        use_cache: bool = True,
+        max_retries: int = 1,
+    ) -> ModelT:
+        """
+        Generate output validated into a Pydantic model
+
+        With native JSON mode the provider is constrained to the model's
+        schema and the prompt only carries a one-line shape of it; otherwise
+        the full LangChain format instructions are appended. Only valid output
+        is cached. Invalid output is retried up to ``max_retries`` times,
+        bypassing the cached response and caching the retry's if it is valid.
+
+        Raises:
+            ValueError: if no attempt produced valid output
+        """
+        structured_prompt, json_schema = self._structured_prompt(prompt, model)
+
+        for attempt in range(max_retries + 1):
+            response = await self.generate(
+                structured_prompt,
+                temperature=temperature,
+                use_cache=use_cache,
+                json_schema=json_schema,
+                stop_at_json=True,
+                refresh_cache=attempt > 0,
+                validate=lambda text: self._parse_structured(text, model),
+            )
+            try:
+                return self.validate_structured(response, model)
+            except ValueError as e:
+                last_error = e
+                logger.warning(
+                    "Invalid structured output",
+                    extra={"schema": model.__name__, "attempt": attempt + 1, "error": str(e)},
+                )
+                if attempt < max_retries:
+                    self.structured_stats["retries"] += 1
+
+        raise ValueError(f"LLM output did not match {model.__name__}: {last_error}")
+
+    def validate_structured(self, response: str, model: Type[ModelT]) -> ModelT:
+        """Validate a raw response into ``model`` (ValueError if it does not match)"""
+        try:
+            return self._parse_structured(response, model)
+        except ValueError:
+            self.structured_stats["validation_failures"] += 1
+            raise
+
+    @staticmethod
+    def _parse_structured(response: str, model: Type[ModelT]) -> ModelT:
+        """``validate_structured`` without counting failures"""
+        from app.utils.output_parsers import clean_llm_response
+
+        try:
+            return model.model_validate(json.loads(clean_llm_response(response)))
+        except (json.JSONDecodeError, ValidationError) as e:
+            raise ValueError(str(e)) from e
+
+    async def stream_structured(
+        self, prompt: str, model: Type[BaseModel], temperature: float = 0.3
+    ) -> AsyncIterator[str]:
+        """
+        Stream the raw JSON text of a structured response as it is generated
+
+        Uses the same prompt, JSON mode and cache entry as
+        ``generate_structured``; a cached response is yielded in one chunk.
+        Validate the joined text with ``validate_structured``; it is only
+        cached if valid. The stream ends with the JSON value (see
+        ``_stream_json``).
+        """
+        structured_prompt, json_schema = self._structured_prompt(prompt, model)
+        extra = {"json_schema": json_schema} if json_schema is not None else {}
+        key = make_cache_key(
+            self.provider, self.model, structured_prompt, temperature, None, **extra
+        )
+
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        async for chunk in self._stream_json(structured_prompt, temperature, None, json_schema):
+            chunks.append(chunk)
+            yield chunk
+
+        if self.cache is not None:
+            text = "".join(chunks)
+            try:
+                self._parse_structured(text, model)
+            except ValueError:
+                return
+            await self.cache.set(key, text)
+
+    def structured_output_stats(self) -> Dict[str, Any]:
+        """Structured-output counters, including estimated prompt tokens saved"""
+        calls = self.structured_stats["calls"]
+        return {
+            **self.structured_stats,
+            "native_json": self.native_json,
+            # ~4 characters per token for English/JSON text
+            "prompt_tokens_saved_est": self.structured_stats["prompt_chars_saved"] // 4,
+            "validation_failure_rate": (
+                self.structured_stats["validation_failures"] / calls if calls else 0.0
+            ),
+        }
+
     async def close(self):
-        """Close the client connection (for Ollama)"""
+        """Close the client connection (for Ollama) and any fallback clients"""
         if self.provider == "ollama" and hasattr(self, "client"):
             await self.client.aclose()
+        for fallback in self.fallbacks:
+            await fallback.close()
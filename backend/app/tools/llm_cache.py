@@ -0,0 +1,184 @@
+"""
+Response caches for LLMClient
+"""
+
+from typing import Any, Dict, Optional
+from contextlib import closing
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from app.utils.ttl_cache import TTLCache
+
+
+def make_cache_key(
+    provider: str,
+    model: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    **extra: Any,
+) -> str:
+    """Stable hash of everything that determines an LLM response"""
+    payload = json.dumps(
+        [provider, model, prompt, temperature, max_tokens, extra],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Base class for LLM response cache backends"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return a cached response or None"""
+        value = await self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a response"""
+        await self._set(key, value)
+
+    def record_bypass(self) -> None:
+        """Count a call that skipped the cache"""
+        self.bypasses += 1
+
+    async def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    async def _set(self, key: str, value: str) -> None:
+        raise NotImplementedError
+
+    def size(self) -> int:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "size": self.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryResponseCache(ResponseCache):
+    """In-process LRU cache"""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: Optional[float] = None):
+        super().__init__()
+        self.cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    async def _get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    async def _set(self, key: str, value: str) -> None:
+        self.cache.set(key, value)
+
+    def size(self) -> int:
+        return len(self.cache)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """On-disk cache in a SQLite file, shared across restarts and workers"""
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def _get_sync(self, key: str) -> Optional[str]:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            if self.ttl_seconds is not None and created_at + self.ttl_seconds <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return value
+
+    def _set_sync(self, key: str, value: str) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            # Evict least recently used rows beyond the size limit
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    async def _get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get_sync, key)
+
+    async def _set(self, key: str, value: str) -> None:
+        await asyncio.to_thread(self._set_sync, key, value)
+
+    def size(self) -> int:
+        with closing(self._connect()) as conn, conn:
+            return conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+def create_response_cache(
+    backend: str,
+    max_entries: int = 10000,
+    ttl_seconds: Optional[float] = None,
+    path: str = "llm_cache.sqlite3",
+) -> Optional[ResponseCache]:
+    """Build a cache backend by name: "none", "memory" or "sqlite" """
+    backend = (backend or "none").lower()
+
+    if backend == "none":
+        return None
+    if backend == "memory":
+        return MemoryResponseCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend == "sqlite":
+        return SQLiteResponseCache(path, max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    raise ValueError(f"Unsupported LLM cache backend: {backend}. Choose from: none, memory, sqlite")
@@ -0,0 +1,267 @@
+"""
+Record LLM traffic to disk and replay it deterministically
+
+``LLMRecorder`` appends every provider call (prompt, parameters, response,
+latency) and every chat exchange to a JSONL log, gzip-compressed when the
+path ends in ``.gz``. ``ReplayLLMBackend`` serves those responses back for
+``LLM_PROVIDER=replay``, optionally with the recorded timings, so recorded
+traffic can be pushed through the graph again (scripts/replay_traffic.py)
+to benchmark parser, graph and database overhead without the provider's
+variance, and to check that changes do not alter outputs.
+
+Log lines::
+
+    {"type": "llm", "mode": "request" | "stream", "provider": ..., "model": ...,
+     "prompt": ..., "params": {"temperature", "max_tokens", "json_schema"},
+     "response": ..., "latency": s, "first_chunk": s | null, "at": iso}
+    {"type": "chat", "user_id": ..., "message": ..., "timestamp": iso,
+     "response": ..., "intent": ..., "latency": s, "at": iso}
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from collections import defaultdict
+from datetime import datetime
+import asyncio
+import gzip
+import json
+import logging
+from app.tools.llm_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayMissError(LookupError):
+    """The replay log has no response for this prompt and parameters"""
+
+
+def traffic_key(
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    json_schema: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Key of an LLM call, independent of the provider that answered it"""
+    extra = {"json_schema": json_schema} if json_schema is not None else {}
+    return make_cache_key("", None, prompt, temperature, max_tokens, **extra)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_log(path: str) -> Iterator[Dict[str, Any]]:
+    """Entries of a traffic log, stopping quietly at a truncated last line"""
+    with _open(path, "r") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, json.JSONDecodeError):
+            logger.warning("Traffic log ends with a truncated entry", extra={"path": path})
+
+
+class LLMRecorder:
+    """
+    Append LLM calls and chat exchanges to a traffic log
+
+    Entries are buffered and written ``flush_every`` at a time (one gzip
+    member per write for ``.gz`` paths), so recording costs one small file
+    append per batch rather than per call; ``close()`` writes the rest.
+    """
+
+    def __init__(self, path: str, flush_every: int = 50):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.buffer: List[str] = []
+        self.recorded = {"llm": 0, "chat": 0}
+
+    def record_call(
+        self,
+        provider: str,
+        model: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]],
+        response: str,
+        latency: float,
+        mode: str = "request",
+        first_chunk: Optional[float] = None,
+    ) -> None:
+        """Record one provider call (``first_chunk``: seconds to the first streamed chunk)"""
+        self._append(
+            {
+                "type": "llm",
+                "mode": mode,
+                "provider": provider,
+                "model": model,
+                "prompt": prompt,
+                "params": {
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                    "json_schema": json_schema,
+                },
+                "response": response,
+                "latency": round(latency, 4),
+                "first_chunk": round(first_chunk, 4) if first_chunk is not None else None,
+            }
+        )
+
+    def record_chat(
+        self,
+        user_id: str,
+        message: str,
+        timestamp: datetime,
+        response: Optional[str],
+        intent: Optional[str],
+        latency: float,
+    ) -> None:
+        """Record one chat exchange, the input traffic for a replay"""
+        self._append(
+            {
+                "type": "chat",
+                "user_id": user_id,
+                "message": message,
+                "timestamp": timestamp.isoformat(),
+                "response": response,
+                "intent": intent,
+                "latency": round(latency, 4),
+            }
+        )
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        entry["at"] = datetime.now().isoformat()
+        self.recorded[entry["type"]] += 1
+        self.buffer.append(json.dumps(entry, separators=(",", ":")) + "\n")
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered entries to the log"""
+        if not self.buffer:
+            return
+        lines, self.buffer = self.buffer, []
+        with _open(self.path, "a") as f:
+            f.writelines(lines)
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "recorded": dict(self.recorded), "buffered": len(self.buffer)}
+
+
+class ReplayLLMBackend:
+    """
+    Serve recorded LLM responses for the "replay" provider
+
+    Calls are matched on prompt and parameters (not provider, so traffic
+    answered by a fallback replays too). Repeated identical calls get the
+    recorded responses in order, then the last one again. A call with no
+    recording raises ReplayMissError, which marks a prompt change.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        entries: Optional[List[Dict[str, Any]]] = None,
+        timing: bool = False,
+        speed: float = 1.0,
+        chunk_chars: int = 8,
+    ):
+        """
+        Args:
+            path: Traffic log written by LLMRecorder
+            entries: Log entries to use instead of (or in addition to) ``path``
+            timing: Sleep for the recorded latency before answering
+            speed: Divide recorded latencies by this factor
+            chunk_chars: Characters per streamed chunk
+        """
+        entries = list(entries or [])
+        if path:
+            entries.extend(read_log(path))
+
+        self.responses: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in entries:
+            if entry.get("type") == "llm":
+                params = entry["params"]
+                key = traffic_key(
+                    entry["prompt"],
+                    params["temperature"],
+                    params["max_tokens"],
+                    params.get("json_schema"),
+                )
+                self.responses[key].append(entry)
+
+        self.positions: Dict[str, int] = defaultdict(int)
+        self.timing = timing
+        self.speed = speed if speed > 0 else 1.0
+        self.chunk_chars = max(1, chunk_chars)
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """The next recorded entry for this call"""
+        key = traffic_key(prompt, temperature, max_tokens, json_schema)
+        recorded = self.responses.get(key)
+        if not recorded:
+            self.misses += 1
+            raise ReplayMissError(f"No recorded response for prompt: {prompt[:80]!r}")
+
+        self.hits += 1
+        position = self.positions[key]
+        self.positions[key] = position + 1
+        return recorded[min(position, len(recorded) - 1)]
+
+    async def complete(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Return the recorded response (after the recorded latency, with timing)"""
+        entry = self.lookup(prompt, temperature, max_tokens, json_schema)
+        if self.timing:
+            await asyncio.sleep(entry["latency"] / self.speed)
+        return entry["response"]
+
+    async def stream(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the recorded response in chunks, with the recorded first-chunk delay"""
+        entry = self.lookup(prompt, temperature, max_tokens, json_schema)
+        text = entry["response"]
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+
+        first = rest = 0.0
+        if self.timing:
+            latency = entry["latency"] / self.speed
+            first = min(latency, (entry.get("first_chunk") or entry["latency"]) / self.speed)
+            rest = (latency - first) / max(1, len(chunks) - 1)
+
+        for i, chunk in enumerate(chunks):
+            delay = first if i == 0 else rest
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorded_calls": sum(len(entries) for entries in self.responses.values()),
+            "distinct_calls": len(self.responses),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
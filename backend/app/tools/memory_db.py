@@ -0,0 +1,386 @@
+"""
+In-memory Supabase stand-in for load tests and benchmarks
+
+``InMemorySupabaseClient`` is the real ``SupabaseClient`` talking to an
+in-process PostgREST emulation instead of the network, so request building,
+pooling and tracing are exercised exactly as in production while the data
+lives in Python dicts. It covers the subset of PostgREST the app uses
+(filters, ordering, paging, projections, bulk inserts, upserts) and the
+``log_meals`` and ``summarize_rollups`` functions from scripts/migrate_db.py.
+The migration's NOT NULL constraints are enforced, so a write Postgres would
+reject fails here too (400, code 23502).
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from collections import defaultdict
+from datetime import datetime, timezone
+from urllib.parse import unquote
+import asyncio
+import itertools
+import json
+import re
+import httpx
+from app.tools.db import SupabaseClient
+from app.utils.latency import LatencyDistribution
+
+# Conflict target used by upserts without on_conflict
+PRIMARY_KEYS = {"daily_rollups": ("user_id", "day")}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+# NOT NULL columns per table in scripts/migrate_db.py, with a factory for the
+# column default (None: no default, so the column must be given)
+NOT_NULL_COLUMNS: Dict[str, Dict[str, Optional[Callable[[], Any]]]] = {
+    "food_logs": {
+        "user_id": None,
+        "timestamp": None,
+        "food_items": list,
+        "total_calories": int,
+        "breakdown": list,
+    },
+    "goals": {"user_id": None, "goal_type": None, "created_at": _now},
+    "reminders": {
+        "user_id": None,
+        "type": None,
+        "scheduled_time": None,
+        "status": lambda: "scheduled",
+    },
+    "daily_rollups": {
+        "user_id": None,
+        "day": None,
+        "total_calories": int,
+        "meal_count": int,
+        "protein": float,
+        "carbs": float,
+        "fat": float,
+        "updated_at": _now,
+    },
+}
+
+
+class NotNullViolation(Exception):
+    """A write would store NULL in a NOT NULL column (Postgres error 23502)"""
+
+    def __init__(self, table: str, column: str):
+        self.table = table
+        self.column = column
+        super().__init__(
+            f'null value in column "{column}" of relation "{table}" violates not-null constraint'
+        )
+
+
+def _with_defaults(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    ``row`` as inserted: omitted NOT NULL columns get their default
+
+    Raises:
+        NotNullViolation: A NOT NULL column is null, or omitted without a default
+    """
+    row = dict(row)
+    for column, default in NOT_NULL_COLUMNS.get(table, {}).items():
+        if column not in row and default is not None:
+            row[column] = default()
+        if row.get(column) is None:
+            raise NotNullViolation(table, column)
+    return row
+
+
+def _check_update(table: str, data: Dict[str, Any]) -> None:
+    """Raise NotNullViolation if ``data`` sets a NOT NULL column to null"""
+    for column in NOT_NULL_COLUMNS.get(table, {}):
+        if column in data and data[column] is None:
+            raise NotNullViolation(table, column)
+
+_IN_VALUE = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,]+)')
+
+
+def _comparable(stored: Any, operand: str) -> Tuple[Any, Any]:
+    """Compare numbers numerically and everything else as text, like PostgREST"""
+    if isinstance(stored, (int, float)) and not isinstance(stored, bool):
+        try:
+            return float(stored), float(operand)
+        except ValueError:
+            pass
+    return ("" if stored is None else str(stored)), operand
+
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
+
+
+def _matches(row: Dict[str, Any], filters: List[Tuple[str, str, Any]]) -> bool:
+    for column, op, operand in filters:
+        stored = row.get(column)
+        if op == "in":
+            if ("" if stored is None else str(stored)) not in operand:
+                return False
+        elif not _OPERATORS[op](*_comparable(stored, operand)):
+            return False
+    return True
+
+
+class InMemoryPostgREST:
+    """
+    httpx transport handler that serves PostgREST requests from memory
+
+    Args:
+        latency: Latency distribution spec (see utils/latency.py) added to
+            every request
+    """
+
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "columns", "on_conflict"}
+
+    def __init__(self, latency: Union[str, LatencyDistribution] = "fixed:0"):
+        if isinstance(latency, str):
+            latency = LatencyDistribution(latency)
+        self.latency = latency
+        self.tables: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._ids = itertools.count(1)
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        delay = self.latency.sample()
+        if delay:
+            await asyncio.sleep(delay)
+
+        path = unquote(request.url.path.split("/rest/v1/", 1)[-1])
+        params = request.url.params
+        body = json.loads(request.content) if request.content else None
+
+        try:
+            if path.startswith("rpc/"):
+                return self._rpc(path[4:], body or {})
+            if request.method == "GET":
+                return self._json(200, self._select(path, params))
+            if request.method == "POST":
+                prefer = request.headers.get("Prefer", "")
+                return self._json(201, self._insert(path, body, params, prefer))
+            if request.method == "PATCH":
+                return self._json(200, self._update(path, params, body or {}))
+            if request.method == "DELETE":
+                return self._json(200, self._delete(path, params))
+        except NotNullViolation as e:
+            # Nothing was written: every row is checked before any is stored
+            return self._json(
+                400, {"code": "23502", "details": None, "hint": None, "message": str(e)}
+            )
+        return self._json(405, {"message": f"Unsupported method {request.method}"})
+
+    @staticmethod
+    def _json(status: int, payload: Any) -> httpx.Response:
+        return httpx.Response(status, json=payload)
+
+    def _filters(self, params: httpx.QueryParams) -> List[Tuple[str, str, Any]]:
+        filters = []
+        for column, value in params.multi_items():
+            if column in self.RESERVED_PARAMS:
+                continue
+            op, _, operand = value.partition(".")
+            if op == "in":
+                inner = operand[1:-1]
+                operand = {
+                    quoted.replace('\\"', '"') if quoted else plain
+                    for quoted, plain in _IN_VALUE.findall(inner)
+                }
+            filters.append((column, op, operand))
+        return filters
+
+    def _rows(self, table: str, params: httpx.QueryParams) -> List[Dict[str, Any]]:
+        filters = self._filters(params)
+        return [row for row in self.tables[table] if _matches(row, filters)]
+
+    def _select(self, table: str, params: httpx.QueryParams) -> List[Dict[str, Any]]:
+        rows = self._rows(table, params)
+
+        if "order" in params:
+            column, _, direction = params["order"].partition(".")
+            rows.sort(
+                key=lambda row: (row.get(column) is None, row.get(column)),
+                reverse=direction == "desc",
+            )
+
+        offset = int(params.get("offset", 0))
+        rows = rows[offset:]
+        if "limit" in params:
+            rows = rows[: int(params["limit"])]
+
+        select = params.get("select", "*")
+        if select != "*":
+            columns = [column.strip() for column in select.split(",")]
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+
+        return [dict(row) for row in rows]
+
+    def _insert(
+        self,
+        table: str,
+        body: Union[Dict[str, Any], List[Dict[str, Any]]],
+        params: httpx.QueryParams,
+        prefer: str,
+    ) -> List[Dict[str, Any]]:
+        rows = body if isinstance(body, list) else [body]
+        resolution = None
+        if "resolution=merge-duplicates" in prefer:
+            resolution = "merge"
+        elif "resolution=ignore-duplicates" in prefer:
+            resolution = "ignore"
+
+        conflict = PRIMARY_KEYS.get(table, ("id",))
+        if "on_conflict" in params:
+            conflict = tuple(params["on_conflict"].split(","))
+
+        # Postgres checks the proposed row, defaults included, even when it
+        # then conflicts and becomes an update
+        inserts = [_with_defaults(table, row) for row in rows]
+
+        written = []
+        for row, insert in zip(rows, inserts):
+            existing = None
+            if resolution:
+                key = tuple(row.get(column) for column in conflict)
+                existing = next(
+                    (
+                        stored
+                        for stored in self.tables[table]
+                        if tuple(stored.get(column) for column in conflict) == key
+                    ),
+                    None,
+                )
+            if existing is not None:
+                if resolution == "merge":
+                    existing.update(row)
+                    written.append(dict(existing))
+                continue
+
+            stored = {"id": next(self._ids), "created_at": _now(), **insert}
+            self.tables[table].append(stored)
+            written.append(dict(stored))
+
+        return written if "return=representation" in prefer else []
+
+    def _update(
+        self, table: str, params: httpx.QueryParams, data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        _check_update(table, data)
+        rows = self._rows(table, params)
+        for row in rows:
+            row.update(data)
+        return [dict(row) for row in rows]
+
+    def _delete(self, table: str, params: httpx.QueryParams) -> List[Dict[str, Any]]:
+        rows = self._rows(table, params)
+        deleted = {id(row) for row in rows}
+        self.tables[table] = [row for row in self.tables[table] if id(row) not in deleted]
+        return [dict(row) for row in rows]
+
+    def _rpc(self, function: str, params: Dict[str, Any]) -> httpx.Response:
+        if function == "log_meals":
+            self._log_meals(params)
+            return httpx.Response(204)
+        if function == "summarize_rollups":
+            return self._json(200, [self._summarize_rollups(params)])
+        return self._json(404, {"message": f"Unknown function {function}"})
+
+    def _log_meals(self, params: Dict[str, Any]) -> None:
+        user_id = params.get("p_user_id")
+        logs = [
+            _with_defaults(
+                "food_logs",
+                {
+                    "user_id": user_id,
+                    "timestamp": entry.get("timestamp"),
+                    "food_items": entry.get("food_items") or [],
+                    "total_calories": entry.get("total_calories") or 0,
+                    "breakdown": entry.get("breakdown") or [],
+                },
+            )
+            for entry in params.get("p_logs", [])
+        ]
+
+        for log in logs:
+            timestamp = datetime.fromisoformat(log["timestamp"])
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+
+            self.tables["food_logs"].append({"id": next(self._ids), **log})
+            self._add_to_rollup(
+                user_id, timestamp.astimezone(timezone.utc).date().isoformat(), log
+            )
+
+    def _add_to_rollup(self, user_id: str, day: str, log: Dict[str, Any]) -> None:
+        rollup = next(
+            (
+                row
+                for row in self.tables["daily_rollups"]
+                if row["user_id"] == user_id and row["day"] == day
+            ),
+            None,
+        )
+        if rollup is None:
+            rollup = {
+                "user_id": user_id,
+                "day": day,
+                "total_calories": 0,
+                "meal_count": 0,
+                "protein": 0.0,
+                "carbs": 0.0,
+                "fat": 0.0,
+            }
+            self.tables["daily_rollups"].append(rollup)
+
+        rollup["total_calories"] += log["total_calories"]
+        rollup["meal_count"] += 1
+        for macro in ("protein", "carbs", "fat"):
+            rollup[macro] += sum(float(item.get(macro) or 0) for item in log["breakdown"])
+        rollup["updated_at"] = _now()
+
+    def _summarize_rollups(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        rows = [
+            row
+            for row in self.tables["daily_rollups"]
+            if row["user_id"] == params.get("p_user_id")
+            and params["p_start"] <= row["day"] <= params["p_end"]
+        ]
+        return {
+            "total_calories": sum(row["total_calories"] for row in rows),
+            "meal_count": sum(row["meal_count"] for row in rows),
+            "days_logged": sum(1 for row in rows if row["meal_count"] > 0),
+            **{macro: sum(row[macro] for row in rows) for macro in ("protein", "carbs", "fat")},
+        }
+
+
+class InMemorySupabaseClient(SupabaseClient):
+    """``SupabaseClient`` backed by an ``InMemoryPostgREST`` instead of Supabase"""
+
+    def __init__(
+        self,
+        latency: Union[str, LatencyDistribution] = "fixed:0",
+        backend: Optional[InMemoryPostgREST] = None,
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            latency: Simulated per-request latency (ignored if ``backend`` is given)
+            backend: Share an existing in-memory database
+            **kwargs: Passed to SupabaseClient (pool_size, timeout, batch_size, ...)
+        """
+        self.backend = backend or InMemoryPostgREST(latency)
+        super().__init__(
+            url="http://in-memory-supabase",
+            key="in-memory",
+            transport=self.backend.transport(),
+            **kwargs,
+        )
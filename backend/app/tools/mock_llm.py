@@ -0,0 +1,175 @@
+"""
+Offline LLM provider for load tests and benchmarks
+
+Answers the agent's prompts with canned, schema-valid responses after a
+latency drawn from a configurable distribution, so the whole chat path can
+be exercised without provider credentials or network access.
+"""
+
+from typing import AsyncIterator, Callable, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import json
+import random
+import re
+from app.utils.latency import LatencyDistribution
+
+
+class MockLLMError(RuntimeError):
+    """Injected provider failure (see ``error_rate``)"""
+
+
+_MESSAGE = re.compile(r'User message: "(.*)"')
+_ESTIMATE_ITEM = re.compile(r"^- (.+): ([\d.]+) (.+)$", re.MULTILINE)
+_QUANTITY = re.compile(r"^(\d+(?:\.\d+)?)\s*(g|grams|cups?|pieces?|slices?|bowls?)?\s+(.+)$")
+
+
+def _user_message(prompt: str) -> str:
+    match = _MESSAGE.search(prompt)
+    return match.group(1) if match else prompt
+
+
+def _food_items(message: str) -> List[dict]:
+    """Split "2 eggs, toast and 200g rice" into {name, quantity, unit} items"""
+    items = []
+    for part in re.split(r",|\band\b|\bwith\b", message.lower()):
+        part = re.sub(r"^(i (had|ate)|for \w+)\s+", "", part.strip(" .!"))
+        if not part:
+            continue
+        match = _QUANTITY.match(part)
+        if match:
+            quantity, unit, name = float(match.group(1)), match.group(2) or "pieces", match.group(3)
+        else:
+            quantity, unit, name = 1.0, "serving", part
+        items.append({"name": name.strip(), "quantity": quantity, "unit": unit})
+    return items
+
+
+def _estimate(item: dict) -> dict:
+    """Deterministic pseudo-nutrition for an item (stable across runs)"""
+    digest = int(hashlib.md5(item["name"].encode()).hexdigest()[:8], 16)
+    calories = 50 + digest % 450
+    return {
+        **item,
+        "calories": calories,
+        "protein": round(calories * 0.05, 1),
+        "carbs": round(calories * 0.12, 1),
+        "fat": round(calories * 0.03, 1),
+    }
+
+
+def _intent(message: str) -> str:
+    text = message.lower()
+    if "goal" in text or "target" in text:
+        return "set_goal"
+    if any(word in text for word in ("summary", "how am i", "this week", "today so far")):
+        return "get_summary"
+    return "log_food"
+
+
+def _respond_intent(prompt: str) -> str:
+    return json.dumps({"intent": _intent(_user_message(prompt)), "confidence": 0.9})
+
+
+def _respond_fused(prompt: str) -> str:
+    message = _user_message(prompt)
+    intent = _intent(message)
+    items = _food_items(message) if intent == "log_food" else []
+    estimates = [_estimate(item) for item in items] if "calories, protein" in prompt else None
+    return json.dumps(
+        {"intent": intent, "confidence": 0.9, "items": items, "estimates": estimates or None}
+    )
+
+
+def _respond_food_items(prompt: str) -> str:
+    return json.dumps({"items": _food_items(_user_message(prompt))})
+
+
+def _respond_calories(prompt: str) -> str:
+    breakdown = [
+        _estimate({"name": name, "quantity": float(quantity), "unit": unit})
+        for name, quantity, unit in _ESTIMATE_ITEM.findall(prompt)
+    ]
+    total = sum(item["calories"] for item in breakdown)
+    return json.dumps({"total": total, "breakdown": breakdown})
+
+
+Responder = Union[str, Callable[[str], str]]
+
+# (prompt substring, response) pairs checked in order; the first match answers
+DEFAULT_RESPONSES: List[Tuple[str, Responder]] = [
+    ("Classify the user's intent and, if they are", _respond_fused),
+    ("Classify the user's intent", _respond_intent),
+    ("Extract food items", _respond_food_items),
+    ("Estimate calories and macronutrients", _respond_calories),
+    ("clarification question", "Could you tell me what you ate, or what you would like to do?"),
+]
+
+
+class MockLLMBackend:
+    """
+    Canned responses with simulated latency
+
+    Custom responses are loaded from a JSON file of
+    ``[{"match": "prompt substring", "response": "text"}, ...]`` and take
+    precedence over the built-in ones, which understand the agent's own
+    prompts (intent, food parsing, calorie estimation, fused routing).
+    """
+
+    def __init__(
+        self,
+        latency: Union[str, LatencyDistribution] = "fixed:0",
+        responses_path: Optional[str] = None,
+        error_rate: float = 0.0,
+        chunk_chars: int = 8,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            latency: Latency distribution spec (see utils/latency.py) for a
+                whole response; streams spread it over their chunks
+            responses_path: JSON file with custom canned responses
+            error_rate: Fraction of calls that fail with MockLLMError
+            chunk_chars: Characters per streamed chunk
+            seed: Seed for reproducible latencies and failures
+        """
+        self.rng = random.Random(seed)
+        if isinstance(latency, str):
+            latency = LatencyDistribution(latency, rng=self.rng)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chunk_chars = max(1, chunk_chars)
+        self.responses: List[Tuple[str, Responder]] = []
+        if responses_path:
+            with open(responses_path) as f:
+                self.responses = [(entry["match"], entry["response"]) for entry in json.load(f)]
+        self.responses += DEFAULT_RESPONSES
+
+    def respond(self, prompt: str) -> str:
+        """The canned response for ``prompt``"""
+        for match, response in self.responses:
+            if match in prompt:
+                return response(prompt) if callable(response) else response
+        return "OK"
+
+    def _maybe_fail(self) -> None:
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise MockLLMError("Injected mock LLM failure")
+
+    async def complete(self, prompt: str) -> str:
+        """Return the response after one latency sample"""
+        await asyncio.sleep(self.latency.sample())
+        self._maybe_fail()
+        return self.respond(prompt)
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Yield the response in chunks, spreading one latency sample across them"""
+        text = self.respond(prompt)
+        chunks = [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+        delay = self.latency.sample() / max(1, len(chunks))
+
+        for i, chunk in enumerate(chunks):
+            await asyncio.sleep(delay)
+            if i == 0:
+                self._maybe_fail()
+            yield chunk
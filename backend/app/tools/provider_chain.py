@@ -0,0 +1,178 @@
+"""
+Ordered LLM provider chain with failover and hedged requests
+"""
+
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import asyncio
+import time
+import logging
+from app.utils.latency import LatencyWindow
+
+if TYPE_CHECKING:
+    from app.tools.llm import LLMClient
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderChain:
+    """
+    Call LLM providers in order, falling back (and hedging) down the chain
+
+    The first provider is called immediately. If it fails, the next one is
+    tried. With hedging enabled, the next provider is also started when the
+    current one has not answered within its recent p95 latency; the first
+    successful answer wins and the other in-flight calls are cancelled. A
+    cancelled call's elapsed time is kept as a (lower-bound) latency sample.
+    """
+
+    def __init__(
+        self,
+        clients: List["LLMClient"],
+        hedge: bool = True,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.05,
+        hedge_default_delay: float = 2.0,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize provider chain
+
+        Args:
+            clients: Single-provider clients in preference order
+            hedge: Start the next provider when the current one is slow
+            hedge_percentile: Latency percentile used as the hedge delay
+            hedge_min_delay: Lower bound for the hedge delay (seconds)
+            hedge_default_delay: Hedge delay until a provider has min_samples
+            min_samples: Samples needed before the percentile is trusted
+        """
+        self.clients = clients
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.min_samples = min_samples
+
+        self.latency = [LatencyWindow() for _ in clients]
+        self.calls = [0] * len(clients)
+        self.wins = [0] * len(clients)
+        self.errors = [0] * len(clients)
+        self.hedges = 0
+        self.failovers = 0
+
+    def hedge_delay(self, index: int) -> Optional[float]:
+        """Seconds to wait on provider ``index`` before starting the next one"""
+        if not self.hedge or index + 1 >= len(self.clients):
+            return None
+
+        window = self.latency[index]
+        if len(window) < self.min_samples:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, window.percentile(self.hedge_percentile))
+
+    async def _timed_call(
+        self,
+        index: int,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        json_schema: Optional[Dict[str, Any]],
+    ) -> str:
+        self.calls[index] += 1
+        start = time.perf_counter()
+        try:
+            response = await self.clients[index]._call_provider(
+                prompt, temperature, max_tokens, json_schema
+            )
+        except asyncio.CancelledError:
+            # A cancelled hedge loser took at least this long. Dropping the
+            # sample would leave only the calls that beat the hedge in the
+            # window and bias the percentile (and the hedge delay) low.
+            self.latency[index].record(time.perf_counter() - start)
+            raise
+        self.latency[index].record(time.perf_counter() - start)
+        return response
+
+    async def call(
+        self,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        start: int = 0,
+        json_schema: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Return the first successful response from the chain (from ``start`` on)"""
+
+        pending: Dict[asyncio.Task, int] = {}
+        next_index = start
+        last_error: Optional[BaseException] = None
+
+        def launch() -> None:
+            nonlocal next_index
+            task = asyncio.ensure_future(
+                self._timed_call(next_index, prompt, temperature, max_tokens, json_schema)
+            )
+            pending[task] = next_index
+            next_index += 1
+
+        try:
+            launch()
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay(next_index - 1),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    # Slow provider: hedge with the next one, keep both running
+                    self.hedges += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    index = pending.pop(task)
+                    if task.exception() is None:
+                        self.wins[index] += 1
+                        return task.result()
+
+                    self.errors[index] += 1
+                    last_error = task.exception()
+                    logger.warning(
+                        "LLM provider failed",
+                        extra={"provider": self.clients[index].provider, "error": repr(last_error)},
+                    )
+
+                    # Fail over to the next provider straight away
+                    if next_index < len(self.clients):
+                        self.failovers += 1
+                        launch()
+
+            raise last_error
+
+        finally:
+            # Cancel the losers
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider call, win, error and latency counters"""
+        return {
+            "hedges": self.hedges,
+            "failovers": self.failovers,
+            "providers": [
+                {
+                    "provider": client.provider,
+                    "model": client.model,
+                    "calls": self.calls[i],
+                    "wins": self.wins[i],
+                    "errors": self.errors[i],
+                    "hedge_delay_ms": (
+                        round(delay * 1000, 1)
+                        if (delay := self.hedge_delay(i)) is not None
+                        else None
+                    ),
+                    **self.latency[i].summary(),
+                }
+                for i, client in enumerate(self.clients)
+            ],
+        }
@@ -0,0 +1,168 @@
+"""
+Incremental JSON scanning for streamed LLM output
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+
+
+class StreamingItemParser:
+    """
+    Pull completed objects out of a JSON array while it is still streaming
+
+    Feed text chunks as they arrive; every object that closes inside the
+    target array (``{"<array_key>": [ {...}, {...} ]}``, or a bare top-level
+    array) is decoded and returned straight away, before the rest of the
+    document has been generated.
+    """
+
+    def __init__(self, array_key: Optional[str] = "items"):
+        self.array_key = array_key
+        self.text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self.items: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk; return the items completed by it"""
+        self.text += chunk
+        completed = []
+
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:pos]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                if char == "[" and self._array_depth is None and self._is_target_array():
+                    self._array_depth = len(self._stack) + 1
+                elif (
+                    char == "{"
+                    and self._array_depth is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    self._item_start = pos
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                if (
+                    char == "}"
+                    and self._item_start is not None
+                    and len(self._stack) == self._array_depth
+                ):
+                    item = self._decode(text[self._item_start:pos + 1])
+                    self._item_start = None
+                    if item is not None:
+                        self.items.append(item)
+                        completed.append(item)
+                elif char == "]" and self._array_depth is not None:
+                    if len(self._stack) < self._array_depth:
+                        self._array_depth = -1  # Target array finished
+
+        self._pos = len(text)
+        return completed
+
+    def _is_target_array(self) -> bool:
+        if self.array_key is None:
+            return not self._stack
+        return self._stack == ["{"] and self._last_string == self.array_key
+
+    @staticmethod
+    def _decode(fragment: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+
+
+class JsonValueScanner:
+    """
+    Detect the end of the first complete JSON object or array in streamed text
+
+    Text before the value (prose, a code fence) is skipped, as is anything
+    inside a ``<think>`` block. A balanced candidate that does not decode is
+    discarded and scanning continues after it. Once complete, ``value`` holds
+    the JSON text and ``end`` its end offset in ``text``.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.value: Optional[str] = None
+        self.end: Optional[int] = None
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self.value is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk; return True once a complete JSON value has been seen"""
+        self.text += chunk
+        if self.value is not None:
+            return True
+
+        text = self.text
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+
+            if self._start is None:
+                if char in "{[" and not self._in_think(pos):
+                    self._start = pos
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    candidate = text[self._start:pos + 1]
+                    self._start = None
+                    try:
+                        json.loads(candidate)
+                    except json.JSONDecodeError:
+                        continue
+                    self.value = candidate
+                    self.end = self._pos = pos + 1
+                    return True
+
+        self._pos = len(text)
+        return False
+
+    def _in_think(self, pos: int) -> bool:
+        before = self.text[:pos]
+        return before.count("<think>") > before.count("</think>")
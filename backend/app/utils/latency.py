@@ -0,0 +1,89 @@
+"""
+Rolling latency window and synthetic latency distributions
+"""
+
+from typing import Deque, Dict, Optional
+from collections import deque
+import math
+import random
+
+
+class LatencyWindow:
+    """The most recent ``size`` latency samples, with percentile queries"""
+
+    def __init__(self, size: int = 200):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        """Add a sample (seconds)"""
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Nearest-rank percentile for ``q`` in [0, 1]; None without samples"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))
+        return ordered[rank]
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """p50/p95/p99 in milliseconds"""
+        return {
+            f"p{int(q * 100)}_ms": (
+                round(value * 1000, 1) if (value := self.percentile(q)) is not None else None
+            )
+            for q in (0.5, 0.95, 0.99)
+        }
+
+
+class LatencyDistribution:
+    """
+    Random latencies for simulated backends, parsed from a spec string
+
+    Specs are ``kind:params`` with parameters in milliseconds:
+
+    - ``fixed:MS``
+    - ``uniform:MIN,MAX``
+    - ``normal:MEAN,STDDEV`` (truncated at 0)
+    - ``lognormal:MEDIAN,SIGMA`` (SIGMA is the shape, unitless)
+    - ``exponential:MEAN``
+
+    ``sample()`` returns seconds.
+    """
+
+    KINDS = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2, "exponential": 1}
+
+    def __init__(self, spec: str = "fixed:0", rng: Optional[random.Random] = None):
+        kind, _, params = spec.strip().partition(":")
+        kind = kind.lower()
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {spec!r}")
+        try:
+            values = [float(value) for value in params.split(",")] if params else []
+        except ValueError:
+            raise ValueError(f"Invalid latency distribution parameters: {spec!r}")
+        if len(values) != self.KINDS[kind]:
+            raise ValueError(f"{kind} latency takes {self.KINDS[kind]} parameter(s): {spec!r}")
+
+        self.spec = spec
+        self.kind = kind
+        self.params = values
+        self.rng = rng or random.Random()
+
+    def sample(self) -> float:
+        """One latency in seconds"""
+        p = self.params
+        if self.kind == "fixed":
+            ms = p[0]
+        elif self.kind == "uniform":
+            ms = self.rng.uniform(p[0], p[1])
+        elif self.kind == "normal":
+            ms = self.rng.gauss(p[0], p[1])
+        elif self.kind == "lognormal":
+            ms = self.rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        else:
+            ms = self.rng.expovariate(1 / p[0]) if p[0] > 0 else 0.0
+        return max(0.0, ms) / 1000
@@ -0,0 +1,77 @@
+"""
+Structured, leveled logging
+
+Modules log through ``logging.getLogger(__name__)`` and pass structured
+fields with ``extra``::
+
+    logger.info("Classified intent", extra={"intent": "log_food", "confidence": 0.9})
+
+``configure_logging`` renders those fields as ``key=value`` pairs (text) or
+as one JSON object per line (json).
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict
+import json
+import logging
+import sys
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Format records as ``key=value`` text or JSON lines"""
+
+    def __init__(self, fmt: str = "text"):
+        super().__init__()
+        self.json = fmt == "json"
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+            timespec="milliseconds"
+        )
+        fields = _fields(record)
+
+        if self.json:
+            payload = {
+                "ts": timestamp,
+                "level": record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                payload["exc"] = self.formatException(record.exc_info)
+            return json.dumps(payload, default=str)
+
+        line = f"{timestamp} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{key}={_text_value(value)}" for key, value in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+def _text_value(value: Any) -> str:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return json.dumps(text) if " " in text or not text else text
+
+
+def configure_logging(level: str = "INFO", fmt: str = "text") -> None:
+    """Send the app's logs to stderr at ``level`` in the given format ("text" or "json")"""
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(StructuredFormatter(fmt))
+
+    logger = logging.getLogger("app")
+    logger.handlers[:] = [handler]
+    logger.setLevel(level.upper())
+    logger.propagate = False
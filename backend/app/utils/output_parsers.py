@@ -1,10 +1,17 @@
 """
 LangChain output parsers for structured LLM responses
+
+langchain_core is imported on first use of a LangChain parser (the
+``*_parser`` instances or ``full_format_instructions``), not with this module.
 """
 
 from pydantic import BaseModel, Field
-from typing import List
-from langchain_core.output_parsers import PydanticOutputParser
+from typing import Any, Dict, List, Type
+from functools import lru_cache
+import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class IntentClassification(BaseModel):
@@ -30,6 +37,37 @@ class FoodItemsList(BaseModel):
     items: List[FoodItem] = Field(description="List of parsed food items")
 
 
+class FoodEstimate(FoodItem):
+    """A food item with estimated nutrition"""
+
+    calories: float = Field(description="Total calories for the quantity")
+    protein: float = Field(default=0, description="Grams of protein")
+    carbs: float = Field(default=0, description="Grams of carbohydrates")
+    fat: float = Field(default=0, description="Grams of fat")
+
+
+class CalorieEstimation(BaseModel):
+    """Calorie and macro estimates for a list of food items"""
+
+    total: float = Field(default=0, description="Total calories across all items")
+    breakdown: List[FoodEstimate] = Field(description="Estimate for each food item")
+
+
+class FusedIntentExtraction(BaseModel):
+    """Intent classification plus food extraction in a single response"""
+
+    intent: str = Field(
+        description="The classified intent: log_food, set_goal, get_summary, ask_question, or clarify"
+    )
+    confidence: float = Field(description="Confidence score between 0.0 and 1.0")
+    items: List[FoodItem] = Field(
+        default_factory=list, description="Food items when intent is log_food, else empty"
+    )
+    estimates: List[FoodEstimate] | None = Field(
+        default=None, description="Nutrition for each item when intent is log_food"
+    )
+
+
 class GoalData(BaseModel):
     """Fitness goal data"""
 
@@ -45,10 +83,93 @@ class GoalData(BaseModel):
     )
 
 
-# Create parser instances
-intent_parser = PydanticOutputParser(pydantic_object=IntentClassification)
-food_items_parser = PydanticOutputParser(pydantic_object=FoodItemsList)
-goal_parser = PydanticOutputParser(pydantic_object=GoalData)
+# Parser instances, created on first access
+_PARSER_MODELS = {
+    "intent_parser": IntentClassification,
+    "food_items_parser": FoodItemsList,
+    "goal_parser": GoalData,
+    "fused_parser": FusedIntentExtraction,
+    "calorie_parser": CalorieEstimation,
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _PARSER_MODELS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from langchain_core.output_parsers import PydanticOutputParser
+
+    parser = PydanticOutputParser(pydantic_object=_PARSER_MODELS[name])
+    globals()[name] = parser
+    return parser
+
+# JSON-schema keys that provider-native structured output modes do not accept
+_UNSUPPORTED_SCHEMA_KEYS = {"title", "default", "examples", "additionalProperties"}
+
+
+def _inline_schema(node: Any, defs: Dict[str, Any]) -> Any:
+    """Resolve $refs and turn Optional (anyOf [X, null]) into nullable X"""
+    if isinstance(node, list):
+        return [_inline_schema(value, defs) for value in node]
+    if not isinstance(node, dict):
+        return node
+
+    if "$ref" in node:
+        return _inline_schema(defs[node["$ref"].split("/")[-1]], defs)
+
+    variants = node.get("anyOf")
+    if variants and len(variants) == 2 and {"type": "null"} in variants:
+        inner = next(variant for variant in variants if variant != {"type": "null"})
+        merged = {key: value for key, value in node.items() if key != "anyOf"}
+        return {**_inline_schema(inner, defs), **_inline_schema(merged, defs), "nullable": True}
+
+    return {
+        key: _inline_schema(value, defs)
+        for key, value in node.items()
+        if key not in _UNSUPPORTED_SCHEMA_KEYS and key != "$defs"
+    }
+
+
+@lru_cache(maxsize=None)
+def _provider_schema_json(model: Type[BaseModel]) -> str:
+    schema = model.model_json_schema()
+    return json.dumps(_inline_schema(schema, schema.get("$defs", {})))
+
+
+def provider_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Self-contained JSON schema for a model, in the subset accepted by the
+    providers' native JSON modes (no $refs, titles or defaults)
+    """
+    return json.loads(_provider_schema_json(model))
+
+
+def _shape(schema: Dict[str, Any]) -> str:
+    """Render a schema as a one-line JSON skeleton, e.g. {"name": string}"""
+    kind = schema.get("type")
+    if kind == "object":
+        fields = ", ".join(
+            f'"{name}": {_shape(value)}' for name, value in schema.get("properties", {}).items()
+        )
+        shape = "{" + fields + "}"
+    elif kind == "array":
+        shape = f"[{_shape(schema.get('items', {}))}, ...]"
+    else:
+        shape = kind or "any"
+    return f"{shape} | null" if schema.get("nullable") else shape
+
+
+@lru_cache(maxsize=None)
+def compact_format_instructions(model: Type[BaseModel]) -> str:
+    """Short format instructions for use with a provider's native JSON mode"""
+    return f"Respond with a JSON object of the form: {_shape(provider_schema(model))}"
+
+
+@lru_cache(maxsize=None)
+def full_format_instructions(model: Type[BaseModel]) -> str:
+    """LangChain's full schema instructions, for providers without a JSON mode"""
+    from langchain_core.output_parsers import PydanticOutputParser
+
+    return PydanticOutputParser(pydantic_object=model).get_format_instructions()
 
 
 def clean_llm_response(response: str) -> str:
@@ -61,13 +182,13 @@ def clean_llm_response(response: str) -> str:
 
     # Remove thinking blocks if present
     if "<think>" in response:
-        print("[CLEANER] Removing <think> block from response")
+        logger.debug("Removing <think> block from response")
     response = re.sub(r"<think>[\s\S]*?<\/think>", "", response)
 
     # 1. Try to extract content from markdown code blocks
     code_block_match = re.search(r"```(?:json)?\s*([\s\S]*?)```", response)
     if code_block_match:
-        print("[CLEANER] Extracted JSON from markdown code block")
+        logger.debug("Extracted JSON from markdown code block")
         return code_block_match.group(1).strip()
 
     # 2. Try to find the first { or [ and the last } or ]
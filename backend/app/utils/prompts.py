@@ -1,12 +1,15 @@
 """
 LLM prompts for various tasks
-"""
 
-from app.utils.output_parsers import intent_parser, food_items_parser, goal_parser
+The ``get_*_prompt`` builders contain only the task; the output format is
+appended by ``LLMClient.generate_structured`` (a one-line shape when the
+provider's native JSON mode enforces the schema, the full LangChain format
+instructions otherwise).
+"""
 
 
 def get_intent_classification_prompt(message: str) -> str:
-    """Get intent classification prompt with format instructions"""
+    """Get intent classification prompt (use with IntentClassification)"""
     return f"""You are a fitness assistant. Classify the user's intent from their message.
 
 User message: "{message}"
@@ -17,13 +20,11 @@ Classify into one of these intents:
 - get_summary: User wants daily/weekly summary
 - ask_question: General fitness question
 - clarify: Need more information
-
-{intent_parser.get_format_instructions()}
 """
 
 
 def get_food_parsing_prompt(message: str) -> str:
-    """Get food parsing prompt with format instructions"""
+    """Get food parsing prompt (use with FoodItemsList)"""
     return f"""Extract food items from the user's message.
 
 User message: "{message}"
@@ -34,18 +35,55 @@ Extract each food item with:
 - unit: measurement unit (grams, cups, pieces, etc.)
 
 If you cannot parse any food items, return an empty list.
+"""
+
+
+def get_fused_intent_prompt(message: str, include_calories: bool = True) -> str:
+    """Get combined intent classification + food extraction prompt (FusedIntentExtraction)"""
+    estimates = (
+        "- estimates: for each item, its calories, protein, carbs and fat (grams)"
+        if include_calories
+        else "- estimates: null"
+    )
+    return f"""You are a fitness assistant. Classify the user's intent and, if they are
+logging food, extract what they ate.
+
+User message: "{message}"
 
-{food_items_parser.get_format_instructions()}
+Classify into one of these intents:
+- log_food: User wants to log food/meal
+- set_goal: User wants to set or update fitness goals
+- get_summary: User wants daily/weekly summary
+- ask_question: General fitness question
+- clarify: Need more information
+
+If the intent is log_food, also return:
+- items: each food item with name, quantity (numeric) and unit (grams, cups, pieces, etc.)
+{estimates}
+
+For any other intent return an empty items list and null estimates.
+"""
+
+
+def get_calorie_estimation_prompt(food_items: str) -> str:
+    """Get calorie estimation prompt (use with CalorieEstimation)"""
+    return f"""Estimate calories and macronutrients for these food items:
+
+{food_items}
+
+For each item, give its name, quantity and unit as listed, and estimate:
+- calories: total calories
+- protein: grams of protein
+- carbs: grams of carbohydrates
+- fat: grams of fat
 """
 
 
 def get_goal_extraction_prompt(message: str) -> str:
-    """Get goal extraction prompt with format instructions"""
+    """Get goal extraction prompt (use with GoalData)"""
     return f"""Extract fitness goal information from the user's message.
 
 User message: "{message}"
-
-{goal_parser.get_format_instructions()}
 """
 
 
@@ -0,0 +1,89 @@
+"""
+Timing spans for the chat hot path
+
+Each span observes its duration in a latency histogram and logs a DEBUG
+record with its attributes, so ``LOG_LEVEL=DEBUG`` shows where a request's
+time went and ``/api/metrics`` shows the distribution.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+import asyncio
+import logging
+import time
+from app.utils.metrics import REGISTRY, Histogram
+
+logger = logging.getLogger(__name__)
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "fitness_request_duration_seconds",
+    "Chat request latency",
+    ["endpoint", "status"],
+)
+NODE_SECONDS = REGISTRY.histogram(
+    "fitness_graph_node_duration_seconds",
+    "LangGraph node latency",
+    ["node", "status"],
+)
+LLM_SECONDS = REGISTRY.histogram(
+    "fitness_llm_generate_duration_seconds",
+    "LLMClient.generate latency, including cache hits",
+    ["provider", "model", "source", "status"],
+)
+LLM_PROVIDER_SECONDS = REGISTRY.histogram(
+    "fitness_llm_provider_duration_seconds",
+    "Latency of individual provider requests (including hedged and failed-over calls)",
+    ["provider", "model", "mode", "status"],
+)
+LLM_TOKENS = REGISTRY.counter(
+    "fitness_llm_tokens_total",
+    "LLM tokens by provider, model and kind (prompt/completion); "
+    "estimated at ~4 characters per token where the provider reports no usage",
+    ["provider", "model", "kind"],
+)
+DB_SECONDS = REGISTRY.histogram(
+    "fitness_db_request_duration_seconds",
+    "Supabase (PostgREST) request latency",
+    ["method", "table", "status"],
+)
+
+
+@contextmanager
+def span(histogram: Histogram, name: str, **labels: str) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block into ``histogram`` (labelled with ``labels`` and a status)
+
+    Yields a dict the block can add log attributes to; attributes named
+    like one of the histogram's labels also set that label. The status label
+    is "ok", "error" or "cancelled" (a generator closed early by its consumer
+    counts as "ok").
+    """
+    attributes: Dict[str, Any] = {}
+    status = "ok"
+    start = time.perf_counter()
+    try:
+        yield attributes
+    except asyncio.CancelledError:
+        status = "cancelled"
+        raise
+    except GeneratorExit:
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        for key in histogram.labelnames:
+            if key in attributes:
+                labels[key] = str(attributes[key])
+        histogram.observe(elapsed, **{**labels, "status": status})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                name,
+                extra={
+                    **attributes,
+                    **labels,
+                    "status": status,
+                    "duration_ms": round(elapsed * 1000, 1),
+                },
+            )
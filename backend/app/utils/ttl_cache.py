@@ -0,0 +1,106 @@
+"""
+In-process LRU cache with per-entry TTL
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+from collections import OrderedDict
+import time
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after a TTL"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl_seconds: Default time-to-live (None = never expires)
+            clock: Time source; wall-clock by default so expiry survives persistence
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry (marking it recently used) or ``default``"""
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            del self._entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        return default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """Store an entry, evicting the least recently used one when full"""
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        if expires_at is None and ttl is not None:
+            expires_at = self.clock() + ttl
+
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry; returns whether it existed"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self._entries.clear()
+
+    def items(self) -> Iterator[Tuple[Hashable, Any, Optional[float]]]:
+        """Iterate over live (key, value, expires_at) entries, oldest first"""
+        now = self.clock()
+        for key, (value, expires_at) in list(self._entries.items()):
+            if expires_at is None or expires_at > now:
+                yield key, value, expires_at
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[1] is None or entry[1] > self.clock())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss and eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
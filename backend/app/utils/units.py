@@ -0,0 +1,128 @@
+"""
+Unit normalization and conversion utilities
+"""
+
+from typing import Optional, Tuple
+from app.utils.constants import UNITS_WEIGHT, UNITS_VOLUME, UNITS_COUNT
+
+# Canonical units per measurement kind
+CANONICAL_WEIGHT = "g"
+CANONICAL_VOLUME = "ml"
+CANONICAL_COUNT = "piece"
+
+# Conversion factors for the units listed in constants.py
+GRAMS_PER_UNIT = {
+    "grams": 1.0,
+    "g": 1.0,
+    "kg": 1000.0,
+    "kilograms": 1000.0,
+    "oz": 28.3495,
+    "ounces": 28.3495,
+    "lbs": 453.592,
+    "pounds": 453.592,
+}
+
+ML_PER_UNIT = {
+    "ml": 1.0,
+    "milliliters": 1.0,
+    "l": 1000.0,
+    "liters": 1000.0,
+    "cups": 240.0,
+    "tbsp": 15.0,
+    "tsp": 5.0,
+}
+
+# Spelling variants mapped onto the units in constants.py
+UNIT_ALIASES = {
+    "gram": "grams",
+    "gm": "grams",
+    "gms": "grams",
+    "kilogram": "kilograms",
+    "kgs": "kg",
+    "ounce": "ounces",
+    "lb": "lbs",
+    "pound": "pounds",
+    "milliliter": "milliliters",
+    "millilitre": "milliliters",
+    "millilitres": "milliliters",
+    "liter": "liters",
+    "litre": "liters",
+    "litres": "liters",
+    "cup": "cups",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "piece": "pieces",
+    "pcs": "pieces",
+    "pc": "pieces",
+    "whole": "pieces",
+    "each": "pieces",
+    "small": "pieces",
+    "medium": "pieces",
+    "large": "pieces",
+    "item": "items",
+    "serving": "servings",
+    "portion": "servings",
+    "portions": "servings",
+    "slice": "slices",
+    "": "pieces",
+}
+
+
+def normalize_unit(unit: Optional[str]) -> Optional[str]:
+    """Map a free-form unit onto one of the units in constants.py"""
+    text = (unit or "").strip().lower().rstrip(".")
+    text = UNIT_ALIASES.get(text, text)
+
+    if text in UNITS_WEIGHT or text in UNITS_VOLUME or text in UNITS_COUNT:
+        return text
+    return None
+
+
+def canonicalize(quantity: float, unit: Optional[str]) -> Optional[Tuple[float, str]]:
+    """
+    Convert a quantity into its canonical unit
+
+    Returns:
+        (quantity, "g" | "ml" | "piece"), or None for unrecognized units
+    """
+    normalized = normalize_unit(unit)
+
+    if normalized in GRAMS_PER_UNIT:
+        return quantity * GRAMS_PER_UNIT[normalized], CANONICAL_WEIGHT
+    if normalized in ML_PER_UNIT:
+        return quantity * ML_PER_UNIT[normalized], CANONICAL_VOLUME
+    if normalized in UNITS_COUNT:
+        return quantity, CANONICAL_COUNT
+    return None
+
+
+def to_grams(
+    quantity: float,
+    unit: Optional[str],
+    density: Optional[float] = None,
+    piece_grams: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Convert a quantity into grams
+
+    Args:
+        quantity: Numeric amount
+        unit: Unit as written by the user or LLM
+        density: Grams per milliliter, needed for volume units
+        piece_grams: Weight of one piece/serving, needed for count units
+
+    Returns:
+        Grams, or None when the conversion needs data we do not have
+    """
+    canonical = canonicalize(quantity, unit)
+    if canonical is None:
+        return None
+
+    amount, kind = canonical
+    if kind == CANONICAL_WEIGHT:
+        return amount
+    if kind == CANONICAL_VOLUME:
+        return amount * density if density else None
+    return amount * piece_grams if piece_grams else None
@@ -0,0 +1,98 @@
+"""
+CalorieEngine: matching LLM estimates back to the requested items
+"""
+
+import asyncio
+from app.services.calorie_engine import CalorieEngine
+from app.services.estimate_cache import FoodEstimateCache
+from app.services.nutrient_db import Nutrient, NutrientDatabase
+from app.utils.output_parsers import CalorieEstimation
+
+ITEMS = [
+    {"name": "rice", "quantity": 200, "unit": "g"},
+    {"name": "eggs", "quantity": 2, "unit": "pieces"},
+    {"name": "apple", "quantity": 1, "unit": "piece"},
+]
+
+ESTIMATES = {
+    "rice": {"name": "rice", "quantity": 200, "unit": "g", "calories": 260},
+    "eggs": {"name": "egg", "quantity": 2, "unit": "piece", "calories": 140},
+    "apple": {"name": "apple", "quantity": 1, "unit": "piece", "calories": 95},
+}
+
+
+class FakeLLM:
+    """Answers each estimation prompt with the next canned breakdown"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.prompts = []
+
+    async def generate_structured(self, prompt, schema):
+        self.prompts.append(prompt)
+        breakdown = self.responses.pop(0) if self.responses else []
+        return CalorieEstimation(breakdown=breakdown)
+
+
+def make_engine(llm):
+    # A database without the test foods, so every item goes to the LLM
+    nutrient_db = NutrientDatabase([Nutrient("tofu", 76, 8, 1.9, 4.8, None, None)])
+    return CalorieEngine(llm, nutrient_db=nutrient_db, estimate_cache=FoodEstimateCache())
+
+
+def test_out_of_order_estimates_are_matched_by_name():
+    llm = FakeLLM([ESTIMATES["apple"], ESTIMATES["rice"], ESTIMATES["eggs"]])
+    engine = make_engine(llm)
+
+    breakdown = asyncio.run(engine.estimate_items(ITEMS))
+
+    assert [estimate["calories"] for estimate in breakdown] == [260, 140, 95]
+    assert engine.estimate_cache.get({"name": "rice", "quantity": 100, "unit": "g"})[
+        "calories"
+    ] == 130
+
+
+def test_dropped_item_is_retried_then_left_empty():
+    llm = FakeLLM([ESTIMATES["eggs"], ESTIMATES["rice"]], [])
+    engine = make_engine(llm)
+
+    breakdown = asyncio.run(engine.estimate_items(ITEMS))
+
+    assert [estimate and estimate["calories"] for estimate in breakdown] == [260, 140, None]
+    assert len(llm.prompts) == 2
+    assert "apple" in llm.prompts[1] and "rice" not in llm.prompts[1]
+    assert engine.estimate_cache.get(ITEMS[2]) is None
+
+
+def test_dropped_item_is_filled_by_retry():
+    llm = FakeLLM([ESTIMATES["rice"], ESTIMATES["apple"]], [ESTIMATES["eggs"]])
+    engine = make_engine(llm)
+
+    result = asyncio.run(engine.estimate_calories(ITEMS))
+
+    assert result["total"] == 495
+    assert len(llm.prompts) == 2
+
+
+def test_estimate_for_another_portion_is_not_cached():
+    llm = FakeLLM([{**ESTIMATES["rice"], "quantity": 100, "calories": 130}])
+    engine = make_engine(llm)
+
+    breakdown = asyncio.run(engine.estimate_items(ITEMS[:1]))
+
+    assert breakdown[0]["calories"] == 130
+    assert engine.estimate_cache.get(ITEMS[0]) is None
+
+
+def test_suggested_estimates_fill_misses_and_the_rest_goes_to_the_llm():
+    llm = FakeLLM([ESTIMATES["apple"]])
+    engine = make_engine(llm)
+    # Fused routing suggested rice and eggs (eggs for the wrong portion) but not apple
+    suggested = [{**ESTIMATES["eggs"], "quantity": 3, "calories": 210}, ESTIMATES["rice"]]
+
+    breakdown = asyncio.run(engine.estimate_items(ITEMS, suggested=suggested))
+
+    assert [estimate["calories"] for estimate in breakdown] == [260, 210, 95]
+    assert len(llm.prompts) == 1 and "rice" not in llm.prompts[0]
+    assert engine.estimate_cache.get(ITEMS[0])["calories"] == 260
+    assert engine.estimate_cache.get(ITEMS[1]) is None
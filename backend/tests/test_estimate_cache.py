@@ -0,0 +1,32 @@
+"""
+FoodEstimateCache: which items share a cached per-unit estimate
+"""
+
+from app.services.estimate_cache import FoodEstimateCache
+
+DUMPLING = {"name": "dumpling", "quantity": 1, "unit": "piece", "calories": 40}
+PIZZA_SLICE = {"name": "pizza", "quantity": 1, "unit": "slice", "calories": 285}
+
+
+def test_plural_is_served_by_scaling_the_singular():
+    cache = FoodEstimateCache()
+    assert cache.put(DUMPLING, DUMPLING)
+
+    estimate = cache.get({"name": "dumplings", "quantity": 2, "unit": "pieces"})
+
+    assert estimate["calories"] == 80
+
+
+def test_slices_and_servings_are_cached_separately():
+    cache = FoodEstimateCache()
+    cache.put(PIZZA_SLICE, PIZZA_SLICE)
+
+    assert cache.get({"name": "pizza", "quantity": 1, "unit": "serving"}) is None
+    assert cache.get({"name": "pizza", "quantity": 2, "unit": "slices"})["calories"] == 570
+
+
+def test_pieces_and_items_share_an_entry():
+    cache = FoodEstimateCache()
+    cache.put(DUMPLING, DUMPLING)
+
+    assert cache.get({"name": "dumpling", "quantity": 3, "unit": "items"})["calories"] == 120
@@ -0,0 +1,38 @@
+"""
+FoodHistoryImporter: rows the engine cannot estimate
+"""
+
+import asyncio
+from app.services.import_pipeline import FoodHistoryImporter
+from app.tools.memory_db import InMemorySupabaseClient
+
+RECORDS = [
+    {"timestamp": "2026-01-01T08:00:00", "name": "oatmeal", "quantity": "1", "unit": "bowl"},
+    {"timestamp": "2026-01-01T08:00:00", "name": "mystery bar", "quantity": "1", "unit": "bar"},
+    {"timestamp": "2026-01-01T19:00:00", "name": "mystery bar", "quantity": "2", "unit": "bar"},
+]
+
+
+class FakeEngine:
+    """Knows oatmeal only"""
+
+    async def estimate_items(self, food_items, batch_size=None):
+        return [
+            {**item, "calories": 150, "protein": 5} if item["name"] == "oatmeal" else None
+            for item in food_items
+        ]
+
+
+def test_unestimated_rows_are_reported_and_not_written():
+    db_client = InMemorySupabaseClient()
+    importer = FoodHistoryImporter(db_client, FakeEngine())
+
+    stats = asyncio.run(importer.run("user-1", RECORDS))
+
+    assert (stats["rows"], stats["meals"], stats["failed"]) == (1, 1, 2)
+    assert stats["failed_items"] == ["mystery bar"]
+
+    logs = db_client.backend.tables["food_logs"]
+    assert [log["food_items"][0]["name"] for log in logs] == ["oatmeal"]
+    rollup = db_client.backend.tables["daily_rollups"][0]
+    assert (rollup["total_calories"], rollup["meal_count"]) == (150, 1)
@@ -0,0 +1,76 @@
+"""
+LLMClient structured output: only valid responses are cached
+"""
+
+import asyncio
+from typing import List
+from pydantic import BaseModel
+from app.tools.llm import LLMClient
+from app.tools.llm_cache import MemoryResponseCache, make_cache_key
+from app.tools.mock_llm import MockLLMBackend
+
+VALID = '{"items": ["egg"]}'
+
+
+class Items(BaseModel):
+    items: List[str]
+
+
+class ScriptedBackend(MockLLMBackend):
+    """Answers with the given responses in order, then repeats the last one"""
+
+    def __init__(self, *responses):
+        super().__init__()
+        self.script = list(responses)
+        self.calls = 0
+
+    def respond(self, prompt: str) -> str:
+        self.calls += 1
+        return self.script[min(self.calls, len(self.script)) - 1]
+
+
+def make_client(backend):
+    return LLMClient(
+        "mock", cache=MemoryResponseCache(), mock_backend=backend, native_json=False
+    )
+
+
+def test_invalid_then_valid_caches_the_valid_response():
+    backend = ScriptedBackend("not json", VALID)
+    client = make_client(backend)
+
+    first = asyncio.run(client.generate_structured("list foods", Items))
+    again = asyncio.run(client.generate_structured("list foods", Items))
+
+    assert first.items == again.items == ["egg"]
+    assert backend.calls == 2  # The second call is served from the cache
+    prompt, _ = client._structured_prompt("list foods", Items)
+    key = make_cache_key("mock", "mock", prompt, 0.3, None)
+    assert asyncio.run(client.cache.get(key)) == VALID
+
+
+def test_successful_retry_replaces_an_invalid_cached_response():
+    backend = ScriptedBackend(VALID)
+    client = make_client(backend)
+    prompt, _ = client._structured_prompt("list foods", Items)
+    key = make_cache_key("mock", "mock", prompt, 0.3, None)
+    asyncio.run(client.cache.set(key, "not json"))
+
+    asyncio.run(client.generate_structured("list foods", Items))
+    asyncio.run(client.generate_structured("list foods", Items))
+
+    assert backend.calls == 1
+    assert asyncio.run(client.cache.get(key)) == VALID
+
+
+def test_invalid_stream_is_not_cached():
+    backend = ScriptedBackend('{"items": 1}', VALID)
+    client = make_client(backend)
+
+    async def stream():
+        return "".join([chunk async for chunk in client.stream_structured("list foods", Items)])
+
+    assert asyncio.run(stream()) == '{"items": 1}'
+    assert asyncio.run(stream()) == VALID
+    assert asyncio.run(stream()) == VALID
+    assert backend.calls == 2
@@ -0,0 +1,63 @@
+"""
+In-memory database: NOT NULL constraints from scripts/migrate_db.py
+"""
+
+import asyncio
+import httpx
+import pytest
+from app.tools.memory_db import InMemorySupabaseClient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_omitted_columns_take_their_defaults():
+    db_client = InMemorySupabaseClient()
+
+    row = run(db_client.insert("food_logs", {"user_id": "user-1", "timestamp": "2026-01-01"}))
+
+    assert row["food_items"] == [] and row["total_calories"] == 0 and row["breakdown"] == []
+
+
+def test_batch_with_a_null_is_rejected_without_writing_any_row():
+    db_client = InMemorySupabaseClient()
+    rows = [
+        {"user_id": "user-1", "timestamp": "2026-01-01T08:00:00"},
+        {"user_id": "user-1", "timestamp": None},
+    ]
+
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        run(db_client.insert_many("food_logs", rows))
+
+    assert error.value.response.status_code == 400
+    assert error.value.response.json()["code"] == "23502"
+    assert db_client.backend.tables["food_logs"] == []
+
+
+def test_required_column_without_default_must_be_given():
+    db_client = InMemorySupabaseClient()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(db_client.upsert("goals", {"user_id": "user-1"}, on_conflict="user_id"))
+
+
+def test_update_cannot_null_a_not_null_column():
+    db_client = InMemorySupabaseClient()
+    run(db_client.insert("goals", {"user_id": "user-1", "goal_type": "maintenance"}))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(db_client.update("goals", {"goal_type": None}, {"user_id": "user-1"}))
+
+    assert db_client.backend.tables["goals"][0]["goal_type"] == "maintenance"
+
+
+def test_log_meals_rejects_a_log_without_timestamp():
+    db_client = InMemorySupabaseClient()
+    logs = [{"timestamp": "2026-01-01T08:00:00", "total_calories": 300}, {"total_calories": 200}]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        run(db_client.rpc("log_meals", {"p_user_id": "user-1", "p_logs": logs}))
+
+    assert db_client.backend.tables["food_logs"] == []
+    assert db_client.backend.tables["daily_rollups"] == []
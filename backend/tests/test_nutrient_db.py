@@ -0,0 +1,25 @@
+"""
+NutrientDatabase: preparation state selects the table entry
+"""
+
+from app.services.nutrient_db import get_default_nutrient_db
+
+
+def calories(name: str) -> int:
+    estimate = get_default_nutrient_db().estimate({"name": name, "quantity": 100, "unit": "g"})
+    return estimate and estimate["calories"]
+
+
+def test_raw_staples_use_the_dry_entries():
+    assert calories("raw rice") == 365
+    assert calories("uncooked pasta") == 371
+    assert calories("raw oats") == 379
+
+
+def test_cooked_and_unqualified_staples_use_the_cooked_entries():
+    assert calories("rice") == calories("cooked rice") == 130
+    assert calories("cooked pasta") == 158
+
+
+def test_raw_food_without_a_raw_entry_is_left_to_the_llm():
+    assert calories("raw carrot") is None
@@ -0,0 +1,58 @@
+"""
+RollupEngine: logs land in UTC-day rollups that are summed server-side
+"""
+
+import asyncio
+from datetime import date
+from app.services.rollup_engine import RollupEngine
+from app.tools.memory_db import InMemorySupabaseClient
+
+
+def log(timestamp: str, calories: int) -> dict:
+    return {
+        "timestamp": timestamp,
+        "total_calories": calories,
+        "breakdown": [{"name": "rice", "calories": calories, "protein": 2.5}],
+    }
+
+
+def test_totals_cover_only_the_requested_days():
+    db_client = InMemorySupabaseClient()
+    engine = RollupEngine(db_client)
+    asyncio.run(
+        engine.log_meals(
+            "user-1",
+            [
+                log("2026-01-01T08:00:00+00:00", 300),
+                log("2026-01-02T08:00:00+00:00", 500),
+                log("2026-01-02T23:30:00-05:00", 200),  # 2026-01-03 in UTC
+                log("2026-01-05T12:00:00+00:00", 900),
+            ],
+        )
+    )
+
+    totals = asyncio.run(
+        engine.get_totals("user-1", date(2026, 1, 2), date(2026, 1, 4))
+    )
+
+    assert totals == {
+        "total_calories": 700,
+        "meal_count": 2,
+        "days_logged": 2,
+        "protein": 5.0,
+        "carbs": 0.0,
+        "fat": 0.0,
+    }
+    assert db_client.backend.requests == 2  # One write, one aggregate
+
+
+def test_other_users_rollups_are_not_summed():
+    db_client = InMemorySupabaseClient()
+    engine = RollupEngine(db_client)
+    asyncio.run(engine.log_meals("user-2", [log("2026-01-02T08:00:00+00:00", 500)]))
+
+    totals = asyncio.run(
+        engine.get_totals("user-1", date(2026, 1, 1), date(2026, 1, 31))
+    )
+
+    assert totals["days_logged"] == 0 and totals["total_calories"] == 0
@@ -0,0 +1,28 @@
+"""
+route_intent: logging LLM-routed messages never changes the routing
+"""
+
+import asyncio
+from datetime import datetime
+from app.graph.router import route_intent
+from app.services.intent_classifier import FastIntentClassifier
+
+
+class FakeLLM:
+    async def generate_structured(self, prompt, schema):
+        return schema(intent="ask_question", confidence=0.9)
+
+
+def test_unwritable_decision_log_keeps_the_llm_intent(tmp_path):
+    classifier = FastIntentClassifier(decision_log_path=str(tmp_path / "missing" / "log.jsonl"))
+    state = {
+        "user_id": "user-1",
+        "message": "blorp zing wobble",
+        "timestamp": datetime.now(),
+        "needs_clarification": False,
+    }
+
+    state = asyncio.run(route_intent(state, llm_client=FakeLLM(), classifier=classifier))
+
+    assert (state["intent"], state["confidence"]) == ("ask_question", 0.9)
+    assert classifier.llm_fallbacks == 1
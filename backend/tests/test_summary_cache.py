@@ -0,0 +1,40 @@
+"""
+SummaryCache: fills that race with invalidations
+"""
+
+from datetime import date
+from app.services.summary_cache import SummaryCache
+
+DAY = date(2026, 1, 1)
+
+
+def test_fill_computed_before_an_invalidation_is_dropped():
+    cache = SummaryCache()
+    generation = cache.generation()
+
+    cache.invalidate_user("user-1")  # Food logged while the summary was computed
+    cache.set("user-1", "weekly", DAY, {"total_calories": 100}, generation=generation)
+
+    assert cache.get("user-1", "weekly", DAY) is None
+    assert cache.stats()["stale_fills"] == 1
+
+
+def test_other_users_invalidations_do_not_block_fills():
+    cache = SummaryCache()
+    generation = cache.generation()
+
+    cache.invalidate_user("user-2")
+    cache.set("user-1", "weekly", DAY, {"total_calories": 100}, generation=generation)
+
+    assert cache.get("user-1", "weekly", DAY) == {"total_calories": 100}
+
+
+def test_untracked_users_fall_back_to_refusing_older_fills():
+    cache = SummaryCache(max_tracked_users=1)
+    generation = cache.generation()
+
+    cache.invalidate_user("user-1")
+    cache.invalidate_user("user-2")  # Pushes user-1 out of the tracked map
+    cache.set("user-1", "weekly", DAY, {"total_calories": 100}, generation=generation)
+
+    assert cache.get("user-1", "weekly", DAY) is None
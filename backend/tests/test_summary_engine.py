@@ -0,0 +1,56 @@
+"""
+SummaryEngine: each period covers exactly its N most recent UTC days
+"""
+
+import asyncio
+from datetime import datetime, time, timedelta, timezone
+from app.services.rollup_engine import RollupEngine
+from app.services.summary_engine import SummaryEngine
+from app.tools.memory_db import InMemorySupabaseClient
+
+# Calories logged this many UTC days ago; each period's oldest day and the
+# day before it are both logged, so an off-by-one window changes the result
+LOGGED = {0: 2000, 1: 1000, 6: 600, 7: 700, 29: 2900, 30: 3000}
+
+
+def summaries() -> dict:
+    db_client = InMemorySupabaseClient()
+    today = datetime.now(timezone.utc).date()
+    logs = [
+        {
+            "timestamp": datetime.combine(
+                today - timedelta(days=days_ago), time(0, 30), timezone.utc
+            ).isoformat(),
+            "total_calories": calories,
+            "breakdown": [],
+        }
+        for days_ago, calories in LOGGED.items()
+    ]
+    asyncio.run(RollupEngine(db_client).log_meals("user-1", logs))
+
+    engine = SummaryEngine(db_client)
+    return {
+        period: asyncio.run(engine.get_period_summary("user-1", period))
+        for period in ("daily", "weekly", "monthly")
+    }
+
+
+def test_periods_cover_n_days_including_today():
+    summary = summaries()
+
+    assert [summary[period]["days_logged"] for period in ("daily", "weekly", "monthly")] == [
+        1,
+        3,
+        5,
+    ]
+    assert summary["daily"]["total_calories"] == 2000
+    assert summary["weekly"]["total_calories"] == 2000 + 1000 + 600
+    assert summary["monthly"]["total_calories"] == 2000 + 1000 + 600 + 700 + 2900
+
+
+def test_average_is_over_logged_days_in_the_period():
+    summary = summaries()
+
+    assert summary["daily"]["avg_calories"] == 2000
+    assert summary["weekly"]["avg_calories"] == 1200
+    assert summary["monthly"]["avg_calories"] == 1440
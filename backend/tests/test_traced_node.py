@@ -0,0 +1,21 @@
+"""
+TracedNode: graph nodes run without LangChain's per-call bookkeeping
+"""
+
+import asyncio
+from langchain_core.load.dump import dumpd
+from app.graph.traced_node import TracedNode
+
+
+async def echo(state):
+    return {**state, "response": state["message"]}
+
+
+def test_runs_the_node():
+    node = TracedNode("echo", echo)
+
+    assert asyncio.run(node.ainvoke({"message": "hi"}))["response"] == "hi"
+
+
+def test_serializes_as_its_name_without_reading_source():
+    assert dumpd(TracedNode("echo", echo))["repr"] == "TracedNode(echo)"
@@ -5,6 +5,41 @@ Chat UI component
 import streamlit as st
 from datetime import datetime
 
+# Progress labels for graph nodes reported by the streaming endpoint
+NODE_LABELS = {
+    "route_intent": "Understanding your message",
+    "parse_food": "Reading your meal",
+    "estimate_calories": "Estimating calories",
+    "goal_manager": "Updating your goal",
+    "summary_weekly": "Building your summary",
+    "clarification": "Thinking",
+}
+
+
+def stream_response(user_id: str, message: str) -> str:
+    """Render a streamed chat reply as it arrives and return the final text"""
+
+    placeholder = st.empty()
+    placeholder.markdown("_Thinking..._")
+    text = ""
+
+    for event, data in st.session_state.api_client.chat_stream(
+        user_id=user_id, message=message
+    ):
+        if event == "node" and not text:
+            label = NODE_LABELS.get(data["node"], "Working")
+            placeholder.markdown(f"_{label}..._")
+        elif event == "token":
+            text += data["text"]
+            placeholder.markdown(text + "▌")
+        elif event == "done":
+            placeholder.markdown(data["response"])
+            return data["response"]
+        elif event == "error":
+            raise RuntimeError(data["detail"])
+
+    raise RuntimeError("The response stream ended unexpectedly")
+
 
 def render_chat_interface():
     """Render the chat interface"""
@@ -30,27 +65,18 @@ def render_chat_interface():
         with st.chat_message("user"):
             st.markdown(prompt)
 
-        # Get AI response
+        # Get AI response, rendered as it streams in
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                try:
-                    response = st.session_state.api_client.chat(
-                        user_id=st.session_state.user_id, message=prompt
-                    )
-
-                    st.markdown(response["response"])
-
-                    # Add assistant message
-                    st.session_state.messages.append(
-                        {"role": "assistant", "content": response["response"]}
-                    )
-
-                except Exception as e:
-                    error_msg = f"❌ Error: {str(e)}"
-                    st.error(error_msg)
-                    st.session_state.messages.append(
-                        {"role": "assistant", "content": error_msg}
-                    )
+            try:
+                response = stream_response(st.session_state.user_id, prompt)
+
+                # Add assistant message
+                st.session_state.messages.append({"role": "assistant", "content": response})
+
+            except Exception as e:
+                error_msg = f"❌ Error: {str(e)}"
+                st.error(error_msg)
+                st.session_state.messages.append({"role": "assistant", "content": error_msg})
 
     # Clear chat button
     if st.button("Clear Chat"):
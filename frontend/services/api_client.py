@@ -3,7 +3,12 @@ API client for backend communication
 """
 
 import httpx
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, Iterator, Optional, Tuple
+
+# Longest wait for the next byte of a chat stream; the server sends a
+# keep-alive comment while it works, so only a stalled stream times out
+STREAM_IDLE_TIMEOUT = 60.0
 
 
 class APIClient:
@@ -21,6 +26,26 @@ class APIClient:
         response.raise_for_status()
         return response.json()
 
+    def chat_stream(self, user_id: str, message: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Send a chat message and yield (event, data) Server-Sent Events as they arrive"""
+        with self.client.stream(
+            "POST",
+            f"{self.base_url}/chat/stream",
+            json={"user_id": user_id, "message": message},
+            timeout=httpx.Timeout(30.0, read=STREAM_IDLE_TIMEOUT),
+        ) as response:
+            response.raise_for_status()
+
+            event, data = "message", []
+            for line in response.iter_lines():
+                if line.startswith("event:"):
+                    event = line[len("event:") :].strip()
+                elif line.startswith("data:"):
+                    data.append(line[len("data:") :].strip())
+                elif not line and data:
+                    yield event, json.loads("\n".join(data))
+                    event, data = "message", []
+
     def set_goal(
         self,
         user_id: str,
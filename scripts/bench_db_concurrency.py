@@ -0,0 +1,107 @@
+"""
+Benchmark concurrent chat throughput with a blocking vs. async database client
+
+Simulates chat requests that each await an LLM call and then perform a few
+database round-trips. The "before" client reproduces the old behaviour of
+calling a synchronous ``.execute()`` inside ``async`` methods; the "after"
+client is the pooled async ``SupabaseClient`` talking to a fake PostgREST
+server through an in-process transport.
+
+Usage:
+    python scripts/bench_db_concurrency.py --requests 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.tools.db import SupabaseClient  # noqa: E402
+
+
+class BlockingSupabaseClient:
+    """Reproduces the previous client: a synchronous round-trip per call"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def insert(self, table, data):
+        time.sleep(self.latency)
+        return data
+
+    async def query(self, table, filters=None, order_by=None, limit=None):
+        time.sleep(self.latency)
+        return []
+
+
+def fake_postgrest(latency: float, pool_size: int) -> httpx.MockTransport:
+    """PostgREST stand-in that answers every call after ``latency`` seconds"""
+    pool = asyncio.Semaphore(pool_size)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        async with pool:
+            await asyncio.sleep(latency)
+        if request.method == "GET":
+            return httpx.Response(200, json=[])
+        return httpx.Response(201, content=b"[" + request.content + b"]")
+
+    return httpx.MockTransport(handler)
+
+
+async def simulated_chat(db_client, user_id: str, llm_latency: float):
+    """One food-logging chat: LLM work followed by goal lookup and a log insert"""
+    await asyncio.sleep(llm_latency)
+    await db_client.query("goals", filters={"user_id": user_id})
+    await db_client.insert("food_logs", {"user_id": user_id, "total_calories": 100})
+    await db_client.query("food_logs", filters={"user_id": user_id})
+
+
+async def run(db_client, requests: int, concurrency: int, llm_latency: float) -> float:
+    """Run ``requests`` chats with at most ``concurrency`` in flight; return chats/s"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            await simulated_chat(db_client, f"user_{i % 25}", llm_latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--db-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    db_latency = args.db_latency_ms / 1000
+    llm_latency = args.llm_latency_ms / 1000
+
+    blocking = BlockingSupabaseClient(db_latency)
+    before = await run(blocking, args.requests, args.concurrency, llm_latency)
+
+    pooled = SupabaseClient(
+        url="http://fake-postgrest",
+        key="bench",
+        pool_size=args.pool_size,
+        transport=fake_postgrest(db_latency, args.pool_size),
+    )
+    after = await run(pooled, args.requests, args.concurrency, llm_latency)
+    await pooled.close()
+
+    print(f"Requests: {args.requests}, concurrency: {args.concurrency}")
+    print(f"Blocking client: {before:8.1f} chats/s")
+    print(f"Async client:    {after:8.1f} chats/s ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+Benchmark API cold start: import time of app.main and FastAPI startup
+
+Starts a fresh interpreter per run with ``python -X importtime``, imports
+app.main, then runs the startup handlers (graph compilation, cache warm-up).
+Reports median wall times for both phases, the slowest modules of the import
+phase, and in which phase the heavy dependencies (provider SDKs, LangGraph,
+LangChain) were loaded. With --budget-ms the script exits non-zero when the
+median import exceeds the budget, so it can guard startup time in CI.
+
+Usage:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --runs 10 --provider openai --budget-ms 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend")
+
+HEAVY_MODULES = ["google.generativeai", "openai", "langgraph", "langchain_core"]
+
+PHASE_MARKER = "--- startup"
+
+# Placeholder settings: startup builds clients but makes no requests
+PLACEHOLDER_SETTINGS = {
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_KEY": "bench-startup",
+    "SECRET_KEY": "bench-startup",
+    "GEMINI_API_KEY": "bench-startup",
+    "OPENAI_API_KEY": "bench-startup",
+    "GROQ_API_KEY": "bench-startup",
+}
+
+# Runs in the child interpreter; importtime lines go to stderr, timings to stdout
+SNIPPET = f"""
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+sys.stderr.write("{PHASE_MARKER}\\n")
+asyncio.run(app.main.app.router.startup())
+started = time.perf_counter()
+print(json.dumps({{"import_s": imported - start, "startup_s": started - imported}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    Split ``-X importtime`` output into the import and startup phases
+
+    Returns:
+        {"import": {module: (self_us, cumulative_us)}, "startup": {...}}
+    """
+    phases = {"import": {}, "startup": {}}
+    phase = "import"
+    for line in stderr.splitlines():
+        if line.strip() == PHASE_MARKER:
+            phase = "startup"
+            continue
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        phases[phase][module.strip()] = (int(self_us), int(cumulative_us))
+    return phases
+
+
+def run_once(env: dict) -> tuple:
+    """One cold start in a fresh interpreter: (timings, importtime phases)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET],
+        cwd=BACKEND,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Startup failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return timings, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--provider", default="gemini", help="LLM_PROVIDER for the runs")
+    parser.add_argument("--top", type=int, default=10, help="Slowest import-phase modules")
+    parser.add_argument("--budget-ms", type=float, help="Fail if the median import is slower")
+    parser.add_argument("--output", help="Write the JSON report here as well")
+    args = parser.parse_args()
+
+    env = {
+        **PLACEHOLDER_SETTINGS,
+        **os.environ,
+        "LLM_PROVIDER": args.provider,
+        "LLM_FALLBACK_PROVIDERS": "",
+        "LOG_LEVEL": "WARNING",
+    }
+
+    timings = defaultdict(list)
+    self_us = defaultdict(list)
+    for _ in range(args.runs):
+        run, phases = run_once(env)
+        for key, value in run.items():
+            timings[key].append(value)
+        for module, (own, _) in phases["import"].items():
+            self_us[module].append(own)
+
+    # Module placement is the same in every run; report it from the last one
+    loaded_in = {
+        module: next((phase for phase in ("import", "startup") if module in phases[phase]), None)
+        for module in HEAVY_MODULES
+    }
+    slowest = sorted(self_us.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    cold_starts = [
+        imported + started for imported, started in zip(timings["import_s"], timings["startup_s"])
+    ]
+
+    report = {
+        "runs": args.runs,
+        "provider": args.provider,
+        "python": sys.version.split()[0],
+        "import_ms": round(statistics.median(timings["import_s"]) * 1000, 1),
+        "startup_ms": round(statistics.median(timings["startup_s"]) * 1000, 1),
+        "cold_start_ms": round(statistics.median(cold_starts) * 1000, 1),
+        "modules_imported": {phase: len(modules) for phase, modules in phases.items()},
+        "heavy_modules_loaded_in": loaded_in,
+        "slowest_imports_self_ms": {
+            module: round(statistics.median(samples) / 1000, 1)
+            for module, samples in slowest[: args.top]
+        },
+    }
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+    if args.budget_ms is not None and report["import_ms"] > args.budget_ms:
+        raise SystemExit(
+            f"Import took {report['import_ms']} ms, over the {args.budget_ms} ms budget"
+        )
+
+
+if __name__ == "__main__":
+    main()
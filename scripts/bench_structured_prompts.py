@@ -0,0 +1,70 @@
+"""
+Compare prompt sizes for structured output: full format instructions vs.
+native JSON mode
+
+Before, every structured prompt embedded LangChain's full JSON-schema format
+instructions. With native JSON mode the provider enforces the schema and the
+prompt only carries a one-line shape of it. Token counts are estimated at
+~4 characters per token.
+
+Usage:
+    python scripts/bench_structured_prompts.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.utils.output_parsers import (  # noqa: E402
+    CalorieEstimation,
+    FoodItemsList,
+    FusedIntentExtraction,
+    GoalData,
+    IntentClassification,
+    compact_format_instructions,
+    full_format_instructions,
+)
+from app.utils.prompts import (  # noqa: E402
+    get_calorie_estimation_prompt,
+    get_food_parsing_prompt,
+    get_fused_intent_prompt,
+    get_goal_extraction_prompt,
+    get_intent_classification_prompt,
+)
+
+MESSAGE = "I had 2 eggs, a slice of toast and a cup of orange juice for breakfast"
+ITEMS = "- eggs: 2 pieces\n- toast: 1 slices\n- orange juice: 1 cups"
+
+CASES = [
+    ("route_intent", get_intent_classification_prompt(MESSAGE), IntentClassification),
+    ("parse_food", get_food_parsing_prompt(MESSAGE), FoodItemsList),
+    ("fused_intent", get_fused_intent_prompt(MESSAGE), FusedIntentExtraction),
+    ("calorie_estimation", get_calorie_estimation_prompt(ITEMS), CalorieEstimation),
+    ("goal_extraction", get_goal_extraction_prompt(MESSAGE), GoalData),
+]
+
+
+def tokens(text: str) -> int:
+    return len(text) // 4
+
+
+def main():
+    print(f"{'prompt':<20} {'before':>8} {'native':>8} {'saved':>8}   (estimated tokens)")
+    total_before = total_after = 0
+
+    for name, prompt, model in CASES:
+        before = tokens(f"{prompt}\n\n{full_format_instructions(model)}")
+        after = tokens(f"{prompt}\n\n{compact_format_instructions(model)}")
+        total_before += before
+        total_after += after
+        print(f"{name:<20} {before:>8} {after:>8} {before - after:>7} ({1 - after / before:.0%})")
+
+    print(
+        f"{'total':<20} {total_before:>8} {total_after:>8} "
+        f"{total_before - total_after:>7} ({1 - total_after / total_before:.0%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
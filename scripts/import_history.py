@@ -0,0 +1,90 @@
+"""
+Import a food-history export (CSV or JSONL) for a user
+
+Streams the file, estimates nutrition in batches and writes food_logs in
+bulk chunks, printing progress as it goes. Re-running the same command
+after an interruption resumes from the checkpoint file.
+
+Usage:
+    python scripts/import_history.py USER_ID export.csv
+    python scripts/import_history.py USER_ID export.jsonl --chunk-size 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.config import settings  # noqa: E402
+from app.dependencies import get_db_client, get_estimate_cache, get_llm_client  # noqa: E402
+from app.services.calorie_engine import CalorieEngine  # noqa: E402
+from app.services.import_pipeline import (  # noqa: E402
+    FoodHistoryImporter,
+    content_fingerprint,
+    detect_format,
+    iter_records,
+)
+
+
+def print_progress(stats):
+    print(
+        f"  {stats['rows']:>8} rows  {stats['meals']:>7} meals  "
+        f"{stats['skipped']:>5} skipped  {stats['failed']:>5} failed  "
+        f"{stats['rows_per_second']:>8.0f} rows/s",
+        flush=True,
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("user_id")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_ESTIMATE_BATCH_SIZE)
+    parser.add_argument(
+        "--checkpoint", help="Checkpoint file (default: <path>.<content hash>.checkpoint.json)"
+    )
+    args = parser.parse_args()
+
+    estimate_cache = get_estimate_cache()
+    if estimate_cache is not None:
+        estimate_cache.load()
+
+    # The default checkpoint is tied to the file content, so an edited export starts over
+    with open(args.path, "rb") as f:
+        fingerprint = content_fingerprint(f)
+
+    importer = FoodHistoryImporter(
+        get_db_client(),
+        CalorieEngine(get_llm_client(), estimate_cache=estimate_cache),
+        chunk_size=args.chunk_size,
+        estimate_batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint or f"{args.path}.{fingerprint[:16]}.checkpoint.json",
+        progress=print_progress,
+    )
+
+    fmt = args.format or detect_format(args.path)
+    try:
+        with open(args.path, encoding="utf-8", newline="") as f:
+            stats = await importer.run(args.user_id, iter_records(f, fmt))
+    finally:
+        if estimate_cache is not None:
+            estimate_cache.save()
+        await get_db_client().close()
+
+    print(
+        f"Imported {stats['rows']} rows as {stats['meals']} meals in "
+        f"{stats['elapsed_seconds']:.1f}s ({stats['rows_per_second']:.0f} rows/s)"
+    )
+    if stats["failed"]:
+        print(
+            f"{stats['failed']} rows could not be estimated and were not imported: "
+            + ", ".join(stats["failed_items"])
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,237 @@
+"""
+Offline load test: drive /api/chat, /api/summary and /api/goals at a target rate
+
+Runs the API in-process with the mock LLM provider and the in-memory database
+(no credentials or network needed) unless --url points at a running server.
+Requests start on an open-loop schedule of Poisson arrivals at --rps, so a
+slow server builds a backlog instead of quietly lowering the offered load.
+The report is JSON with throughput and p50/p95/p99 latencies overall and per
+endpoint, for comparing runs across commits.
+
+In-process runs share one event loop, and so one CPU core, with the load
+generator. The report's ``cpu`` section gives the process CPU time per
+request; once ``utilization`` nears 1.0 the core is saturated and requests
+queue, so latency then measures CPU cost rather than the simulated LLM and
+database latencies. A chat costs around 90 ms of CPU, mostly LangGraph's
+per-step bookkeeping (LangChain callback setup and serialization of its
+channel runnables; the agent's own nodes skip it, see
+app/graph/traced_node.py), so one process saturates at roughly 10 chats per
+second. Use --url against a multi-worker server for capacity numbers.
+
+Usage:
+    python scripts/load_test.py --rps 10 --duration 30
+    python scripts/load_test.py --llm-latency fixed:0 --db-latency fixed:0 --rps 200
+    python scripts/load_test.py --url http://localhost:8000 --rps 20 --output report.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.utils.latency import LatencyWindow  # noqa: E402
+
+CHAT_MESSAGES = [
+    "I had 2 eggs and toast for breakfast",
+    "200g rice with chicken breast",
+    "a bowl of oatmeal and a banana",
+    "1 slice of pizza and a salad",
+    "greek yogurt with berries",
+    "how am I doing this week? give me a summary",
+    "set my goal to weight loss with a 1800 calorie target",
+]
+
+GOALS = [
+    {"goal_type": "weight_loss", "target_calories": 1800},
+    {"goal_type": "muscle_gain", "target_calories": 2800},
+    {"goal_type": "maintenance", "target_calories": 2200},
+]
+
+DEFAULT_MIX = "chat=0.7,summary=0.15,goal_get=0.1,goal_set=0.05"
+
+
+def parse_mix(spec: str) -> dict:
+    """Parse "chat=0.7,summary=0.3" into normalised endpoint weights"""
+    weights = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ("chat", "summary", "goal_get", "goal_set"):
+            raise SystemExit(f"Unknown endpoint in --mix: {name!r}")
+        weights[name.strip()] = float(weight)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def configure_offline_app(args) -> None:
+    """Point the app at the mock LLM and in-memory database before it is imported"""
+    os.environ.update(
+        {
+            "LLM_PROVIDER": "mock",
+            "MOCK_LLM_LATENCY": args.llm_latency,
+            "MOCK_LLM_ERROR_RATE": str(args.llm_error_rate),
+            "DATABASE_BACKEND": "memory",
+            "MEMORY_DB_LATENCY": args.db_latency,
+            "LLM_FALLBACK_PROVIDERS": "",
+            "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        }
+    )
+    # Required settings that the offline backends never use
+    for name in ("SUPABASE_URL", "SUPABASE_KEY", "SECRET_KEY"):
+        os.environ.setdefault(name, "load-test")
+
+
+def build_request(endpoint: str, rng: random.Random, users: int) -> tuple:
+    """(method, path, json body) for one request to ``endpoint``"""
+    user_id = f"load-user-{rng.randrange(users)}"
+
+    if endpoint == "chat":
+        return "POST", "/api/chat", {"user_id": user_id, "message": rng.choice(CHAT_MESSAGES)}
+    if endpoint == "summary":
+        period = rng.choice(["daily", "weekly", "monthly"])
+        return "GET", f"/api/summary/{user_id}?period={period}", None
+    if endpoint == "goal_get":
+        return "GET", f"/api/goals/{user_id}", None
+    return "POST", f"/api/goals/{user_id}", rng.choice(GOALS)
+
+
+def summarize(latencies: LatencyWindow, statuses: Counter, elapsed: float) -> dict:
+    """Throughput, error count and latency percentiles for one group of requests"""
+    completed = sum(statuses.values())
+    errors = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+    # A goal lookup before the first goal is set is an expected 404
+    return {
+        "requests": completed,
+        "errors": errors,
+        "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+        **latencies.summary(),
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+async def run_load(client: httpx.AsyncClient, args) -> dict:
+    """Send requests on a Poisson schedule for ``args.duration`` seconds"""
+    rng = random.Random(args.seed)
+    mix = parse_mix(args.mix)
+    endpoints, weights = list(mix), list(mix.values())
+    expected = int(args.rps * args.duration * 2) + 1000
+
+    latencies = defaultdict(lambda: LatencyWindow(size=expected))
+    statuses = defaultdict(Counter)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def one(endpoint: str):
+        nonlocal in_flight, max_in_flight
+        method, path, body = build_request(endpoint, rng, args.users)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = 599  # Transport error or timeout
+        finally:
+            in_flight -= 1
+        elapsed = time.perf_counter() - start
+        for group in (endpoint, "overall"):
+            latencies[group].record(elapsed)
+            statuses[group][status] += 1
+
+    tasks = []
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    next_send = start
+    while next_send - start < args.duration:
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint = rng.choices(endpoints, weights)[0]
+        tasks.append(asyncio.create_task(one(endpoint)))
+        next_send += rng.expovariate(args.rps)
+
+    sent = len(tasks)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    completed = sum(statuses["overall"].values())
+
+    return {
+        "config": {
+            "target": args.url or "in-process",
+            "target_rps": args.rps,
+            "duration_s": args.duration,
+            "users": args.users,
+            "mix": mix,
+            "llm_latency": None if args.url else args.llm_latency,
+            "db_latency": None if args.url else args.db_latency,
+            "seed": args.seed,
+        },
+        "offered_rps": round(sent / args.duration, 2),
+        "elapsed_s": round(elapsed, 3),
+        "max_in_flight": max_in_flight,
+        # Without --url this includes the app; with it, only the load generator
+        "cpu": {
+            "seconds": round(cpu, 3),
+            "ms_per_request": round(cpu / completed * 1000, 2) if completed else 0.0,
+            "utilization": round(cpu / elapsed, 2) if elapsed else 0.0,
+        },
+        "overall": summarize(latencies["overall"], statuses["overall"], elapsed),
+        "endpoints": {
+            endpoint: summarize(latencies[endpoint], statuses[endpoint], elapsed)
+            for endpoint in endpoints
+            if statuses[endpoint]
+        },
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rps", type=float, default=20.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds of load")
+    parser.add_argument("--users", type=int, default=50, help="Distinct user ids")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Endpoint weights")
+    parser.add_argument("--url", help="Load a running server instead of the in-process app")
+    parser.add_argument("--llm-latency", default="lognormal:300,0.4")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--db-latency", default="lognormal:5,0.5")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout, limits=limits) as client:
+            report = await run_load(client, args)
+    else:
+        configure_offline_app(args)
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://load-test", timeout=timeout
+            ) as client:
+                report = await run_load(client, args)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,215 @@
+"""
+Print the SQL needed to set up the Supabase database
+
+Usage:
+    python scripts/migrate_db.py
+
+Copy the output into the Supabase SQL editor and run it. Every statement is
+idempotent, so the whole script can be re-run after pulling new migrations.
+"""
+
+MIGRATIONS = [
+    (
+        "001_base_tables",
+        """
+create table if not exists food_logs (
+    id bigint generated by default as identity primary key,
+    user_id text not null,
+    timestamp timestamptz not null,
+    food_items jsonb not null default '[]'::jsonb,
+    total_calories integer not null default 0,
+    breakdown jsonb not null default '[]'::jsonb
+);
+
+create table if not exists goals (
+    id bigint generated by default as identity primary key,
+    user_id text not null,
+    goal_type text not null,
+    target_calories integer,
+    target_weight double precision,
+    target_date text,
+    created_at timestamptz not null default now()
+);
+
+create table if not exists reminders (
+    id bigint generated by default as identity primary key,
+    user_id text not null,
+    type text not null,
+    meal_type text,
+    scheduled_time timestamptz not null,
+    calendar_event_id text,
+    status text not null default 'scheduled'
+);
+""",
+    ),
+    (
+        "002_food_log_range_index",
+        """
+create index if not exists food_logs_user_timestamp_idx
+    on food_logs (user_id, timestamp);
+""",
+    ),
+    (
+        "003_aggregate_daily",
+        """
+-- aggregate_daily(p_table, p_sum_column, p_day_column, p_filters) built
+-- dynamic SQL over any table and column a PostgREST caller named. Summaries
+-- read daily_rollups (004) instead, so the function is dropped.
+drop function if exists aggregate_daily(text, text, text, jsonb);
+""",
+    ),
+    (
+        "004_daily_rollups",
+        """
+create table if not exists daily_rollups (
+    user_id text not null,
+    day date not null,
+    total_calories integer not null default 0,
+    meal_count integer not null default 0,
+    protein double precision not null default 0,
+    carbs double precision not null default 0,
+    fat double precision not null default 0,
+    updated_at timestamptz not null default now(),
+    primary key (user_id, day)
+);
+
+-- Rollups are written by log_meals (006) together with the logs; the
+-- increment_daily_rollup function this migration used to create is dropped
+-- by 007.
+
+-- Backfill rollups from existing logs. Days are UTC dates, the same boundary
+-- log_meals (006) uses; re-running recomputes days that were rolled up partially.
+insert into daily_rollups (user_id, day, total_calories, meal_count, protein, carbs, fat)
+select
+    l.user_id,
+    (l.timestamp at time zone 'UTC')::date,
+    sum(l.total_calories),
+    count(*),
+    coalesce(sum(m.protein), 0),
+    coalesce(sum(m.carbs), 0),
+    coalesce(sum(m.fat), 0)
+from food_logs l
+left join lateral (
+    select
+        sum(coalesce((b ->> 'protein')::double precision, 0)) as protein,
+        sum(coalesce((b ->> 'carbs')::double precision, 0)) as carbs,
+        sum(coalesce((b ->> 'fat')::double precision, 0)) as fat
+    from jsonb_array_elements(l.breakdown) b
+) m on true
+group by l.user_id, (l.timestamp at time zone 'UTC')::date
+on conflict (user_id, day) do update set
+    total_calories = excluded.total_calories,
+    meal_count = excluded.meal_count,
+    protein = excluded.protein,
+    carbs = excluded.carbs,
+    fat = excluded.fat,
+    updated_at = now();
+""",
+    ),
+    (
+        "005_goals_unique_user",
+        """
+-- One goal per user so goal writes can upsert on user_id.
+-- Keep only the most recent goal for users that have several.
+delete from goals g
+using goals newer
+where newer.user_id = g.user_id
+    and (newer.created_at, newer.id) > (g.created_at, g.id);
+
+create unique index if not exists goals_user_id_key on goals (user_id);
+""",
+    ),
+    (
+        "006_log_meals",
+        """
+-- Insert food logs and add them to the user's daily rollups in one statement,
+-- so a log is never written without its rollup (or the other way round).
+-- p_logs is a JSON array of {timestamp, food_items, total_calories, breakdown};
+-- days are the UTC date of each timestamp, as in the 004 backfill.
+create or replace function log_meals(p_user_id text, p_logs jsonb) returns void
+language sql as $$
+    with inserted as (
+        insert into food_logs (user_id, timestamp, food_items, total_calories, breakdown)
+        select
+            p_user_id,
+            (e ->> 'timestamp')::timestamptz,
+            coalesce(e -> 'food_items', '[]'::jsonb),
+            coalesce((e ->> 'total_calories')::integer, 0),
+            coalesce(e -> 'breakdown', '[]'::jsonb)
+        from jsonb_array_elements(p_logs) e
+        returning timestamp, total_calories, breakdown
+    )
+    insert into daily_rollups as r
+        (user_id, day, total_calories, meal_count, protein, carbs, fat)
+    select
+        p_user_id,
+        (i.timestamp at time zone 'UTC')::date,
+        sum(i.total_calories),
+        count(*),
+        coalesce(sum(m.protein), 0),
+        coalesce(sum(m.carbs), 0),
+        coalesce(sum(m.fat), 0)
+    from inserted i
+    left join lateral (
+        select
+            sum(coalesce((b ->> 'protein')::double precision, 0)) as protein,
+            sum(coalesce((b ->> 'carbs')::double precision, 0)) as carbs,
+            sum(coalesce((b ->> 'fat')::double precision, 0)) as fat
+        from jsonb_array_elements(i.breakdown) b
+    ) m on true
+    group by (i.timestamp at time zone 'UTC')::date
+    on conflict (user_id, day) do update set
+        total_calories = r.total_calories + excluded.total_calories,
+        meal_count = r.meal_count + excluded.meal_count,
+        protein = r.protein + excluded.protein,
+        carbs = r.carbs + excluded.carbs,
+        fat = r.fat + excluded.fat,
+        updated_at = now();
+$$;
+""",
+    ),
+    (
+        "007_summarize_rollups",
+        """
+drop function if exists increment_daily_rollup(
+    text, date, integer, integer, double precision, double precision, double precision
+);
+
+-- Totals of one user's daily rollups over an inclusive day range, for
+-- summaries. Unlike aggregate_daily (003) the signature is fixed: callers pick
+-- the user and the days, never a table or column. days_logged counts the
+-- days with at least one meal.
+create or replace function summarize_rollups(p_user_id text, p_start date, p_end date)
+returns table (
+    total_calories bigint,
+    meal_count bigint,
+    days_logged bigint,
+    protein double precision,
+    carbs double precision,
+    fat double precision
+)
+language sql stable as $$
+    select
+        coalesce(sum(r.total_calories), 0),
+        coalesce(sum(r.meal_count), 0),
+        count(*) filter (where r.meal_count > 0),
+        coalesce(sum(r.protein), 0),
+        coalesce(sum(r.carbs), 0),
+        coalesce(sum(r.fat), 0)
+    from daily_rollups r
+    where r.user_id = p_user_id and r.day between p_start and p_end;
+$$;
+""",
+    ),
+]
+
+
+def main():
+    for name, sql in MIGRATIONS:
+        print(f"-- {name}")
+        print(sql.strip())
+        print()
+
+
+if __name__ == "__main__":
+    main()
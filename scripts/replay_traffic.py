@@ -0,0 +1,175 @@
+"""
+Replay recorded chat traffic through fitness_graph with recorded LLM responses
+
+Reads a traffic log written with LLM_RECORD_PATH set (see
+app/tools/llm_replay.py) and runs every recorded chat message through the
+graph again, with the LLM answering from the recording (LLM_PROVIDER=replay)
+and the in-memory database. Without --timing the LLM answers instantly, so
+the measured latency is the parser, graph and database overhead alone; with
+--timing the recorded provider latencies are reproduced.
+
+Each reply is compared with the recorded one (or with the replies of an
+earlier run, --compare), so a cache or fast-path change that alters outputs
+shows up as changed replies. LLM misses mean a prompt changed. Note that the
+recorded replies came from the production database; summary and goal replies
+can differ against the initially empty in-memory one, so compare two replays
+when checking a change.
+
+Usage:
+    python scripts/replay_traffic.py traffic.jsonl.gz
+    python scripts/replay_traffic.py traffic.jsonl.gz --responses before.jsonl
+    python scripts/replay_traffic.py traffic.jsonl.gz --compare before.jsonl --timing
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.tools.llm_replay import read_log  # noqa: E402
+from app.utils.latency import LatencyWindow  # noqa: E402
+
+
+def configure_replay_app(args) -> None:
+    """Point the app at the recording and the in-memory database before it is imported"""
+    os.environ.update(
+        {
+            "LLM_PROVIDER": "replay",
+            "LLM_REPLAY_PATH": args.log,
+            "LLM_REPLAY_TIMING": str(args.timing),
+            "LLM_FALLBACK_PROVIDERS": "",
+            "LLM_RECORD_PATH": "",
+            "DATABASE_BACKEND": "memory",
+            "MEMORY_DB_LATENCY": args.db_latency,
+            "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+        }
+    )
+    # Required settings that the offline backends never use
+    for name in ("SUPABASE_URL", "SUPABASE_KEY", "SECRET_KEY"):
+        os.environ.setdefault(name, "replay")
+
+
+async def replay(chats: list, concurrency: int) -> tuple:
+    """
+    Run the chats through the graph; each user's messages run in recorded order
+
+    Returns:
+        (replies in input order, graph latency window, elapsed seconds)
+    """
+    from app.graph.graph import get_fitness_graph
+
+    fitness_graph = get_fitness_graph()
+
+    semaphore = asyncio.Semaphore(concurrency)
+    replies = [None] * len(chats)
+    latencies = LatencyWindow(size=len(chats) or 1)
+
+    indices_by_user = defaultdict(list)
+    for index, chat in enumerate(chats):
+        indices_by_user[chat["user_id"]].append(index)
+
+    async def run_user(indices):
+        for index in indices:
+            chat = chats[index]
+            state = {
+                "user_id": chat["user_id"],
+                "message": chat["message"],
+                "timestamp": datetime.fromisoformat(chat["timestamp"]),
+                "needs_clarification": False,
+            }
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    result = await fitness_graph.ainvoke(state)
+                    replies[index] = {
+                        "response": result.get("response"),
+                        "intent": result.get("intent"),
+                    }
+                except Exception as e:
+                    replies[index] = {"error": f"{type(e).__name__}: {e}"}
+                latencies.record(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_user(indices) for indices in indices_by_user.values()))
+    return replies, latencies, time.perf_counter() - start
+
+
+def compare(chats: list, replies: list, expected: list) -> dict:
+    """Count replies that differ from ``expected`` and show the first few"""
+    changed = []
+    for chat, reply, before in zip(chats, replies, expected):
+        after = (reply.get("response"), reply.get("intent"))
+        if after != (before.get("response"), before.get("intent")):
+            changed.append(
+                {
+                    "user_id": chat["user_id"],
+                    "message": chat["message"],
+                    "before": before.get("response"),
+                    "after": reply.get("response") or reply.get("error"),
+                }
+            )
+    return {"compared": len(expected), "changed": len(changed), "examples": changed[:5]}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("log", help="Traffic log recorded with LLM_RECORD_PATH")
+    parser.add_argument("--timing", action="store_true", help="Reproduce recorded LLM latencies")
+    parser.add_argument("--concurrency", type=int, default=1, help="Users replayed at once")
+    parser.add_argument("--db-latency", default="fixed:0", help="In-memory database latency")
+    parser.add_argument("--responses", help="Write this run's replies here (JSONL)")
+    parser.add_argument("--compare", help="Compare with the replies of an earlier run")
+    parser.add_argument("--limit", type=int, help="Replay only the first N chats")
+    args = parser.parse_args()
+
+    chats = [entry for entry in read_log(args.log) if entry.get("type") == "chat"]
+    if args.limit:
+        chats = chats[: args.limit]
+    if not chats:
+        raise SystemExit(f"No chat exchanges in {args.log}")
+
+    configure_replay_app(args)
+    from app.dependencies import get_db_client, get_replay_backend
+
+    replies, latencies, elapsed = await replay(chats, max(1, args.concurrency))
+
+    recorded = LatencyWindow(size=len(chats))
+    for chat in chats:
+        recorded.record(chat["latency"])
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            expected = [json.loads(line) for line in f if line.strip()]
+    else:
+        expected = chats
+
+    report = {
+        "chats": len(chats),
+        "errors": sum(1 for reply in replies if "error" in reply),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(chats) / elapsed, 2) if elapsed else 0.0,
+        "llm_timing": "recorded" if args.timing else "instant",
+        "replay_latency": latencies.summary(),
+        "recorded_latency": recorded.summary(),
+        "llm_replay": get_replay_backend().stats(),
+        "db_requests": get_db_client().backend.requests,
+        "outputs": {"against": args.compare or "recording", **compare(chats, replies, expected)},
+    }
+    await get_db_client().close()
+
+    if args.responses:
+        with open(args.responses, "w", encoding="utf-8") as f:
+            for reply in replies:
+                f.write(json.dumps(reply) + "\n")
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Train the fast-path intent model from logged routing decisions
+
+The backend appends every LLM routing decision to INTENT_DECISION_LOG. This
+script fits the hashed bag-of-words model on those decisions and writes an
+``.npz`` file to point INTENT_MODEL_PATH at.
+
+Usage:
+    python scripts/train_intent_classifier.py decisions.jsonl --out intent_model.npz
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.services.intent_classifier import IntentModel  # noqa: E402
+
+
+def load_decisions(path: str, min_confidence: float):
+    """Read (message, intent) pairs from a decision log"""
+    messages, intents = [], []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("confidence", 0.0) >= min_confidence:
+                messages.append(entry["message"])
+                intents.append(entry["intent"])
+    return messages, intents
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("decision_log")
+    parser.add_argument("--out", default="intent_model.npz")
+    parser.add_argument("--min-confidence", type=float, default=0.8)
+    parser.add_argument("--features", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    args = parser.parse_args()
+
+    messages, intents = load_decisions(args.decision_log, args.min_confidence)
+    if not messages:
+        sys.exit("No decisions above the confidence cut-off")
+
+    pairs = list(zip(messages, intents))
+    random.Random(0).shuffle(pairs)
+    split = int(len(pairs) * (1 - args.holdout))
+    train, test = pairs[:split], pairs[split:]
+
+    model = IntentModel.train(
+        [m for m, _ in train],
+        [i for _, i in train],
+        n_features=args.features,
+        epochs=args.epochs,
+    )
+
+    if test:
+        correct = sum(model.predict(m)[0] == i for m, i in test)
+        print(f"Holdout accuracy: {correct / len(test):.3f} ({len(test)} messages)")
+
+    model.save(args.out)
+    print(f"Saved model trained on {len(train)} messages to {args.out}")
+
+
+if __name__ == "__main__":
+    main()